@@ -0,0 +1,229 @@
+"""
+Raw page archive for offline replay.
+
+Every response body the scraper reads is appended to a per-run WARC file
+(``<archive dir>/<run id>.warc.gz``), one gzip member per record so the
+file stays valid if the run is interrupted. Bodies are deduplicated by
+SHA-256: a URL whose payload is already in the archive gets a small
+``revisit`` record pointing at the first copy instead of a second copy.
+A CDX-style index (``<run id>.cdx.jsonl``, one JSON line per record with
+its URL, offset and length) is appended next to it.
+
+Replaying an archive serves the same URLs from disk, so the listing,
+card and detail extraction can be re-run after a parser change without
+any network access.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Headers that describe the transfer rather than the (decoded) body we store
+_TRANSFER_HEADERS = frozenset(('content-encoding', 'content-length', 'transfer-encoding', 'connection'))
+
+REVISIT_PROFILE = 'http://netpreserve.org/warc/1.1/revisit/identical-payload-digest'
+
+
+def _index_path(warc_path: Path) -> Path:
+    return warc_path.with_name(warc_path.name[:-len('.warc.gz')] + '.cdx.jsonl')
+
+
+def _http_head(response: requests.Response, body_length: int) -> bytes:
+    """HTTP response line and headers as stored in a WARC record (the body follows in response records)."""
+    lines = [f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip()]
+    for name, value in response.headers.items():
+        if name.lower() not in _TRANSFER_HEADERS:
+            lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {body_length}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', 'replace')
+
+
+def _warc_record(headers: Dict[str, str], block: bytes) -> bytes:
+    head = ['WARC/1.1'] + [f"{name}: {value}" for name, value in headers.items()]
+    head.append(f"Content-Length: {len(block)}")
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('utf-8') + block + b'\r\n\r\n'
+
+
+class PageArchive:
+    """
+    Append-only WARC writer with payload deduplication.
+    """
+
+    def __init__(self, directory: str, run_id: Optional[str] = None):
+        """
+        Args:
+            directory: Directory holding the archives
+            run_id: Archive file stem (defaults to the current time)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.path = self.directory / f"{run_id}.warc.gz"
+        self.index_path = _index_path(self.path)
+        self.stats = {'records': 0, 'revisits': 0, 'bytes': 0}
+
+        self._lock = threading.Lock()
+        # Payload digest -> (record id, URI, date) of its first copy
+        self._payloads: Dict[str, Tuple[str, str, str]] = {}
+        self._offset = self.path.stat().st_size if self.path.exists() else 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['PageArchive']:
+        """Build the writer described by config['archive'], or None if disabled or replaying."""
+        archive = config.get('archive', {})
+        if not archive.get('enabled', False) or archive.get('replay'):
+            return None
+        return cls(archive.get('path', 'archive'), archive.get('run_id'))
+
+    def record(self, url: str, response: requests.Response, body: bytes, truncated: bool = False):
+        """
+        Archive one response.
+
+        Args:
+            url: Requested URL
+            response: Response carrying status and headers
+            body: Body as read (decoded)
+            truncated: The reader stopped before the end of the body (the
+                stored prefix is what the scraper saw)
+        """
+        digest = 'sha256:' + hashlib.sha256(body).hexdigest()
+        date = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        record_id = f"<urn:uuid:{uuid.uuid4()}>"
+        headers = {
+            'WARC-Record-ID': record_id,
+            'WARC-Date': date,
+            'WARC-Target-URI': url,
+            'WARC-Payload-Digest': digest,
+            'Content-Type': 'application/http; msgtype=response',
+        }
+        if truncated:
+            headers['WARC-Truncated'] = 'unspecified'
+
+        with self._lock:
+            original = self._payloads.get(digest)
+            if original is None:
+                headers = {'WARC-Type': 'response', **headers}
+                block = _http_head(response, len(body)) + body
+                self._payloads[digest] = (record_id, url, date)
+            else:
+                # Same payload already archived: store the HTTP headers only
+                headers = {'WARC-Type': 'revisit', **headers, 'WARC-Profile': REVISIT_PROFILE,
+                           'WARC-Refers-To': original[0], 'WARC-Refers-To-Target-URI': original[1],
+                           'WARC-Refers-To-Date': original[2]}
+                block = _http_head(response, len(body))
+                self.stats['revisits'] += 1
+
+            member = gzip.compress(_warc_record(headers, block))
+            with open(self.path, 'ab') as f:
+                f.write(member)
+            entry = {'url': url, 'status': response.status_code, 'digest': digest,
+                     'offset': self._offset, 'length': len(member),
+                     'revisit_of': original[0] if original else None, 'record_id': record_id}
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self._offset += len(member)
+            self.stats['records'] += 1
+            self.stats['bytes'] += len(member)
+
+    def summary(self) -> str:
+        """One-line summary of archiving for end-of-run reporting."""
+        return (f"Archive: {self.stats['records']} record(s), {self.stats['revisits']} deduplicated, "
+                f"{self.stats['bytes'] / 1024:.1f} KB compressed ({self.path})")
+
+
+class ArchiveReplay:
+    """
+    Serves archived responses by URL.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: ``.warc.gz`` file written by PageArchive (its ``.cdx.jsonl``
+                index must sit next to it)
+
+        Raises:
+            FileNotFoundError: If the archive or its index is missing
+        """
+        self.path = Path(path)
+        self.index_path = _index_path(self.path)
+        self.stats = {'served': 0, 'missing': 0}
+        self._lock = threading.Lock()
+        # URL -> index entry of its latest record; record id -> entry
+        self._urls: Dict[str, Dict] = {}
+        self._records: Dict[str, Dict] = {}
+        if not self.path.exists():
+            raise FileNotFoundError(f"Archive not found: {self.path}")
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._urls[entry['url']] = entry
+                    self._records[entry['record_id']] = entry
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ArchiveReplay']:
+        """Open the archive named by config['archive']['replay'], or None if not replaying."""
+        replay = config.get('archive', {}).get('replay')
+        return cls(replay) if replay else None
+
+    def _read(self, entry: Dict) -> Tuple[Dict[str, str], bytes]:
+        """WARC headers and block of an indexed record."""
+        with open(self.path, 'rb') as f:
+            f.seek(entry['offset'])
+            data = gzip.decompress(f.read(entry['length']))
+        head, _, rest = data.partition(b'\r\n\r\n')
+        headers = {}
+        for line in head.decode('utf-8').split('\r\n')[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip()] = value.strip()
+        return headers, rest[:int(headers['Content-Length'])]
+
+    def response(self, url: str) -> Optional[requests.Response]:
+        """
+        Archived response for a URL.
+
+        Returns:
+            A requests.Response with the archived status, headers and body,
+            or None if the URL was not archived
+        """
+        entry = self._urls.get(url)
+        if entry is None:
+            with self._lock:
+                self.stats['missing'] += 1
+            return None
+        _, block = self._read(entry)
+        http_head, _, body = block.partition(b'\r\n\r\n')
+        if entry['revisit_of']:
+            _, original = self._read(self._records[entry['revisit_of']])
+            body = original.partition(b'\r\n\r\n')[2]
+
+        lines = http_head.decode('latin-1').split('\r\n')
+        response = requests.Response()
+        response.status_code = int(lines[0].split(' ', 2)[1])
+        response.url = url
+        response.headers = CaseInsensitiveDict()
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            response.headers[name.strip()] = value.strip()
+        response.headers['Content-Length'] = str(len(body))
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        with self._lock:
+            self.stats['served'] += 1
+        return response
+
+    def summary(self) -> str:
+        """One-line summary of replay for end-of-run reporting."""
+        return (f"Replay: {self.stats['served']} response(s) served from {self.path}, "
+                f"{self.stats['missing']} URL(s) not in the archive")
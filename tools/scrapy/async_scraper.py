@@ -0,0 +1,154 @@
+"""
+Asyncio crawl engine for GamesScraper.
+
+Keeps up to ``concurrency`` listing/game fetches in flight and spaces them
+out with a per-host token bucket instead of sleeping between requests.
+Fetching and parsing reuse the GamesScraper methods (run in a thread pool),
+so the returned game dicts are identical to the sync path.
+
+In memory budget mode the category is crawled one listing page at a time
+(the next page downloads while the current one is validated) by a fixed
+set of worker tasks, instead of one task per game for the whole category.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from ratelimit import HostRateLimiter
+from scraper import OrderedEmitter
+
+
+async def scrape_category_async(scraper, category: str, max_pages: int,
+                                emit: Callable[[Dict], None]):
+    """
+    Scrape a category with bounded concurrency.
+
+    Args:
+        scraper: GamesScraper instance providing fetch/parse methods
+        category: Game category to scrape
+        max_pages: Number of listing pages to fetch
+        emit: Called with each kept game, in the same order as the sync path
+    """
+    config = scraper.config
+    logger = scraper.logger
+    concurrency = max(1, config.get('concurrency', 8))
+    scrape_iframes = config.get('scrape_iframes', True)
+
+    limiter = HostRateLimiter.from_config(config)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    logger.info(f"Starting async scrape of '{category}' category, {max_pages} page(s), "
+                f"{concurrency} request(s) in flight")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        async def run(url: str, func, *args):
+            # Take the slot first so waiting for a worker never builds up a burst
+            async with semaphore:
+                await limiter.acquire_async(url)
+                return await loop.run_in_executor(pool, func, *args)
+
+        async def fetch_page(page: int) -> Optional[List[Dict]]:
+            games = scraper._journaled_page(category, page)
+            if games is not None:
+                return games
+            url = f"{scraper.base_url}/{category}.games?page={page}"
+            return await run(url, scraper._listing_page, category, page)
+
+        if scraper.memory_budget:
+            await _scrape_by_page(scraper, category, max_pages, emit, run, fetch_page, concurrency)
+            return
+
+        pages = await asyncio.gather(*(fetch_page(page) for page in range(1, max_pages + 1)))
+        all_games = []
+        seen_ids = set()
+        for games in pages:
+            games, last = scraper._new_listing_games(games, seen_ids)
+            all_games.extend(games)
+            if last:
+                break
+
+        logger.info(f"Found {len(all_games)} total games")
+
+        if not (scrape_iframes and all_games):
+            for game in all_games:
+                emit(game)
+            return
+
+        logger.info("Validating games and filtering embeddable ones...")
+        ordered = OrderedEmitter(emit)
+
+        async def validate(idx: int, game: Dict):
+            iframe_data = scraper._reusable_details(game)
+            if iframe_data is None:
+                iframe_data, _ = await run(game['url'], scraper._validate_game, game)
+            game.update(iframe_data)
+            embeddable = iframe_data.get('is_embeddable', False)
+            logger.info(f"Validated game {idx}/{len(all_games)}: {game['name']} "
+                        f"({'embeddable' if embeddable else 'skipped'})")
+            ordered.put(idx - 1, game if embeddable else None)
+
+        await asyncio.gather(*(validate(idx, game) for idx, game in enumerate(all_games, 1)))
+
+    logger.info(f"Filtered: {ordered.emitted}/{len(all_games)} embeddable games")
+
+
+async def _scrape_by_page(scraper, category: str, max_pages: int, emit: Callable[[Dict], None],
+                          run, fetch_page, workers: int):
+    """
+    Memory budget variant of scrape_category_async: at most two listing
+    pages of games and ``workers`` validations are held at a time.
+    """
+    logger = scraper.logger
+    scrape_iframes = scraper.config.get('scrape_iframes', True)
+    ordered = OrderedEmitter(emit)
+    seen_ids = set()
+    found = 0
+
+    async def validate(pending: deque):
+        while pending:
+            idx, game = pending.popleft()
+            iframe_data = scraper._reusable_details(game)
+            if iframe_data is None:
+                iframe_data, _ = await run(game['url'], scraper._validate_game, game)
+            game.update(iframe_data)
+            embeddable = iframe_data.get('is_embeddable', False)
+            logger.info(f"Validated game {idx + 1}: {game['name']} "
+                        f"({'embeddable' if embeddable else 'skipped'})")
+            ordered.put(idx, game if embeddable else None)
+
+    next_page = asyncio.ensure_future(fetch_page(1))
+    try:
+        for page in range(1, max_pages + 1):
+            games, last = scraper._new_listing_games(await next_page, seen_ids)
+            next_page = None
+            if not last and page < max_pages:
+                next_page = asyncio.ensure_future(fetch_page(page + 1))
+
+            pending = deque(enumerate(games, found))
+            found += len(games)
+            del games
+            if scrape_iframes:
+                await asyncio.gather(*(validate(pending) for _ in range(min(workers, len(pending)))))
+            else:
+                for idx, game in pending:
+                    ordered.put(idx, game)
+
+            if last:
+                logger.info(f"Listing ends at page {page}")
+                break
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+    logger.info(f"Found {found} total games")
+    if scrape_iframes:
+        logger.info(f"Filtered: {ordered.emitted}/{found} embeddable games")
+
+
+def run_category_async(scraper, category: str, max_pages: int, emit: Callable[[Dict], None]):
+    """Run scrape_category_async to completion from synchronous code."""
+    asyncio.run(scrape_category_async(scraper, category, max_pages, emit))
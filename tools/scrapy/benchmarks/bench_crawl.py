@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+End-to-end crawl throughput against the local stand-in server.
+
+Starts benchmarks/standin_server.py in-process (or uses --server), points
+GamesScraper's ``base_url`` at it and crawls the same categories once per
+crawl mode. Reports wall time, games/sec, requests/sec and retries, where
+requests and retries are counted by the server.
+
+Usage (from tools/scrapy):
+    python benchmarks/bench_crawl.py
+    python benchmarks/bench_crawl.py --modes pipeline,async --concurrency 16 --latency uniform:0.02,0.2
+    python benchmarks/bench_crawl.py --throttle-rate 0.05 --truncate-rate 0.02 --adaptive
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+from urllib.request import urlopen
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from scraper import GamesScraper  # noqa: E402
+from standin_server import DEFAULT_PROFILE, add_profile_arguments, start_server  # noqa: E402
+
+
+def fetch_stats(base_url: str) -> Dict:
+    with urlopen(f"{base_url}/__stats") as response:
+        return json.load(response)
+
+
+def crawl_config(args, base_url: str, mode: str, log_dir: str) -> Dict:
+    """Scraper config for one benchmark run: no cache, journal or state, so runs are comparable."""
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config.update({
+        'base_url': base_url,
+        'crawl_mode': mode,
+        'concurrency': args.concurrency,
+        'max_pages': args.pages,
+        'rate_limit_seconds': args.rate_limit,
+        'retry_attempts': args.retries,
+        'timeout_seconds': args.timeout,
+        'log_dir': log_dir,
+        'cache': {'enabled': False},
+        'incremental': {'enabled': False},
+        'journal': {'enabled': False},
+    })
+    config.setdefault('adaptive_rate', {})['enabled'] = args.adaptive
+    if args.parse_workers is not None:
+        config['parse_workers'] = args.parse_workers
+    return config
+
+
+def run_mode(args, base_url: str, mode: str, log_dir: str) -> Dict:
+    urlopen(f"{base_url}/__reset").close()
+    scraper = GamesScraper(crawl_config(args, base_url, mode, log_dir))
+    logging.getLogger().setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    games = sum(len(scraper.scrape_category(category)) for category in args.categories)
+    elapsed = time.perf_counter() - start
+
+    stats = fetch_stats(base_url)
+    requests_made = stats.get('requests', 0)
+    retries = stats.get('repeated_requests', 0)
+    if scraper.parse_pool:
+        scraper.parse_pool.close()
+    return {
+        'mode': mode,
+        'games': games,
+        'requests': requests_made,
+        'retries': retries,
+        'wall_seconds': elapsed,
+        'games_per_sec': games / elapsed if elapsed else 0.0,
+        'requests_per_sec': requests_made / elapsed if elapsed else 0.0,
+    }
+
+
+def print_rows(rows: List[Dict]):
+    print(f"\n{'mode':<10} {'games':>6} {'requests':>9} {'retries':>8} {'wall s':>8} {'games/s':>8} {'req/s':>8}")
+    print('-' * 64)
+    for row in rows:
+        print(f"{row['mode']:<10} {row['games']:>6} {row['requests']:>9} {row['retries']:>8} "
+              f"{row['wall_seconds']:>8.2f} {row['games_per_sec']:>8.2f} {row['requests_per_sec']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl throughput against the local stand-in server')
+    parser.add_argument('--modes', default='sync,pipeline,async', help='Comma-separated crawl modes')
+    parser.add_argument('--categories', default='action,racing', help='Comma-separated categories')
+    parser.add_argument('--pages', type=int, default=2, help='Listing pages per category (default: 2)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight for pipeline/async')
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help='rate_limit_seconds for the scraper (default: 0, no politeness delay)')
+    parser.add_argument('--adaptive', action='store_true', help='Enable adaptive (AIMD) rate control')
+    parser.add_argument('--parse-workers', type=int, help='Parser processes (default: from config)')
+    parser.add_argument('--retries', type=int, default=3, help='retry_attempts for the scraper')
+    parser.add_argument('--timeout', type=float, default=10, help='timeout_seconds for the scraper')
+    parser.add_argument('--config', default='config.json', help='Base scraper config (default: config.json)')
+    parser.add_argument('--server', help='Use a running stand-in server at this URL instead of starting one')
+    parser.add_argument('--json', metavar='PATH', help='Write the results to a JSON file')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    args.categories = [category.strip() for category in args.categories.split(',')]
+
+    server = None
+    if args.server:
+        base_url = args.server.rstrip('/')
+    else:
+        server, site = start_server({key: getattr(args, key) for key in DEFAULT_PROFILE})
+        base_url = site.base_url
+    print(f"Stand-in server: {base_url}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        for mode in args.modes.split(','):
+            print(f"Crawling {', '.join(args.categories)} in {mode} mode...")
+            rows.append(run_mode(args, base_url, mode.strip(), log_dir))
+            # File handlers from basicConfig would otherwise keep the temp dir open
+            for handler in logging.getLogger().handlers[:]:
+                handler.close()
+                logging.getLogger().removeHandler(handler)
+
+    if server:
+        server.shutdown()
+
+    print_rows(rows)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'server': base_url, 'rows': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
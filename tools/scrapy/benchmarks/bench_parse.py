@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Offline parser benchmark for the 1games.io scraper.
+
+Runs listing-card extraction (parse_listing / _extract_game_from_card),
+detail extraction (parse_detail / scrape_game_details) and the embed check
+(EmbedScanner) against the recorded pages in benchmarks/fixtures/, for every
+installed parser backend. Reports parse+extract time per page (p50/p95),
+memory blocks allocated and peak traced memory, and fails if any extracted
+result differs from benchmarks/golden/.
+
+Usage (from tools/scrapy):
+    python benchmarks/bench_parse.py
+    python benchmarks/bench_parse.py --iterations 50 --parser lxml
+    python benchmarks/bench_parse.py --json results.json
+    python benchmarks/bench_parse.py --update-golden
+    python benchmarks/bench_parse.py --record action --games 6   # needs network
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from bs4 import BeautifulSoup, FeatureNotFound  # noqa: E402
+
+from embed_check import EmbedScanner  # noqa: E402
+from parse_pool import parse_detail, parse_listing  # noqa: E402
+from scraper import EMBED_CHUNK_SIZE, HTML_PARSERS  # noqa: E402
+
+FIXTURES_DIR = BENCH_DIR / 'fixtures'
+GOLDEN_DIR = BENCH_DIR / 'golden'
+BASE_URL = 'https://1games.io'
+
+# Parser the golden outputs are generated with
+GOLDEN_PARSER = 'html.parser'
+
+
+def extract_listing(content: bytes, parser: str):
+    return [game.to_dict() for game in parse_listing(content, parser, BASE_URL)[0]]
+
+
+def extract_game(content: bytes, parser: str):
+    return parse_detail(content, parser)
+
+
+def extract_embed(content: bytes, parser: str):
+    chunks = (content[i:i + EMBED_CHUNK_SIZE] for i in range(0, len(content), EMBED_CHUNK_SIZE))
+    scanner = EmbedScanner().scan(chunks)
+    return {
+        'is_embeddable': scanner.is_embeddable,
+        'has_canvas': scanner.has_canvas,
+        'engines': sorted(marker.decode() for marker in scanner.engines),
+        'third_party_src': scanner.third_party_src,
+    }
+
+
+# Page kind -> (extractor, whether the result depends on the parser backend)
+EXTRACTORS: Dict[str, Tuple[Callable, bool]] = {
+    'listing': (extract_listing, True),
+    'game': (extract_game, True),
+    'embed': (extract_embed, False),
+}
+
+
+def load_fixtures() -> List[Tuple[str, str, bytes]]:
+    """Return (kind, name, body) for every recorded page, sorted."""
+    fixtures = []
+    for kind in EXTRACTORS:
+        for path in sorted((FIXTURES_DIR / kind).glob('*.html')):
+            fixtures.append((kind, path.stem, path.read_bytes()))
+    return fixtures
+
+
+def golden_path(kind: str, name: str) -> Path:
+    return GOLDEN_DIR / kind / f"{name}.json"
+
+
+def normalize(value):
+    """Round-trip through JSON so tuples/lists compare like the stored file."""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def available_parsers(requested: List[str]) -> List[str]:
+    parsers = []
+    for name in requested:
+        try:
+            BeautifulSoup('', name)
+        except FeatureNotFound:
+            print(f"Skipping parser '{name}': not installed")
+            continue
+        parsers.append(name)
+    return parsers
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def measure(func: Callable, content: bytes, parser: str, iterations: int) -> Dict:
+    """
+    Time ``func`` over ``iterations`` runs, then trace one more run.
+
+    Returns:
+        Dictionary with per-run times (seconds), allocated blocks/bytes and
+        peak traced memory of the traced run
+    """
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(content, parser)
+        times.append(time.perf_counter() - start)
+
+    # Soup trees hold reference cycles; keep the collector out of the traced run
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        func(content, parser)
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+        gc.collect()
+
+    diff = [stat for stat in after.compare_to(before, 'filename') if stat.size_diff > 0]
+    return {
+        'times': times,
+        'alloc_blocks': sum(stat.count_diff for stat in diff),
+        'alloc_bytes': sum(stat.size_diff for stat in diff),
+        'peak_bytes': peak,
+    }
+
+
+def check_goldens(fixtures, parsers: List[str]) -> List[str]:
+    """Compare every extractor result with its golden file; return mismatch messages."""
+    failures = []
+    for kind, name, content in fixtures:
+        func, per_parser = EXTRACTORS[kind]
+        path = golden_path(kind, name)
+        if not path.exists():
+            failures.append(f"{kind}/{name}: no golden output (run with --update-golden)")
+            continue
+        expected = json.loads(path.read_text(encoding='utf-8'))
+        for parser in (parsers if per_parser else parsers[:1]):
+            actual = normalize(func(content, parser))
+            if actual != expected:
+                failures.append(f"{kind}/{name} [{parser}]: {describe_diff(expected, actual)}")
+    return failures
+
+
+def describe_diff(expected, actual) -> str:
+    """Short description of how two extractor results differ."""
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"{len(actual)} item(s), expected {len(expected)}"
+        for idx, (exp, act) in enumerate(zip(expected, actual)):
+            if exp != act:
+                return f"item {idx}: {describe_diff(exp, act)}"
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        keys = sorted(key for key in set(expected) | set(actual) if expected.get(key) != actual.get(key))
+        return 'field(s) differ: ' + ', '.join(keys)
+    return 'value differs'
+
+
+def update_goldens(fixtures):
+    for kind, name, content in fixtures:
+        func, _ = EXTRACTORS[kind]
+        path = golden_path(kind, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(normalize(func(content, GOLDEN_PARSER)), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"Wrote {path.relative_to(BENCH_DIR)}")
+
+
+def record(category: str, games: int, config_path: str):
+    """Fetch a listing page plus some game and embed pages into the fixtures."""
+    from scraper import GamesScraper
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config['cache'] = {'enabled': False}
+    config['journal'] = {'enabled': False}
+    scraper = GamesScraper(config)
+
+    def save(kind: str, name: str, url: str):
+        response = scraper._make_request(url)
+        if not response:
+            print(f"Failed to record {url}")
+            return
+        path = FIXTURES_DIR / kind / f"{name}.html"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(response.content)
+        print(f"Recorded {url} -> {path.relative_to(BENCH_DIR)}")
+
+    limit = config.get('games_per_page', 50)
+    save('listing', f"{category}-page1", f"{scraper.base_url}/{category}.games?page=1&limit={limit}")
+    for game in scraper.scrape_category_page(category, 1)[:games]:
+        save('game', game['id'], game['url'])
+        save('embed', game['id'], f"{scraper.base_url}/game/{game['id']}/")
+        time.sleep(config.get('rate_limit_seconds', 1.5))
+    print("Review the new pages, then run with --update-golden")
+
+
+def run_benchmark(fixtures, parsers: List[str], iterations: int, per_page: bool) -> List[Dict]:
+    rows = []
+    for parser in parsers:
+        for kind in EXTRACTORS:
+            func, per_parser = EXTRACTORS[kind]
+            if not per_parser and parser != parsers[0]:
+                continue
+            pages = [(name, content) for k, name, content in fixtures if k == kind]
+            if not pages:
+                continue
+            times = []
+            blocks = []
+            allocated = []
+            peaks = []
+            for name, content in pages:
+                result = measure(func, content, parser, iterations)
+                # Per-page time is the median of its runs so one slow run does not dominate
+                page_time = percentile(result['times'], 50)
+                times.append(page_time)
+                blocks.append(result['alloc_blocks'])
+                allocated.append(result['alloc_bytes'])
+                peaks.append(result['peak_bytes'])
+                if per_page:
+                    print(f"  {parser:<12} {kind:<8} {name:<28} {page_time * 1000:8.2f} ms "
+                          f"{result['alloc_blocks']:>8} blocks {result['peak_bytes'] / 1024:8.1f} KiB peak")
+            rows.append({
+                'parser': parser if per_parser else 'n/a',
+                'kind': kind,
+                'pages': len(pages),
+                'p50_ms': percentile(times, 50) * 1000,
+                'p95_ms': percentile(times, 95) * 1000,
+                'alloc_blocks': int(sum(blocks) / len(blocks)),
+                'alloc_kib': sum(allocated) / len(allocated) / 1024,
+                'peak_kib': max(peaks) / 1024,
+            })
+    return rows
+
+
+def print_rows(rows: List[Dict]):
+    print(f"\n{'parser':<12} {'kind':<8} {'pages':>5} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'blocks/page':>12} {'KiB/page':>9} {'peak KiB':>9}")
+    print('-' * 80)
+    for row in rows:
+        print(f"{row['parser']:<12} {row['kind']:<8} {row['pages']:>5} {row['p50_ms']:>9.2f} "
+              f"{row['p95_ms']:>9.2f} {row['alloc_blocks']:>12} {row['alloc_kib']:>9.1f} {row['peak_kib']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline parser benchmark against recorded 1games.io pages')
+    parser.add_argument('--parser', action='append', choices=HTML_PARSERS,
+                        help='Parser backend to benchmark (repeatable, default: all installed)')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed runs per page (default: 20)')
+    parser.add_argument('--per-page', action='store_true', help='Also print one line per page')
+    parser.add_argument('--json', type=str, metavar='PATH', help='Write the summary rows to a JSON file')
+    parser.add_argument('--update-golden', action='store_true',
+                        help=f'Regenerate golden outputs with {GOLDEN_PARSER} and exit')
+    parser.add_argument('--record', type=str, metavar='CATEGORY',
+                        help='Record a listing page and its first games from the live site and exit')
+    parser.add_argument('--games', type=int, default=6, help='Games to record with --record (default: 6)')
+    parser.add_argument('--config', type=str, default='config.json', help='Config used by --record')
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.games, args.config)
+        return
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        sys.exit(1)
+
+    if args.update_golden:
+        update_goldens(fixtures)
+        return
+
+    parsers = available_parsers(args.parser or list(HTML_PARSERS))
+    if not parsers:
+        print("No parser backend available")
+        sys.exit(1)
+
+    failures = check_goldens(fixtures, parsers)
+    rows = run_benchmark(fixtures, parsers, max(1, args.iterations), args.per_page)
+    print_rows(rows)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'iterations': args.iterations, 'rows': rows, 'failures': failures}, f, indent=2)
+
+    if failures:
+        print(f"\n{len(failures)} golden mismatch(es):")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        sys.exit(1)
+    print(f"\n✓ All {len(fixtures)} fixture(s) match golden outputs")
+
+
+if __name__ == '__main__':
+    main()
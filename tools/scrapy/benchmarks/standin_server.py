@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for 1games.io, serving the benchmark fixtures.
+
+Serves the three routes GamesScraper requests:
+    /{category}.games?page=&limit=   listing page built from fixture cards
+    /<slug>                          detail page (a fixture with the slug swapped in)
+    /game/<slug>/                    embed page (a fixture with the slug swapped in)
+
+Faults are injected per request from a seeded RNG: latency drawn from a
+distribution, 500 errors, 429s with Retry-After (random or above a
+requests-per-second cap), slow bodies and truncated bodies. ``/__stats``
+returns request counts as JSON and ``/__reset`` clears them.
+
+Usage (from tools/scrapy):
+    python benchmarks/standin_server.py --port 8000
+    python benchmarks/standin_server.py --latency uniform:0.02,0.2 --throttle-rate 0.02 --max-rps 20
+    python main.py --base-url http://127.0.0.1:8000 --category action --mode async
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# Site root used inside the fixtures; rewritten to the server's own URL
+FIXTURE_BASE_URL = 'https://1games.io'
+
+CARD_RE = re.compile(r'<div class="card card_topic"><a class="card__inner".*?</a></div>', re.DOTALL)
+GRID_RE = re.compile(r'(<div class="grid grid_cards">)(.*?)(</div><nav class="pagination">)', re.DOTALL)
+CARD_SLUG_RE = re.compile(r'href="(?:https://1games\.io)?/([^"/]+)"')
+LISTING_RE = re.compile(r'^/([\w-]+)\.games$')
+EMBED_RE = re.compile(r'^/game/([\w-]+)/?$')
+DETAIL_RE = re.compile(r'^/([\w-]+)$')
+
+# Fault injection defaults; every key can be overridden from the command line
+DEFAULT_PROFILE = {
+    'seed': 1,
+    'latency': 'fixed:0',          # fixed:S | uniform:A,B | normal:MU,SIGMA | lognormal:MU,SIGMA | exp:MEAN
+    'error_rate': 0.0,             # fraction of requests answered with 500
+    'throttle_rate': 0.0,          # fraction of requests answered with 429
+    'retry_after': 1,              # Retry-After seconds sent with 429s
+    'max_rps': 0,                  # above this many requests/s answer 429 (0 = no cap)
+    'slow_rate': 0.0,              # fraction of bodies sent in slow chunks
+    'slow_chunk_delay': 0.05,      # seconds between slow chunks
+    'truncate_rate': 0.0,          # fraction of bodies cut off half way
+    'pool_size': 300,              # distinct games on the stand-in site
+    'games_per_category': 120,     # games listed under each category
+}
+
+
+def latency_sampler(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler from a spec such as ``uniform:0.02,0.2``.
+
+    Args:
+        spec: Distribution name and comma-separated parameters
+
+    Returns:
+        Function drawing a latency in seconds from an RNG
+    """
+    name, _, params = spec.partition(':')
+    args = [float(value) for value in params.split(',') if value]
+    if name == 'fixed':
+        return lambda rng: args[0] if args else 0.0
+    if name == 'uniform':
+        return lambda rng: rng.uniform(args[0], args[1])
+    if name == 'normal':
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if name == 'lognormal':
+        return lambda rng: rng.lognormvariate(args[0], args[1])
+    if name == 'exp':
+        return lambda rng: rng.expovariate(1.0 / args[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class StandInSite:
+    """
+    Fixture-backed page generator plus fault injection and request stats.
+    """
+
+    def __init__(self, profile: Dict, fixtures_dir: Path = FIXTURES_DIR):
+        """
+        Args:
+            profile: DEFAULT_PROFILE with overrides
+            fixtures_dir: Directory with listing/, game/ and embed/ pages
+        """
+        self.profile = dict(DEFAULT_PROFILE, **profile)
+        self.base_url = FIXTURE_BASE_URL
+        self._rng = random.Random(self.profile['seed'])
+        self._latency = latency_sampler(self.profile['latency'])
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self.stats = Counter()
+        self.urls = Counter()
+
+        listing = sorted((fixtures_dir / 'listing').glob('*.html'))
+        if not listing:
+            raise FileNotFoundError(f"No listing fixtures in {fixtures_dir / 'listing'}")
+        self._listing_template = listing[0].read_text(encoding='utf-8')
+        self._cards: List[Tuple[str, str]] = []
+        for path in listing:
+            for card in CARD_RE.findall(path.read_text(encoding='utf-8')):
+                match = CARD_SLUG_RE.search(card)
+                if match:
+                    self._cards.append((match.group(1), card))
+
+        self._details = [(path.stem, path.read_text(encoding='utf-8'))
+                         for path in sorted((fixtures_dir / 'game').glob('*.html'))]
+        self._embeds = [(path.stem, path.read_text(encoding='utf-8'))
+                        for path in sorted((fixtures_dir / 'embed').glob('*.html'))]
+
+        seeds = [slug for slug, _ in self._cards]
+        self.slugs = [f"{seeds[i % len(seeds)]}-{i // len(seeds) + 1}" for i in range(self.profile['pool_size'])]
+        self._slug_set = set(self.slugs)
+
+    def category_games(self, category: str) -> List[str]:
+        """Slugs listed under a category, stable for a given seed."""
+        rng = random.Random(f"{self.profile['seed']}:{category}")
+        count = min(self.profile['games_per_category'], len(self.slugs))
+        return rng.sample(self.slugs, count)
+
+    def _pick(self, pages: List[Tuple[str, str]], slug: str, salt: str) -> str:
+        original, body = pages[zlib.crc32(f"{salt}:{slug}".encode()) % len(pages)]
+        return body.replace(original, slug)
+
+    def listing_page(self, category: str, page: int, limit: int) -> str:
+        games = self.category_games(category)[(page - 1) * limit:page * limit]
+        cards = []
+        for slug in games:
+            original, card = self._cards[zlib.crc32(slug.encode()) % len(self._cards)]
+            cards.append(card.replace(original, slug))
+        return GRID_RE.sub(lambda m: m.group(1) + ''.join(cards) + m.group(3), self._listing_template, count=1)
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, str, str]:
+        """
+        Resolve a request path to (status, route kind, body).
+        """
+        match = LISTING_RE.match(path)
+        if match:
+            page = int(query.get('page', ['1'])[0])
+            limit = int(query.get('limit', ['50'])[0])
+            return 200, 'listing', self.listing_page(match.group(1), max(page, 1), max(limit, 1))
+        match = EMBED_RE.match(path)
+        if match and match.group(1) in self._slug_set:
+            return 200, 'embed', self._pick(self._embeds, match.group(1), 'embed')
+        match = DETAIL_RE.match(path)
+        if match and match.group(1) in self._slug_set:
+            return 200, 'detail', self._pick(self._details, match.group(1), 'detail')
+        return 404, 'other', 'Not Found'
+
+    def fault(self) -> Tuple[float, Optional[int], str]:
+        """
+        Draw this request's latency and injected fault.
+
+        Returns:
+            Tuple of (latency, status override or None, body mode: 'full', 'slow' or 'truncated')
+        """
+        profile = self.profile
+        with self._lock:
+            now = time.monotonic()
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            latency = self._latency(self._rng)
+            roll = self._rng.random()
+            body_roll = self._rng.random()
+
+            status = None
+            if profile['max_rps'] and len(self._recent) > profile['max_rps']:
+                status = 429
+            elif roll < profile['error_rate']:
+                status = 500
+            elif roll < profile['error_rate'] + profile['throttle_rate']:
+                status = 429
+
+            mode = 'full'
+            if body_roll < profile['truncate_rate']:
+                mode = 'truncated'
+            elif body_roll < profile['truncate_rate'] + profile['slow_rate']:
+                mode = 'slow'
+        return latency, status, mode
+
+    def count(self, kind: str, status: int, url: str):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[f'{kind}_{status}'] += 1
+            self.urls[url] += 1
+
+    def reset(self):
+        """Clear request counters between benchmark runs."""
+        with self._lock:
+            self.stats.clear()
+            self.urls.clear()
+
+    def snapshot(self) -> Dict:
+        """Request counters plus how many requests were repeats of an earlier URL."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['distinct_urls'] = len(self.urls)
+            stats['repeated_requests'] = sum(self.urls.values()) - len(self.urls)
+        return stats
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    site: StandInSite = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        site = self.site
+        parsed = urlparse(self.path)
+        if parsed.path == '/__stats':
+            self._send(200, json.dumps(site.snapshot()).encode(), 'application/json')
+            return
+        if parsed.path == '/__reset':
+            site.reset()
+            self._send(200, b'{}', 'application/json')
+            return
+
+        latency, fault_status, mode = site.fault()
+        if latency:
+            time.sleep(latency)
+
+        status, kind, body = site.route(parsed.path, parse_qs(parsed.query))
+        if fault_status is not None and status == 200:
+            status = fault_status
+            body = 'Too Many Requests' if status == 429 else 'Internal Server Error'
+        site.count(kind, status, self.path)
+
+        headers = {}
+        if status == 429:
+            headers['Retry-After'] = str(site.profile['retry_after'])
+        body = body.replace(FIXTURE_BASE_URL + '/', site.base_url + '/').encode('utf-8')
+        self._send(status, body, 'text/html; charset=utf-8', headers, mode if status == 200 else 'full')
+
+    def _send(self, status: int, body: bytes, content_type: str,
+              headers: Optional[Dict[str, str]] = None, mode: str = 'full'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if mode == 'truncated':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+
+        try:
+            if mode == 'truncated':
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+            elif mode == 'slow':
+                step = max(1, len(body) // 8)
+                for start in range(0, len(body), step):
+                    self.wfile.write(body[start:start + step])
+                    self.wfile.flush()
+                    time.sleep(self.site.profile['slow_chunk_delay'])
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The scraper may stop reading an embed page early
+            self.close_connection = True
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop connections mid-body on purpose (early-exit embed checks)
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def start_server(profile: Dict, host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, StandInSite]:
+    """
+    Start the stand-in server in a background thread.
+
+    Args:
+        profile: Fault-injection overrides (see DEFAULT_PROFILE)
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+
+    Returns:
+        Tuple of (server, site); the site's ``base_url`` is the server URL
+    """
+    site = StandInSite(profile)
+    handler = type('Handler', (StandInHandler,), {'site': site})
+    server = StandInServer((host, port), handler)
+    site.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name='standin-server', daemon=True).start()
+    return server, site
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Add one --option per DEFAULT_PROFILE key."""
+    for key, default in DEFAULT_PROFILE.items():
+        parser.add_argument('--' + key.replace('_', '-'), dest=key, type=type(default), default=default,
+                            help=f'(default: {default})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for 1games.io from the fixtures')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to bind (default: 8000)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profile = {key: getattr(args, key) for key in DEFAULT_PROFILE}
+    server, site = start_server(profile, args.host, args.port)
+    print(f"Serving stand-in 1games.io at {site.base_url} (stats: {site.base_url}/__stats)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(site.snapshot(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
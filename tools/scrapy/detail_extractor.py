@@ -0,0 +1,342 @@
+"""
+Single-pass extraction of game details from a parsed 1games.io game page.
+
+GamesScraper used to run a separate full-tree search for every selector
+(description candidates, feature keywords, control keywords, tag lists,
+category, play count, reviews). This module walks the document once,
+hands each element to every extractor still waiting for a match, and
+stops as soon as every field is settled. Field resolution afterwards
+follows the original selector priorities, so the result is unchanged.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from bs4 import NavigableString, Tag
+
+
+# Description candidates in priority order: (tag name, attribute, value).
+# 'class' matches any single class or the full class string, like class_=...
+DESC_SELECTORS = (
+    ('div', 'class', 'game-description'),
+    ('div', 'class', 'description'),
+    ('section', 'class', 'game-info'),
+    ('div', 'class', 'game__description'),
+    ('div', 'itemprop', 'description'),
+    ('meta', 'name', 'description'),
+)
+
+# The same selectors grouped by tag name so each element only checks its own
+DESC_BY_NAME: Dict[str, List] = {}
+for _idx, (_name, _attr, _value) in enumerate(DESC_SELECTORS):
+    DESC_BY_NAME.setdefault(_name, []).append((_idx, _attr, _value))
+
+FEATURE_KEYWORDS = ('feature', 'highlight', 'gameplay', 'key point')
+CONTROL_KEYWORDS = ('control', 'how to play', 'instruction', 'keyboard', 'mouse')
+
+SECTION_TAGS = frozenset(('div', 'section'))
+TAG_LIMIT = 8
+
+NUMBER_RE = re.compile(r'[\d,]+')
+RATING_RE = re.compile(r'(\d+\.?\d*)')
+
+
+def _class_contains(keyword: str):
+    """class_ matcher equivalent to ``lambda x: x and keyword in x.lower()``."""
+    return lambda x: x and keyword in x.lower() if x else False
+
+
+def _values_match(value, expected: str) -> bool:
+    """Match an attribute the way BeautifulSoup does for a string filter."""
+    if isinstance(value, list):
+        return expected in value or ' '.join(value) == expected
+    return value == expected
+
+
+class _Scan:
+    """First matches collected during the single walk over the document."""
+
+    def __init__(self):
+        self.desc: List[Optional[Tag]] = [None] * len(DESC_SELECTORS)
+        self.feature: List[Optional[Tag]] = [None] * len(FEATURE_KEYWORDS)
+        self.info: Optional[Tag] = None
+        self.controls: List[Optional[NavigableString]] = [None] * len(CONTROL_KEYWORDS)
+        self.tag_links: List[Tag] = []
+        self.tag_spans: List[Tag] = []
+        self.rel_tags: List[Tag] = []
+        self.category_span: Optional[Tag] = None
+        self.category_link: Optional[Tag] = None
+        self.play_count: Optional[NavigableString] = None
+        self.review: Optional[Tag] = None
+
+        # Derived values of settled candidates, computed once on first match
+        self.description: Dict[int, str] = {}
+        self.features: Optional[List[str]] = None
+        self.control_text: Dict[int, str] = {}
+
+    def settled(self) -> bool:
+        """Whether further elements can no longer change any field."""
+        return (self._desc_settled()
+                and self._features_settled()
+                and self._controls_settled()
+                and len(self.tag_links) >= TAG_LIMIT
+                and self.category_span is not None
+                and self.play_count is not None
+                and self.review is not None)
+
+    def _desc_settled(self) -> bool:
+        for idx, elem in enumerate(self.desc):
+            if elem is None:
+                return False
+            if self.description.setdefault(idx, _description_from(elem)):
+                return True
+        return True
+
+    def _features_settled(self) -> bool:
+        if self.feature[0] is None:
+            return False
+        if self.features is None:
+            self.features = _features_from(self.feature[0])
+        return bool(self.features) or self.info is not None
+
+    def _controls_settled(self) -> bool:
+        for idx, string in enumerate(self.controls):
+            if string is None:
+                return False
+            if len(self.control_text.setdefault(idx, _controls_from(string))) > 20:
+                return True
+        return True
+
+
+def _description_from(elem: Tag) -> str:
+    if elem.name == 'meta':
+        return elem.get('content', '')
+    # Get text from paragraphs or direct text
+    paragraphs = elem.find_all('p')
+    if paragraphs:
+        return ' '.join([p.get_text(strip=True) for p in paragraphs[:2]])
+    return elem.get_text(strip=True)
+
+
+def _features_from(section: Tag) -> List[str]:
+    features = []
+    for ul in section.find_all(['ul', 'ol']):
+        items = ul.find_all('li')
+        features.extend([item.get_text(strip=True) for item in items[:6]])
+    return features
+
+
+def _controls_from(string: NavigableString) -> str:
+    parent = string.find_parent(['div', 'section', 'article', 'p', 'h2', 'h3'])
+    if not parent:
+        return ''
+    # Get the next sibling or content
+    next_content = parent.find_next(['p', 'div', 'ul'])
+    if next_content:
+        if next_content.name == 'ul':
+            items = next_content.find_all('li')
+            return ' | '.join([item.get_text(strip=True) for item in items])
+        return next_content.get_text(strip=True)
+    return parent.get_text(strip=True)
+
+
+def _scan(soup) -> _Scan:
+    """Walk the document once, recording the first match of every selector."""
+    scan = _Scan()
+    desc = scan.desc
+    feature = scan.feature
+    controls = scan.controls
+
+    for elem in soup.descendants:
+        matched = False
+
+        if isinstance(elem, NavigableString):
+            if not elem or (scan.play_count is not None and all(controls)):
+                continue
+            text = elem.lower()
+            for idx, keyword in enumerate(CONTROL_KEYWORDS):
+                if controls[idx] is None and keyword in text:
+                    controls[idx] = elem
+                    matched = True
+            if scan.play_count is None and 'play' in text and any(c.isdigit() for c in text):
+                scan.play_count = elem
+                matched = True
+
+        elif isinstance(elem, Tag):
+            name = elem.name
+            if name not in ('div', 'section', 'a', 'span', 'meta'):
+                continue
+            classes = elem.get('class')
+            joined = ' '.join(classes).lower() if classes else ''
+
+            for idx, attr, value in DESC_BY_NAME.get(name, ()):
+                if desc[idx] is None and _values_match(elem.get(attr), value):
+                    desc[idx] = elem
+                    matched = True
+
+            if name in SECTION_TAGS and joined:
+                for idx, keyword in enumerate(FEATURE_KEYWORDS):
+                    if feature[idx] is None and keyword in joined:
+                        feature[idx] = elem
+                        matched = True
+                if scan.info is None and 'info' in joined:
+                    scan.info = elem
+                    matched = True
+                if scan.review is None and 'review' in joined:
+                    scan.review = elem
+                    matched = True
+
+            elif name == 'a' or name == 'span':
+                if 'tag' in joined:
+                    (scan.tag_links if name == 'a' else scan.tag_spans).append(elem)
+                    matched = True
+                rel = elem.get('rel')
+                if rel is not None and _values_match(rel, 'tag'):
+                    scan.rel_tags.append(elem)
+                    matched = True
+                if 'category' in joined:
+                    if name == 'span' and scan.category_span is None:
+                        scan.category_span = elem
+                        matched = True
+                    elif name == 'a' and scan.category_link is None:
+                        scan.category_link = elem
+                        matched = True
+
+        if matched and scan.settled():
+            break
+
+    return scan
+
+
+def extract_details(soup, result: Dict):
+    """
+    Extract description, features, controls, tags, category, play count
+    and reviews from a parsed game page into ``result``.
+
+    Args:
+        soup: Parsed game detail page
+        result: Result dictionary to fill in
+    """
+    scan = _scan(soup)
+
+    # Description: first candidate (in selector order) with non-empty text
+    for idx, elem in enumerate(scan.desc):
+        if elem is not None:
+            description = scan.description.get(idx)
+            if description is None:
+                description = _description_from(elem)
+            if description:
+                result['description'] = description[:400]  # Limit to 400 chars
+                break
+
+    # Features: first keyword with a section, else short lists in an info section
+    features = []
+    for section in scan.feature:
+        if section is not None:
+            features = scan.features if section is scan.feature[0] and scan.features is not None \
+                else _features_from(section)
+            break
+    if not features and scan.info is not None:
+        for ul in scan.info.find_all(['ul', 'ol'], limit=2):
+            items = ul.find_all('li')
+            if 2 <= len(items) <= 12:  # Reasonable feature list
+                features.extend([item.get_text(strip=True) for item in items[:6]])
+    result['features'] = features[:6]  # Keep top 6
+
+    # Controls: first keyword whose context yields more than 20 characters
+    for idx, string in enumerate(scan.controls):
+        if string is not None:
+            controls = scan.control_text.get(idx)
+            if controls is None:
+                controls = _controls_from(string)
+            if controls and len(controls) > 20:
+                result['controls'] = controls[:300]
+                break
+
+    # Tags: first non-empty tag list, unique in document order
+    tags = []
+    for tag_list in (scan.tag_links, scan.tag_spans, scan.rel_tags):
+        if tag_list:
+            tags.extend([tag.get_text(strip=True) for tag in tag_list[:TAG_LIMIT]])
+            break
+    result['tags'] = list(dict.fromkeys(tags))[:TAG_LIMIT]
+
+    category_elem = scan.category_span or scan.category_link
+    if category_elem:
+        result['category'] = category_elem.get_text(strip=True)
+
+    if scan.play_count is not None:
+        numbers = NUMBER_RE.findall(scan.play_count)
+        if numbers:
+            try:
+                result['play_count'] = int(numbers[0].replace(',', ''))
+            except (ValueError, IndexError):
+                pass
+
+    _extract_reviews(scan.review, result)
+
+
+def _extract_reviews(review_section: Optional[Tag], result: Dict):
+    """Extract average rating and individual reviews from the review section."""
+    reviews = []
+    review_count = 0
+    average_rating = None
+
+    if review_section:
+        # Extract average rating
+        rating_elem = review_section.find(['span', 'div'], class_=_class_contains('rating'))
+        if rating_elem:
+            rating_match = RATING_RE.search(rating_elem.get_text(strip=True))
+            if rating_match:
+                try:
+                    average_rating = float(rating_match.group(1))
+                except ValueError:
+                    pass
+
+        # Extract individual reviews
+        review_elements = review_section.find_all(
+            ['div', 'article', 'li'],
+            class_=lambda x: x and ('comment' in x.lower() or 'review-item' in x.lower()) if x else False,
+            limit=5
+        )
+
+        for review_elem in review_elements:
+            author_elem = review_elem.find(
+                ['span', 'div', 'a'],
+                class_=lambda x: x and ('author' in x.lower() or 'user' in x.lower()) if x else False
+            )
+            comment_elem = review_elem.find(
+                ['p', 'div', 'span'],
+                class_=lambda x: x and ('text' in x.lower() or 'comment' in x.lower() or 'content' in x.lower()) if x else False
+            )
+            rating_elem = review_elem.find(['span', 'div'], class_=_class_contains('rating'))
+
+            # If no specific comment element, try to get the main text
+            if not comment_elem:
+                paragraphs = review_elem.find_all('p')
+                comment_elem = paragraphs[0] if paragraphs else review_elem
+
+            if comment_elem:
+                comment_text = comment_elem.get_text(strip=True)
+                if len(comment_text) > 15:  # Filter out too short texts
+                    review_data = {
+                        'author': author_elem.get_text(strip=True) if author_elem else 'Anonymous',
+                        'comment': comment_text[:250]  # Limit comment length
+                    }
+
+                    # Add rating if available
+                    if rating_elem:
+                        rating_match = RATING_RE.search(rating_elem.get_text(strip=True))
+                        if rating_match:
+                            try:
+                                review_data['rating'] = float(rating_match.group(1))
+                            except ValueError:
+                                pass
+
+                    reviews.append(review_data)
+
+        review_count = len(review_elements)
+
+    result['reviews'] = reviews[:5]  # Keep top 5 reviews
+    result['review_count'] = review_count
+    result['average_rating'] = average_rating
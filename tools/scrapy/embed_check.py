@@ -0,0 +1,106 @@
+"""
+Streaming embeddability check for /game/<slug>/ pages.
+
+Instead of parsing the whole embed page and re-serializing it to search for
+engine names, the raw body is scanned chunk by chunk for canvas/engine
+markers and iframe ``src`` values. Reading stops as soon as a third-party
+iframe is seen, because the page can no longer be embeddable.
+"""
+
+import re
+from typing import Iterable, Optional
+
+
+# Engine markers searched case-insensitively anywhere in the page
+ENGINE_MARKERS = (b'unity', b'webgl', b'phaser')
+
+CANVAS_RE = re.compile(rb'<canvas[\s/>]')
+IFRAME_RE = re.compile(rb'<iframe\b[^>]*>', re.IGNORECASE)
+SRC_RE = re.compile(rb'''\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.IGNORECASE)
+THIRD_PARTY_RE = re.compile(r'https?://(?!1games\.io)')
+
+# Bytes kept between chunks so markers split across a boundary are found
+OVERLAP = 16
+# Upper bound on a carried-over unterminated <iframe tag
+MAX_TAG_BYTES = 64 * 1024
+
+
+class EmbedScanner:
+    """
+    Incremental scanner deciding whether an embed page hosts a local game.
+
+    A page is embeddable when it has a canvas element or mentions Unity,
+    WebGL or Phaser, and has no iframe pointing outside 1games.io.
+    """
+
+    def __init__(self):
+        self.has_canvas = False
+        self.engines = set()
+        self.third_party_src: Optional[str] = None
+        self.bytes_read = 0
+        self._tail = b''
+
+    @property
+    def is_local_game(self) -> bool:
+        return self.has_canvas or bool(self.engines)
+
+    @property
+    def settled(self) -> bool:
+        """True once the rest of the page cannot change the verdict."""
+        return self.third_party_src is not None
+
+    @property
+    def is_embeddable(self) -> bool:
+        return self.is_local_game and self.third_party_src is None
+
+    def feed(self, chunk: bytes):
+        """
+        Scan the next chunk of the page body.
+
+        Args:
+            chunk: Raw bytes as received
+        """
+        self.bytes_read += len(chunk)
+        data = self._tail + chunk
+        lower = data.lower()
+
+        for marker in ENGINE_MARKERS:
+            if marker not in self.engines and marker in lower:
+                self.engines.add(marker)
+        if not self.has_canvas and CANVAS_RE.search(lower):
+            self.has_canvas = True
+
+        scanned = 0
+        for match in IFRAME_RE.finditer(data):
+            scanned = match.end()
+            src = SRC_RE.search(match.group(0))
+            if src:
+                value = next(group for group in src.groups() if group is not None)
+                value = value.decode('utf-8', errors='replace')
+                if THIRD_PARTY_RE.search(value):
+                    self.third_party_src = value
+                    return
+
+        # Carry an unterminated <iframe tag, or just enough bytes for split markers
+        start = lower.rfind(b'<iframe', scanned)
+        if start != -1 and len(data) - start <= MAX_TAG_BYTES:
+            self._tail = data[start:]
+        else:
+            self._tail = data[max(scanned, len(data) - OVERLAP):]
+
+    def scan(self, chunks: Iterable[bytes]) -> 'EmbedScanner':
+        """
+        Feed chunks until the verdict is settled or the body ends.
+
+        Args:
+            chunks: Iterable of body chunks
+
+        Returns:
+            self, for chaining
+        """
+        for chunk in chunks:
+            if chunk:
+                self.feed(chunk)
+            if self.settled:
+                break
+        return self
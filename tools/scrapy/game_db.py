@@ -0,0 +1,248 @@
+"""
+SQLite game database mirroring the site's ``games`` table.
+
+Validated games are upserted into a local SQLite file with the columns and
+indexes of tools/create_games_table.sql. Rows are written in batched
+transactions in WAL mode, and a row (and its ``updated_at``) is only
+rewritten when one of its fields actually changed, so repeated crawls
+touch only the games that changed and the data can be queried or exported
+without re-reading the per-category JSON files.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from records import json_default
+
+
+# Columns of create_games_table.sql that come from a scraped game, in table order
+GAME_COLUMNS = (
+    'id', 'name', 'url', 'thumbnail', 'rating', 'status', 'iframe_src', 'iframe_html',
+    'is_embeddable', 'description', 'features', 'controls', 'tags', 'category',
+    'play_count', 'reviews', 'review_count', 'average_rating',
+)
+
+# JSONB columns in Postgres, stored as JSON text here
+JSON_COLUMNS = ('features', 'tags', 'reviews')
+
+# SQLite translation of create_games_table.sql (JSONB -> TEXT, BOOLEAN -> INTEGER,
+# TIMESTAMPTZ -> ISO-8601 TEXT). The GIN index on tags has no SQLite equivalent.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  url TEXT,
+  thumbnail TEXT,
+  rating NUMERIC,
+  status TEXT,
+  iframe_src TEXT,
+  iframe_html TEXT,
+  is_embeddable INTEGER DEFAULT 0,
+  description TEXT,
+  features TEXT DEFAULT '[]',
+  controls TEXT,
+  tags TEXT DEFAULT '[]',
+  category TEXT,
+  play_count INTEGER DEFAULT 0,
+  reviews TEXT DEFAULT '[]',
+  review_count INTEGER DEFAULT 0,
+  average_rating NUMERIC,
+  source_file TEXT,
+  created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+  updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_games_rating ON games(rating DESC);
+CREATE INDEX IF NOT EXISTS idx_games_status ON games(status);
+CREATE INDEX IF NOT EXISTS idx_games_category ON games(category);
+CREATE INDEX IF NOT EXISTS idx_games_is_embeddable ON games(is_embeddable);
+"""
+
+_UPDATE_COLUMNS = GAME_COLUMNS[1:]
+
+# Insert new games; update existing ones only if a scraped field differs.
+# source_file keeps the first category file a game was saved under, like the
+# JS merge that builds merged_games.json.
+UPSERT_SQL = (
+    f"INSERT INTO games ({', '.join(GAME_COLUMNS)}, source_file, created_at, updated_at) "
+    f"VALUES ({', '.join('?' for _ in GAME_COLUMNS)}, ?, ?, ?) "
+    f"ON CONFLICT(id) DO UPDATE SET "
+    + ', '.join(f"{column} = excluded.{column}" for column in _UPDATE_COLUMNS)
+    + ", source_file = COALESCE(games.source_file, excluded.source_file)"
+    + ", updated_at = excluded.updated_at WHERE "
+    + ' OR '.join(f"games.{column} IS NOT excluded.{column}" for column in _UPDATE_COLUMNS)
+)
+
+
+def game_row(game: Dict) -> List:
+    """
+    Convert a game dictionary to values for GAME_COLUMNS.
+
+    Args:
+        game: Game dictionary produced by the scraper
+
+    Returns:
+        Column values, with list fields as JSON text and booleans as 0/1
+    """
+    row = []
+    for column in GAME_COLUMNS:
+        value = game.get(column)
+        if column in JSON_COLUMNS:
+            value = json.dumps(value or [], ensure_ascii=False, default=json_default)
+        elif column == 'is_embeddable':
+            value = 1 if value else 0
+        elif column in ('play_count', 'review_count'):
+            value = value or 0
+        row.append(value)
+    return row
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class GameDatabase:
+    """
+    Batched upserts of validated games into a SQLite ``games`` table.
+    """
+
+    def __init__(self, path: str, batch_size: int = 50):
+        """
+        Args:
+            path: SQLite database file
+            batch_size: Games buffered before they are written in one transaction
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+        self._lock = threading.Lock()
+        self._pending: List[List] = []
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['GameDatabase']:
+        """Build the database described by config['database'], or None if disabled."""
+        database = config.get('database', {})
+        if not database.get('enabled', False):
+            return None
+        return cls(database.get('path', 'data/games.sqlite'), database.get('batch_size', 50))
+
+    def upsert(self, game: Dict, source_file: Optional[str] = None):
+        """
+        Queue a game for writing, flushing once a batch is full.
+
+        Args:
+            game: Validated game dictionary
+            source_file: Output file the game belongs to (e.g. 'action_games.json')
+        """
+        now = _now()
+        with self._lock:
+            self._pending.append(game_row(game) + [source_file, now, now])
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Write all queued games."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Write queued games in one transaction (lock held)."""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        # Later rows for the same game win, as they would with one upsert each
+        unique = {}
+        for row in rows:
+            unique[row[0]] = row
+
+        with self._conn:
+            ids = list(unique)
+            existing = set()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                existing.update(row[0] for row in self._conn.execute(
+                    f"SELECT id FROM games WHERE id IN ({', '.join('?' for _ in chunk)})", chunk))
+            for game_id, row in unique.items():
+                changed = self._conn.execute(UPSERT_SQL, row).rowcount
+                if game_id not in existing:
+                    self.stats['inserted'] += 1
+                elif changed:
+                    self.stats['updated'] += 1
+                else:
+                    self.stats['unchanged'] += 1
+
+    def iter_games(self, category: Optional[str] = None, embeddable_only: bool = False) -> Iterator[Dict]:
+        """
+        Yield stored games as dictionaries, highest rated first.
+
+        Args:
+            category: Only games whose detail-page category matches
+            embeddable_only: Only games with is_embeddable set
+
+        Yields:
+            Game dictionaries shaped like the scraper's JSON output plus
+            source_file, created_at and updated_at
+        """
+        self.flush()
+        clauses = []
+        params = []
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if embeddable_only:
+            clauses.append("is_embeddable = 1")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        columns = GAME_COLUMNS + ('source_file', 'created_at', 'updated_at')
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM games{where} ORDER BY rating DESC, id", params
+            ).fetchall()
+        for row in rows:
+            game = dict(zip(columns, row))
+            for column in JSON_COLUMNS:
+                game[column] = json.loads(game[column]) if game[column] else []
+            game['is_embeddable'] = bool(game['is_embeddable'])
+            yield game
+
+    def export_json(self, output_path: str, embeddable_only: bool = False) -> Path:
+        """
+        Write the stored games as a merged_games.json-style document.
+
+        Args:
+            output_path: JSON file to write
+            embeddable_only: Only export embeddable games
+
+        Returns:
+            Path of the written file
+        """
+        games = list(self.iter_games(embeddable_only=embeddable_only))
+        path = Path(output_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'total_games': len(games),
+                'merged_at': datetime.now().isoformat(),
+                'games': games,
+            }, f, ensure_ascii=False, indent=2)
+        return path
+
+    def summary(self) -> str:
+        """One-line summary of database writes for end-of-run reporting."""
+        return (f"Game database: {self.stats['inserted']} inserted, {self.stats['updated']} updated, "
+                f"{self.stats['unchanged']} unchanged ({self.path})")
+
+    def close(self):
+        """Write queued games and close the database."""
+        with self._lock:
+            self._flush()
+            self._conn.close()
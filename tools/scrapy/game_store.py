@@ -0,0 +1,152 @@
+"""
+Run-scoped canonical game store.
+
+Popular games are listed under several categories. The store keeps one
+detail/embed result per game ``id`` for the lifetime of a GamesScraper, so
+a game's pages are fetched once per run no matter how many categories list
+it. Concurrent workers asking for a game that is already being fetched
+wait for that fetch instead of starting another one.
+
+In memory budget mode the results are kept in a scratch SQLite file
+instead of in memory, so a long multi-category run does not hold the
+details of every game it has seen.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from records import json_default
+
+
+class _SpilledDetails:
+    """
+    Game id -> details mapping stored in a scratch SQLite file.
+
+    Every ``get`` decodes a fresh copy. Not thread-safe on its own; the
+    store's lock guards it.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Run-scoped: never reuse results from an earlier run
+        if self.path.exists():
+            self.path.unlink()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # Scratch data: no journal, no fsync
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE details (id TEXT PRIMARY KEY, details TEXT NOT NULL)")
+
+    def get(self, game_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT details FROM details WHERE id = ?", (game_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __setitem__(self, game_id: str, details: Dict):
+        self._conn.execute("INSERT OR REPLACE INTO details (id, details) VALUES (?, ?)",
+                           (game_id, json.dumps(details, ensure_ascii=False, default=json_default)))
+
+
+class RunGameStore:
+    """
+    Detail/embed results and category membership keyed by game ``id``.
+    """
+
+    def __init__(self, spill_path: Optional[str] = None):
+        """
+        Args:
+            spill_path: Keep details in this scratch SQLite file (recreated)
+                instead of in memory
+        """
+        self.stats = {'fetched': 0, 'shared': 0}
+        self._lock = threading.Lock()
+        self._spilled = spill_path is not None
+        self._details = _SpilledDetails(spill_path) if self._spilled else {}
+        self._pending: Dict[str, threading.Event] = {}
+        self._categories: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['RunGameStore']:
+        """Build the store unless config['dedupe_games'] is false; spilled to disk in memory budget mode."""
+        if not config.get('dedupe_games', True):
+            return None
+        budget = config.get('memory_budget', {})
+        if budget.get('enabled', False):
+            return cls(budget.get('spill_path', 'state/run_games.sqlite'))
+        return cls()
+
+    def add_member(self, game_id: str, category: str):
+        """Record that ``category`` lists the game."""
+        with self._lock:
+            categories = self._categories.setdefault(game_id, [])
+            if category not in categories:
+                categories.append(category)
+
+    def categories_for(self, game_id: str) -> List[str]:
+        """Categories that listed the game so far in this run."""
+        with self._lock:
+            return list(self._categories.get(game_id, ()))
+
+    def lookup(self, game_id: str) -> Optional[Dict]:
+        """Copy of the game's details if already fetched in this run, else None."""
+        with self._lock:
+            details = self._details.get(game_id)
+            if details is None:
+                return None
+            self.stats['shared'] += 1
+            return self._copy(details)
+
+    def resolve(self, game_id: str, fetch: Callable[[], Tuple[Dict, bool, bool]]) -> Tuple[Dict, bool]:
+        """
+        Return the game's details, calling ``fetch`` only if no other caller
+        has fetched (or is fetching) them in this run. Incomplete details
+        (a page could not be fetched) are not kept, so the next category
+        listing the game tries again.
+
+        Args:
+            game_id: Game id
+            fetch: Callable returning (details, True if pages were requested,
+                True if the details are complete)
+
+        Returns:
+            Tuple of (copy of details, True if this call requested pages)
+        """
+        while True:
+            with self._lock:
+                details = self._details.get(game_id)
+                if details is not None:
+                    self.stats['shared'] += 1
+                    return self._copy(details), False
+                pending = self._pending.get(game_id)
+                if pending is None:
+                    pending = self._pending[game_id] = threading.Event()
+                    break
+            # Another worker is fetching this game; wait and re-check
+            pending.wait()
+
+        try:
+            details, fetched, complete = fetch()
+            with self._lock:
+                if complete:
+                    self._details[game_id] = details if self._spilled else copy.deepcopy(details)
+                if fetched:
+                    self.stats['fetched'] += 1
+            return details, fetched
+        finally:
+            with self._lock:
+                del self._pending[game_id]
+            pending.set()
+
+    def _copy(self, details: Dict) -> Dict:
+        # Spilled details are decoded afresh on every read
+        return details if self._spilled else copy.deepcopy(details)
+
+    def summary(self) -> str:
+        """One-line summary of cross-category sharing for end-of-run reporting."""
+        multi = sum(1 for categories in self._categories.values() if len(categories) > 1)
+        return (f"Dedup: {len(self._categories)} unique game(s), {multi} listed in several "
+                f"categories, {self.stats['shared']} detail fetch(es) shared")
@@ -0,0 +1,230 @@
+"""
+Persistent HTTP response cache for the 1games.io scraper.
+Stores response bodies with their validators in SQLite so unchanged pages
+can be served locally or revalidated with a conditional request (304).
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_TTLS = {
+    'listing': 3600,
+    'detail': 86400,
+    'embed': 86400,
+}
+
+
+def classify_url(url: str) -> str:
+    """
+    Classify a 1games.io URL for TTL purposes.
+
+    Args:
+        url: Requested URL
+
+    Returns:
+        'listing' for category pages, 'embed' for /game/<slug>/ pages,
+        'detail' for everything else
+    """
+    path = urlparse(url).path
+    if path.endswith('.games'):
+        return 'listing'
+    if path.startswith('/game/'):
+        return 'embed'
+    return 'detail'
+
+
+class CacheEntry:
+    """A cached response body plus the validators needed to revalidate it."""
+
+    __slots__ = ('url', 'body', 'content_type', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, url: str, body: bytes, content_type: Optional[str],
+                 etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.url = url
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def age(self) -> float:
+        """Seconds since the body was last confirmed fresh."""
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that make the origin answer 304 if the page is unchanged."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Build a requests.Response carrying the cached body."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = self.body
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict()
+        if self.content_type:
+            response.headers['Content-Type'] = self.content_type
+        if self.etag:
+            response.headers['ETag'] = self.etag
+        if self.last_modified:
+            response.headers['Last-Modified'] = self.last_modified
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """
+    On-disk response cache with per-URL-class TTLs and LRU eviction.
+
+    Entries younger than their TTL are served without a request. Older
+    entries are revalidated with If-None-Match / If-Modified-Since. When
+    the stored bodies exceed ``max_bytes`` the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            path: SQLite database file
+            max_bytes: Size cap for stored bodies
+            ttls: Seconds a response stays fresh, keyed by URL class
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ResponseCache']:
+        """Build the cache described by config['cache'], or None if disabled."""
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return cls(
+            cache_config.get('path', 'cache/http_cache.sqlite'),
+            int(cache_config.get('max_size_mb', 200) * 1024 * 1024),
+            cache_config.get('ttl_seconds'),
+        )
+
+    def ttl_for(self, url: str) -> float:
+        """TTL in seconds for the URL's class."""
+        return self.ttls.get(classify_url(url), 0)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a URL, marking it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, content_type, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return CacheEntry(url, row[0], row[1], row[2], row[3], row[4])
+
+    def record(self, event: str):
+        """Count a cache event ('hits', 'misses' or 'revalidated')."""
+        with self._lock:
+            self.stats[event] += 1
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether an entry can be served without contacting the origin."""
+        return entry.age() < self.ttl_for(entry.url)
+
+    def store(self, url: str, response: requests.Response, body: Optional[bytes] = None):
+        """
+        Store a 200 response and evict old entries if over the size cap.
+
+        Args:
+            url: Requested URL (cache key)
+            response: Response carrying headers/validators
+            body: Response body (defaults to response.content)
+        """
+        if body is None:
+            body = response.content
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, size, content_type, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, len(body), response.headers.get('Content-Type'),
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now)
+            )
+            self.stats['stored'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, entry: CacheEntry, response: requests.Response):
+        """
+        Mark an entry fresh again after a 304, picking up new validators.
+
+        Args:
+            entry: Entry that was revalidated
+            response: The 304 response
+        """
+        entry.fetched_at = time.time()
+        entry.etag = response.headers.get('ETag', entry.etag)
+        entry.last_modified = response.headers.get('Last-Modified', entry.last_modified)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET etag = ?, last_modified = ?, fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (entry.etag, entry.last_modified, entry.fetched_at, entry.fetched_at, entry.url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until under the size cap (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            self.stats['evicted'] += 1
+
+    def summary(self) -> str:
+        """One-line summary of cache activity for end-of-run reporting."""
+        return (f"HTTP cache: {self.stats['hits']} hit(s), {self.stats['revalidated']} revalidated (304), "
+                f"{self.stats['misses']} miss(es), {self.stats['evicted']} evicted")
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,110 @@
+"""
+Append-only crawl journal for checkpoint/resume.
+Every fetched listing page and every validated game is written as one JSON
+line as soon as it completes, so an interrupted crawl can be rebuilt and
+continued without fetching finished work again.
+"""
+
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from records import as_dict
+
+
+class CrawlJournal:
+    """
+    JSONL journal of completed listing pages and validated games.
+
+    Record types:
+        {"type": "page", "category": ..., "page": ..., "limit": ..., "games": [...]}
+        {"type": "game", "id": ..., "details": {...}}
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path: Journal file
+            resume: Replay the existing journal instead of starting a new one
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = {'pages_restored': 0, 'games_restored': 0}
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, int, int], List[Dict]] = {}
+        self._games: Dict[str, Dict] = {}
+
+        if resume and self.path.exists():
+            self._replay()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['CrawlJournal']:
+        """Build the journal described by config['journal'], or None if disabled."""
+        journal = config.get('journal', {})
+        if not journal.get('enabled', False):
+            return None
+        return cls(journal.get('path', 'state/crawl_journal.jsonl'), journal.get('resume', False))
+
+    def _replay(self):
+        """Rebuild completed work from the journal file."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a half-written last line
+                    continue
+                if record.get('type') == 'page':
+                    key = (record['category'], record['page'], record['limit'])
+                    self._pages[key] = record['games']
+                elif record.get('type') == 'game':
+                    self._games[record['id']] = record['details']
+
+    def _append(self, record: Dict):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def lookup_page(self, category: str, page: int, limit: int) -> Optional[List[Dict]]:
+        """Copy of a journaled listing page's games, or None if not fetched yet."""
+        with self._lock:
+            games = self._pages.get((category, page, limit))
+            if games is None:
+                return None
+            self.stats['pages_restored'] += 1
+            return copy.deepcopy(games)
+
+    def record_page(self, category: str, page: int, limit: int, games: List[Dict]):
+        """Journal the games parsed from a listing page."""
+        games = [as_dict(game) for game in games]
+        with self._lock:
+            self._pages[(category, page, limit)] = copy.deepcopy(games)
+        self._append({'type': 'page', 'category': category, 'page': page, 'limit': limit, 'games': games})
+
+    def lookup_game(self, game_id: str) -> Optional[Dict]:
+        """Copy of a journaled game's detail/embed result, or None if not validated yet."""
+        with self._lock:
+            details = self._games.get(game_id)
+            if details is None:
+                return None
+            self.stats['games_restored'] += 1
+            return copy.deepcopy(details)
+
+    def record_game(self, game_id: str, details: Dict):
+        """Journal a validated game's detail/embed result."""
+        with self._lock:
+            self._games[game_id] = copy.deepcopy(details)
+        self._append({'type': 'game', 'id': game_id, 'details': details})
+
+    def summary(self) -> str:
+        """One-line summary of restored work for end-of-run reporting."""
+        return (f"Journal: {self.stats['pages_restored']} listing page(s) and "
+                f"{self.stats['games_restored']} game(s) restored from {self.path}")
+
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
@@ -5,13 +5,29 @@ Usage:
     python main.py --category action --pages 2
     python main.py --category action,racing --pages 3
     python main.py --config config.json
+    python main.py --category action --mode async
+    python main.py --category action --format jsonl
+    python main.py --sitemap --since 2025-11-01
+    python main.py --category action --replay archive/20251103_120000.warc.gz
+    python main.py --category action,racing --worker
+    python main.py --merge
+    python main.py --category action --memory-budget --trace-memory
 """
 
 import argparse
 import json
+import os
+import socket
 import sys
 from pathlib import Path
+from datetime import datetime
+from typing import Optional
+from game_db import GameDatabase
+from merge import GameMerger
+from output import JsonlGameSink, jsonl_to_json
 from scraper import GamesScraper
+from sitemap import parse_lastmod
+from workqueue import WorkQueue, run_worker
 
 
 def load_config(config_path: str = 'config.json') -> dict:
@@ -27,6 +43,46 @@ def load_config(config_path: str = 'config.json') -> dict:
         sys.exit(1)
 
 
+def finish_spilled_json(jsonl_path: Path, json_path: Optional[str] = None) -> Path:
+    """Turn a JSONL file spilled in memory budget mode into the JSON document, removing the JSONL."""
+    path = jsonl_to_json(jsonl_path, json_path)
+    os.remove(jsonl_path)
+    return path
+
+
+def print_run_summary(scraper: GamesScraper, config: dict):
+    """Print the end-of-run summary of every enabled stage, then the metrics report."""
+    if scraper.games:
+        print(scraper.games.summary())
+    if scraper.cache:
+        print(scraper.report_cache_stats())
+    if scraper.rate_control:
+        print(scraper.rate_control.summary())
+    if scraper.state:
+        print(scraper.state.summary())
+    if scraper.journal and config.get('journal', {}).get('resume'):
+        print(scraper.journal.summary())
+    if scraper.database:
+        print(scraper.database.summary())
+    if scraper.thumbnails:
+        print(scraper.thumbnails.summary())
+    if scraper.archive:
+        print(scraper.archive.summary())
+    if scraper.replay:
+        print(scraper.replay.summary())
+    print(scraper.report_metrics())
+
+
+def parse_workers_arg(value: str):
+    """argparse type for --parse-workers: a process count or 'auto'."""
+    if value == 'auto':
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'auto', got '{value}'")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Scrape game information from 1games.io',
@@ -47,6 +103,38 @@ Examples:
 
   # Specify custom output file
   python main.py --category action --output my_games.json
+
+  # Keep several requests in flight (token-bucket rate limiting)
+  python main.py --category action --mode async --concurrency 8
+
+  # Also parse pages on every CPU core
+  python main.py --category action --mode async --parse-workers auto
+
+  # Daily crawl: only re-check new, changed or stale games
+  python main.py --incremental
+
+  # Continue a crawl that was interrupted (Ctrl-C, network outage)
+  python main.py --category action,racing --resume
+
+  # Discover games from the sitemap, only those changed since a date
+  python main.py --sitemap --since 2025-11-01
+
+  # Archive every fetched page, then re-run extraction offline after a parser fix
+  python main.py --category action --archive
+  python main.py --category action --replay archive/20251103_120000.warc.gz
+
+  # Split a crawl across processes/machines sharing a filesystem (start several)
+  python main.py --category action,racing --worker --queue /shared/work_queue.sqlite
+
+  # Stream games to JSONL as they are scraped, then convert for the site
+  python main.py --category action --format jsonl
+  python main.py --to-json data/action_games.jsonl
+
+  # Large crawl in a fixed memory envelope, with a per-stage tracemalloc report
+  python main.py --category action,racing --memory-budget --trace-memory
+
+  # Update ../merged_games.json from the per-category outputs (only changed files are read)
+  python main.py --merge
         """
     )
 
@@ -81,6 +169,150 @@ Examples:
         help='Skip iframe scraping (faster, but no embed codes)'
     )
 
+    parser.add_argument(
+        '--base-url',
+        type=str,
+        help='Site root to scrape (default: https://1games.io; e.g. a local stand-in server)'
+    )
+
+    parser.add_argument(
+        '--mode',
+        choices=['sync', 'pipeline', 'async'],
+        help='Crawl mode: sync (one request at a time), pipeline (thread pool) or async (concurrent)'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Maximum requests in flight in pipeline/async mode'
+    )
+
+    parser.add_argument(
+        '--interleave',
+        action='store_true',
+        help='Crawl all categories at once through the global scheduler (per-host budgets)'
+    )
+
+    parser.add_argument(
+        '--sitemap',
+        action='store_true',
+        help='Discover games from the sitemap index instead of listing pages (listings only add ratings)'
+    )
+
+    parser.add_argument(
+        '--since',
+        type=str,
+        metavar='DATE',
+        help='With --sitemap: only games whose lastmod is on or after DATE (ISO 8601)'
+    )
+
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help='Take listing/game tasks from the shared work queue; the last worker writes the output'
+    )
+
+    parser.add_argument(
+        '--queue',
+        type=str,
+        metavar='PATH',
+        help='Work queue database for --worker (overrides work_queue.path)'
+    )
+
+    parser.add_argument(
+        '--parse-workers',
+        type=parse_workers_arg,
+        metavar='N',
+        help='Parse HTML in N worker processes ("auto" = one per CPU core, 0 = in the fetching thread)'
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Enable the on-disk HTTP cache (conditional requests for unchanged pages)'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only scrape details for new, changed or stale games (uses the state file)'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted crawl from the journal instead of starting over'
+    )
+
+    parser.add_argument(
+        '--thumbnails',
+        action='store_true',
+        help='Download, verify and store thumbnails locally (resized WebP copies need Pillow)'
+    )
+
+    parser.add_argument(
+        '--db',
+        action='store_true',
+        help='Upsert every validated game into the SQLite game database'
+    )
+
+    parser.add_argument(
+        '--export-db',
+        type=str,
+        metavar='JSON',
+        help='Export the SQLite game database as a merged JSON document and exit'
+    )
+
+    parser.add_argument(
+        '--archive',
+        action='store_true',
+        help='Store every fetched page in a compressed, deduplicated WARC archive for this run'
+    )
+
+    parser.add_argument(
+        '--replay',
+        type=str,
+        metavar='ARCHIVE',
+        help='Re-run listing/card/detail extraction against a .warc.gz archive without network access'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='Write the per-stage metrics as a JSON run report and a Prometheus text file'
+    )
+
+    parser.add_argument(
+        '--memory-budget',
+        action='store_true',
+        help='Bound memory: validate page by page, small queues, free parse trees at once, spill results to disk'
+    )
+
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Trace allocations with tracemalloc and report peak memory per stage and the top allocation sites'
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=['json', 'jsonl'],
+        help='Output format: json (written at the end) or jsonl (one line per game, streamed)'
+    )
+
+    parser.add_argument(
+        '--to-json',
+        type=str,
+        metavar='JSONL',
+        help='Convert a finished JSONL output file to the JSON document and exit'
+    )
+
+    parser.add_argument(
+        '--merge',
+        action='store_true',
+        help='Merge the per-category outputs into merged_games.json (incremental) and exit'
+    )
+
     parser.add_argument(
         '--list-categories',
         action='store_true',
@@ -99,6 +331,38 @@ Examples:
             print(f"  - {cat}")
         sys.exit(0)
 
+    # Convert JSONL output if requested
+    if args.to_json:
+        try:
+            print(f"Wrote {jsonl_to_json(args.to_json, args.output)}")
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    # Merge the per-category outputs if requested
+    if args.merge:
+        if args.output:
+            # A different target keeps its own index (<output>.index.json)
+            config['merge'] = {'output_path': args.output}
+        merger = GameMerger.from_config(config)
+        try:
+            merger.merge()
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(merger.summary())
+        sys.exit(0)
+
+    # Export the game database if requested
+    if args.export_db:
+        database = GameDatabase(config.get('database', {}).get('path', 'data/games.sqlite'))
+        try:
+            print(f"Wrote {database.export_json(args.export_db)}")
+        finally:
+            database.close()
+        sys.exit(0)
+
     # Override config with command-line arguments
     if args.pages:
         config['max_pages'] = args.pages
@@ -106,6 +370,74 @@ Examples:
     if args.no_iframes:
         config['scrape_iframes'] = False
 
+    if args.base_url:
+        config['base_url'] = args.base_url
+
+    if args.mode:
+        config['crawl_mode'] = args.mode
+
+    if args.concurrency:
+        config['concurrency'] = args.concurrency
+
+    if args.parse_workers is not None:
+        config['parse_workers'] = args.parse_workers
+
+    if args.cache:
+        config.setdefault('cache', {})['enabled'] = True
+
+    if args.incremental:
+        config.setdefault('incremental', {})['enabled'] = True
+
+    if args.interleave:
+        config.setdefault('scheduler', {})['enabled'] = True
+
+    if args.resume:
+        config.setdefault('journal', {}).update({'enabled': True, 'resume': True})
+
+    if args.thumbnails:
+        config.setdefault('thumbnails', {})['enabled'] = True
+
+    if args.db:
+        config.setdefault('database', {})['enabled'] = True
+
+    if args.archive:
+        config.setdefault('archive', {})['enabled'] = True
+
+    if args.replay:
+        config.setdefault('archive', {})['replay'] = args.replay
+
+    if args.metrics:
+        config.setdefault('metrics', {})['enabled'] = True
+
+    if args.memory_budget:
+        config.setdefault('memory_budget', {})['enabled'] = True
+
+    if args.trace_memory:
+        config.setdefault('memory_budget', {})['trace'] = True
+
+    if args.queue:
+        config.setdefault('work_queue', {})['path'] = args.queue
+
+    if args.worker:
+        # The queue keeps the progress; per-process journals/archives must not share a file
+        config.setdefault('journal', {})['enabled'] = False
+        config.setdefault('archive', {})['run_id'] = (
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{socket.gethostname()}_{os.getpid()}")
+
+    if args.since:
+        if parse_lastmod(args.since) is None:
+            print(f"Error: --since expects an ISO 8601 date, got '{args.since}'")
+            sys.exit(1)
+        config.setdefault('sitemap', {})['since'] = args.since
+
+    if args.format:
+        config['output_format'] = args.format
+    # In memory budget mode games always stream to disk; JSON output is
+    # converted from the finished JSONL file instead of built in memory
+    spill = (config.get('output_format', 'json') == 'json'
+             and config.get('memory_budget', {}).get('enabled', False))
+    streaming = config.get('output_format', 'json') == 'jsonl' or spill
+
     # Determine categories to scrape
     if args.category:
         categories = [cat.strip() for cat in args.category.split(',')]
@@ -114,7 +446,7 @@ Examples:
         print(f"No category specified. Using default from config: {categories}")
 
     # Validate single category for custom output
-    if args.output and len(categories) > 1:
+    if args.output and len(categories) > 1 and not args.sitemap:
         print("Error: --output can only be used with a single category")
         sys.exit(1)
 
@@ -125,48 +457,131 @@ Examples:
     print(f"Categories: {', '.join(categories)}")
     print(f"Pages per category: {config['max_pages']}")
     print(f"Scrape iframes: {config['scrape_iframes']}")
-    print(f"Rate limit: {config['rate_limit_seconds']}s between requests")
+    if config.get('adaptive_rate', {}).get('enabled', False):
+        print(f"Rate limit: adaptive, starting at {config['rate_limit_seconds']}s between requests")
+    else:
+        print(f"Rate limit: {config['rate_limit_seconds']}s between requests")
+    if args.worker:
+        print(f"Crawl mode: worker (queue {config.get('work_queue', {}).get('path', 'state/work_queue.sqlite')})")
+    elif args.sitemap:
+        since = config.get('sitemap', {}).get('since')
+        print(f"Crawl mode: sitemap discovery" + (f" (changed since {since})" if since else ''))
+    elif len(categories) > 1 and config.get('scheduler', {}).get('enabled', False):
+        print(f"Crawl mode: interleaved ({config.get('concurrency', 8)} workers)")
+    else:
+        print(f"Crawl mode: {config.get('crawl_mode', 'sync')}")
+    if config.get('memory_budget', {}).get('enabled', False):
+        print("Memory budget: on (results spill to disk)")
+    print(f"Incremental: {config.get('incremental', {}).get('enabled', False)}")
+    if args.replay:
+        print(f"Replaying: {args.replay} (no network access)")
+    print(f"Output format: {config.get('output_format', 'json')}")
     print(f"{'='*60}\n")
 
-    scraper = GamesScraper(config)
+    try:
+        scraper = GamesScraper(config)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     # Scrape categories
     try:
-        if len(categories) == 1:
+        if args.worker:
+            queue = WorkQueue.from_config(config)
+            results = run_worker(scraper, queue, categories, config['max_pages'],
+                                 config.get('work_queue', {}).get('poll_seconds', 5))
+
+            print(f"\n{'='*60}")
+            print(queue.summary())
+            if results is None:
+                print("Worker finished; the output is written by the worker that merges the crawl.")
+            else:
+                for category, games in results.items():
+                    if streaming:
+                        with JsonlGameSink.for_category(config, category) as sink:
+                            for game in games:
+                                sink.write(game)
+                        saved_path = sink.path
+                    else:
+                        saved_path = scraper.save_to_json(games, category)
+                    print(f"{category}: {len(games)} games -> {saved_path}")
+                print(f"Total: {sum(len(games) for games in results.values())} games")
+            print_run_summary(scraper, config)
+            print(f"{'='*60}\n")
+
+        elif args.sitemap:
+            print("Discovering games from the sitemap...")
+            games = scraper.scrape_sitemap(categories)
+            saved_path = scraper.save_to_json(games, 'sitemap', args.output)
+
+            print(f"\n{'='*60}")
+            print(f"Scraping completed successfully!")
+            print(f"{'='*60}")
+            print(scraper.sitemap.summary())
+            print(f"Total games scraped: {len(games)}")
+            print(f"Output saved to: {saved_path}")
+            print_run_summary(scraper, config)
+            print(f"{'='*60}\n")
+
+        elif len(categories) == 1:
             category = categories[0]
             print(f"Scraping category: {category}")
-            games = scraper.scrape_category(category)
-
-            # Save results
             output_path = args.output if args.output else None
-            saved_path = scraper.save_to_json(games, category, output_path)
+
+            if streaming:
+                jsonl_path = str(Path(output_path).with_suffix('.jsonl')) if spill and output_path else output_path
+                sink = scraper.stream_to_jsonl(category, jsonl_path)
+                total, saved_path = sink.total_games, sink.path
+                if spill:
+                    saved_path = finish_spilled_json(sink.path, output_path)
+            else:
+                games = scraper.scrape_category(category)
+                total = len(games)
+                # Save results
+                saved_path = scraper.save_to_json(games, category, output_path)
 
             print(f"\n{'='*60}")
             print(f"Scraping completed successfully!")
             print(f"{'='*60}")
-            print(f"Total games scraped: {len(games)}")
+            print(f"Total games scraped: {total}")
             print(f"Output saved to: {saved_path}")
+            print_run_summary(scraper, config)
             print(f"{'='*60}\n")
 
         else:
             print(f"Scraping {len(categories)} categories...")
-            results = scraper.scrape_multiple_categories(categories)
+            if streaming:
+                sinks = scraper.stream_multiple_categories(categories)
+                counts = {category: sink.total_games for category, sink in sinks.items()}
+                if spill:
+                    for sink in sinks.values():
+                        finish_spilled_json(sink.path)
+            else:
+                results = scraper.scrape_multiple_categories(categories)
+                counts = {category: len(games) for category, games in results.items()}
 
             print(f"\n{'='*60}")
             print(f"All categories scraped successfully!")
             print(f"{'='*60}")
-            for category, games in results.items():
-                print(f"{category}: {len(games)} games")
-            print(f"Total: {sum(len(g) for g in results.values())} games")
+            for category, count in counts.items():
+                print(f"{category}: {count} games")
+            print(f"Total: {sum(counts.values())} games")
             print(f"Output directory: {config['output_dir']}")
+            print_run_summary(scraper, config)
             print(f"{'='*60}\n")
 
     except KeyboardInterrupt:
         print("\n\nScraping interrupted by user.")
+        print(scraper.report_metrics())
+        if scraper.journal:
+            print(f"Progress saved to {scraper.journal.path}; rerun with --resume to continue.")
         sys.exit(1)
     except Exception as e:
         print(f"\n\nError during scraping: {e}")
         sys.exit(1)
+    finally:
+        if scraper.parse_pool:
+            scraper.parse_pool.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,176 @@
+"""
+tracemalloc-based memory report for a crawl.
+
+When enabled (config['memory_budget']['trace']), allocations are traced for
+the whole run. Each metrics stage (``CrawlMetrics.time``) records the peak
+traced memory while it ran and the most the heap grew during one run of
+the stage. Whenever traced memory passes its previous high by
+SNAPSHOT_GROWTH a snapshot is taken, so the report can name the source
+lines holding the most memory near the run's peak.
+
+Stages overlap in the pipeline, async and interleaved modes, so per-stage
+figures there are upper bounds rather than exact attributions. Parsing
+done in ParsePool worker processes is not traced.
+"""
+
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Take a new top-sites snapshot when traced memory exceeds the last one by this factor
+SNAPSHOT_GROWTH = 1.25
+
+# Allocations made by the tracer itself and by imports are not crawl memory
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _mb(size: int) -> float:
+    return size / 1024 / 1024
+
+
+def _site(frame) -> str:
+    """``package/module.py:line`` for an allocation frame."""
+    parts = frame.filename.replace('\\', '/').split('/')
+    return f"{'/'.join(parts[-2:])}:{frame.lineno}"
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class StageMemory:
+    """Traced memory figures for one stage."""
+
+    __slots__ = ('count', 'peak', 'growth')
+
+    def __init__(self):
+        self.count = 0
+        self.peak = 0
+        self.growth = 0
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'peak_bytes': self.peak, 'max_growth_bytes': self.growth}
+
+
+class MemoryTracker:
+    """
+    Per-stage peak memory and top allocation sites from tracemalloc.
+    """
+
+    def __init__(self, frames: int = 1, top_sites: int = 10):
+        """
+        Args:
+            frames: Stack frames stored per allocation (more frames cost more memory)
+            top_sites: Allocation sites listed in the report
+        """
+        self.top_sites = top_sites
+        self.stages: Dict[str, StageMemory] = {}
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._snapshot_size = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['MemoryTracker']:
+        """Start tracing as described by config['memory_budget'], or None if ``trace`` is off."""
+        budget = config.get('memory_budget', {})
+        if not budget.get('trace', False):
+            return None
+        return cls(budget.get('trace_frames', 1), budget.get('top_sites', 10))
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the traced memory of the enclosed block as one run of ``name``."""
+        start = tracemalloc.get_traced_memory()[0]
+        # reset_peak is Python 3.9+; without it the peak is the overall peak so far
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self._record(name, start)
+
+    def _record(self, name: str, start: int):
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = StageMemory()
+            stage.count += 1
+            stage.peak = max(stage.peak, peak)
+            stage.growth = max(stage.growth, peak - start)
+            self.peak = max(self.peak, peak)
+            snapshot = current > self._snapshot_size * SNAPSHOT_GROWTH
+            if snapshot:
+                # Claimed under the lock so concurrent stages do not all snapshot
+                self._snapshot_size = current
+        if snapshot:
+            taken = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            with self._lock:
+                self._snapshot = taken
+
+    def top(self) -> List[Dict]:
+        """Largest allocation sites in the latest snapshot."""
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            return []
+        return [{'site': _site(stat.traceback[0]), 'size_bytes': stat.size, 'blocks': stat.count}
+                for stat in snapshot.statistics('lineno')[:self.top_sites]]
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable memory report."""
+        current = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        with self._lock:
+            stages = {name: stage.to_dict() for name, stage in self.stages.items()}
+            snapshot_size = self._snapshot_size
+        return {
+            'traced_peak_bytes': self.peak,
+            'traced_current_bytes': current,
+            'max_rss_bytes': max_rss_bytes(),
+            'stages': stages,
+            'top_sites_at_bytes': snapshot_size,
+            'top_sites': self.top(),
+        }
+
+    def summary(self) -> str:
+        """Multi-line summary for end-of-run printing."""
+        rss = max_rss_bytes()
+        lines = [f"Memory: {_mb(self.peak):.1f} MB peak traced"
+                 + (f", {_mb(rss):.1f} MB max RSS" if rss is not None else '')]
+        with self._lock:
+            for name, stage in self.stages.items():
+                lines.append(f"  {name:<15} {stage.count:>6} x peak {_mb(stage.peak):8.1f} MB, "
+                             f"grew by up to {_mb(stage.growth):6.1f} MB")
+            snapshot_size = self._snapshot_size
+        top = self.top()
+        if top:
+            lines.append(f"  Top allocation sites at {_mb(snapshot_size):.1f} MB traced:")
+            for site in top:
+                lines.append(f"    {_mb(site['size_bytes']):8.2f} MB {site['blocks']:>8} blocks  {site['site']}")
+        return '\n'.join(lines)
+
+    def stop(self):
+        """Stop tracing (the collected figures stay available)."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,372 @@
+"""
+Incremental merge of the per-category outputs into merged_games.json.
+
+The merged document (``{total_games, merged_at, games}``, each game tagged
+with its ``source_file``) used to be rebuilt by loading every file in the
+output directory. Here a small index remembers, per source file, its size,
+mtime, ``scraped_at`` and a completeness score for each game id. A merge
+only re-reads the source files that changed, works out which games they
+affect, and then streams the previous merged document once: entries that
+are not affected are copied through verbatim, in a k-way merge (highest
+rating first) with the re-resolved entries, so the work beyond one
+sequential copy is proportional to what changed.
+
+When the same id appears in several files, the most complete record wins
+(most non-empty fields), then the newest scrape, then the first file name
+in sort order, so the result does not depend on directory order.
+"""
+
+import heapq
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from game_db import GAME_COLUMNS
+from output import SUMMARY_KEY
+from records import json_default
+
+
+INDEX_VERSION = 1
+
+# Source documents are read and parsed in chunks of this size
+MERGE_CHUNK_SIZE = 64 * 1024
+
+# Fields counted when deciding which copy of a game is the most complete
+COMPLETENESS_FIELDS = GAME_COLUMNS[1:]
+
+# Start of the games array in a per-category document (scrape_sequential
+# writes ``selected_games``)
+_GAMES_KEY_RE = re.compile(r'"(?:games|selected_games)"\s*:\s*\[')
+_SCRAPED_AT_RE = re.compile(r'"scraped_at"\s*:\s*"([^"]*)"')
+
+
+def completeness(game: Dict) -> int:
+    """Number of scraped fields of a game that hold a value."""
+    return sum(1 for field in COMPLETENESS_FIELDS if game.get(field) not in (None, '', [], {}, 0, False))
+
+
+def merge_order(game: Dict) -> Tuple[float, str]:
+    """Sort key of the merged document: highest rating first, then id."""
+    try:
+        rating = float(game.get('rating') or 0)
+    except (TypeError, ValueError):
+        rating = 0.0
+    return -rating, str(game.get('id'))
+
+
+def iter_document_games(path, chunk_size: int = MERGE_CHUNK_SIZE) -> Iterator[Tuple[Dict, str]]:
+    """
+    Stream the games array of a JSON document without loading the document.
+
+    The document may be a bare array or an object with a ``games`` (or
+    ``selected_games``) array, like the files import-to-supabase.js reads.
+
+    Args:
+        path: JSON document
+        chunk_size: Characters read at a time
+
+    Yields:
+        (game, raw) where raw is the game's JSON text exactly as in the file
+
+    Raises:
+        ValueError: If the array is not terminated
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = f.read(chunk_size)
+        stripped = buf.lstrip()
+        if stripped.startswith('['):
+            pos = len(buf) - len(stripped) + 1
+        else:
+            while True:
+                match = _GAMES_KEY_RE.search(buf)
+                if match:
+                    pos = match.end()
+                    break
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                buf += chunk
+
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buf):
+                buf, pos = f.read(chunk_size), 0
+                if not buf:
+                    raise ValueError(f"{path}: unterminated games array")
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                game, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The element continues past the buffer; read more and retry
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError(f"{path}: unterminated games array")
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            if isinstance(game, dict):
+                yield game, buf[pos:end]
+            pos = end
+
+
+def _document_scraped_at(path) -> Optional[str]:
+    """``scraped_at`` from the header of a per-category document, if present."""
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(MERGE_CHUNK_SIZE)
+    match = _GAMES_KEY_RE.search(head)
+    match = _SCRAPED_AT_RE.search(head[:match.start()] if match else head)
+    return match.group(1) if match else None
+
+
+def _iter_source_games(path: Path, header: Dict) -> Iterator[Dict]:
+    """Games of a .json or .jsonl source file; fills header['scraped_at']."""
+    if path.suffix == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if SUMMARY_KEY in record:
+                    header['scraped_at'] = record[SUMMARY_KEY].get('scraped_at')
+                else:
+                    yield record
+    else:
+        header['scraped_at'] = _document_scraped_at(path)
+        for game, _ in iter_document_games(path):
+            yield game
+
+
+def _file_stat(path: Path) -> Dict:
+    stat = path.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _serialize(game: Dict) -> str:
+    """A merged entry as it appears inside the games array (json.dump indent=2 layout)."""
+    return json.dumps(game, ensure_ascii=False, indent=2, default=json_default).replace('\n', '\n    ')
+
+
+class GameMerger:
+    """
+    Keeps merged_games.json in step with the per-category output files.
+    """
+
+    def __init__(self, input_dir: str, output_path: str, index_path: Optional[str] = None):
+        """
+        Args:
+            input_dir: Directory holding the per-category ``.json``/``.jsonl`` outputs
+            output_path: Merged document to maintain
+            index_path: Merge index (defaults to ``<output>.index.json``)
+        """
+        self.input_dir = Path(input_dir)
+        self.output_path = Path(output_path)
+        self.index_path = Path(index_path) if index_path else self.output_path.with_suffix('.index.json')
+        self.stats = {'sources': 0, 'read': 0, 'removed_sources': 0, 'games': 0,
+                      'added': 0, 'updated': 0, 'dropped': 0, 'copied': 0, 'full': False}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'GameMerger':
+        """Merger described by config['merge'], reading config['output_dir']."""
+        merge = config.get('merge', {})
+        return cls(
+            config.get('output_dir', 'data'),
+            merge.get('output_path', '../merged_games.json'),
+            merge.get('index_path'),
+        )
+
+    def _sources(self) -> Dict[str, Path]:
+        """Per-category output files, by file name."""
+        if not self.input_dir.is_dir():
+            return {}
+        paths = sorted(self.input_dir.glob('*.json')) + sorted(self.input_dir.glob('*.jsonl'))
+        return {path.name: path for path in paths
+                if path.resolve() != self.output_path.resolve() and path.resolve() != self.index_path.resolve()}
+
+    def _load_index(self) -> Optional[Dict]:
+        """The index of the previous merge, or None if it cannot be trusted."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get('version') != INDEX_VERSION or not self.output_path.exists():
+            return None
+        # The merged file was rewritten by something else (e.g. the JS merge)
+        if index.get('output') != _file_stat(self.output_path):
+            return None
+        return index
+
+    def _save_index(self, files: Dict[str, Dict]):
+        index = {'version': INDEX_VERSION, 'output': _file_stat(self.output_path), 'files': files}
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _owners(files: Dict[str, Dict], ids: Optional[Set[str]] = None) -> Dict[str, List[str]]:
+        """Game id -> names of the source files that contain it."""
+        owners: Dict[str, List[str]] = {}
+        for name in sorted(files):
+            for game_id in files[name]['games']:
+                if ids is None or game_id in ids:
+                    owners.setdefault(game_id, []).append(name)
+        return owners
+
+    @staticmethod
+    def _winner(names: Iterable[str], game_id: str, files: Dict[str, Dict]) -> Optional[str]:
+        """Source file whose copy of a game goes into the merged document."""
+        best = best_key = None
+        for name in names:
+            entry = files[name]
+            key = (entry['games'][game_id], entry.get('scraped_at') or '')
+            if best is None or key > best_key:
+                best, best_key = name, key
+        return best
+
+    def _read_source(self, name: str, path: Path, wanted: Optional[Set[str]] = None) -> Tuple[Dict, Dict[str, Dict]]:
+        """
+        Read one source file.
+
+        Args:
+            name: File name
+            path: File path
+            wanted: Only keep the bodies of these ids (None keeps all)
+
+        Returns:
+            (index entry, {game id: game}); the first copy of an id in a file counts
+        """
+        header: Dict = {}
+        scores: Dict[str, int] = {}
+        games: Dict[str, Dict] = {}
+        for game in _iter_source_games(path, header):
+            game_id = game.get('id')
+            if not game_id or game_id in scores:
+                continue
+            scores[game_id] = completeness(game)
+            if wanted is None or game_id in wanted:
+                games[game_id] = game
+        self.stats['read'] += 1
+        scraped_at = header.get('scraped_at') or datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        return {**_file_stat(path), 'scraped_at': scraped_at, 'games': scores}, games
+
+    def merge(self, full: bool = False) -> Path:
+        """
+        Bring the merged document up to date with the source files.
+
+        Args:
+            full: Ignore the index and rebuild from every source file
+
+        Returns:
+            Path of the merged document
+        """
+        sources = self._sources()
+        index = None if full else self._load_index()
+        self.stats['full'] = index is None
+        old_files: Dict[str, Dict] = index['files'] if index else {}
+        self.stats['sources'] = len(sources)
+
+        changed = [name for name, path in sources.items()
+                   if name not in old_files or {key: old_files[name].get(key) for key in ('size', 'mtime_ns')}
+                   != _file_stat(path)]
+        removed = [name for name in old_files if name not in sources]
+        self.stats['removed_sources'] = len(removed)
+        if index is not None and not changed and not removed:
+            self.stats['games'] = len(self._owners(old_files))
+            self.stats['copied'] = self.stats['games']
+            return self.output_path
+
+        # Ids whose winning copy may have moved: everything the changed or
+        # removed files held before, plus everything they hold now
+        affected: Set[str] = set()
+        for name in changed + removed:
+            affected.update(old_files.get(name, {}).get('games', ()))
+
+        files = {name: entry for name, entry in old_files.items() if name in sources}
+        bodies: Dict[str, Dict[str, Dict]] = {}
+        for name in changed:
+            files[name], bodies[name] = self._read_source(name, sources[name])
+            affected.update(files[name]['games'])
+
+        winners = {game_id: self._winner(names, game_id, files)
+                   for game_id, names in self._owners(files, affected).items()}
+
+        # Winning copies that sit in unchanged files
+        needed: Dict[str, Set[str]] = {}
+        for game_id, name in winners.items():
+            if name not in bodies:
+                needed.setdefault(name, set()).add(game_id)
+        for name, ids in needed.items():
+            _, bodies[name] = self._read_source(name, sources[name], ids)
+
+        # One sorted run per source file holding winners...
+        runs = []
+        fresh: Dict[str, str] = {}
+        for name, games in bodies.items():
+            run = []
+            for game_id, game in games.items():
+                if winners.get(game_id) == name:
+                    fresh[game_id] = _serialize({**game, 'source_file': name})
+                    run.append((merge_order(game), fresh[game_id]))
+            run.sort(key=lambda item: item[0])
+            runs.append(run)
+        bodies.clear()
+
+        # ...plus the previous document minus the affected entries
+        previous: Dict[str, str] = {}
+        if index is not None:
+            runs.append(self._previous_run(affected, previous))
+
+        total = len(self._owners(files)) if index is not None else len(winners)
+        self._write(heapq.merge(*runs, key=lambda item: item[0]), total)
+
+        self.stats['added'] = sum(1 for game_id in fresh if game_id not in previous)
+        self.stats['updated'] = sum(1 for game_id, raw in fresh.items()
+                                    if game_id in previous and previous[game_id] != raw)
+        self.stats['dropped'] = sum(1 for game_id in previous if game_id not in fresh)
+        self.stats['games'] = total
+        self._save_index(files)
+        return self.output_path
+
+    def _previous_run(self, affected: Set[str], previous: Dict[str, str]) -> Iterator[Tuple[Tuple[float, str], str]]:
+        """Unaffected entries of the current merged document, copied verbatim; affected ones go to ``previous``."""
+        for game, raw in iter_document_games(self.output_path):
+            if game.get('id') in affected:
+                previous[game['id']] = raw
+                continue
+            self.stats['copied'] += 1
+            yield merge_order(game), raw
+
+    def _write(self, entries: Iterator[Tuple[Tuple[float, str], str]], total: int):
+        """Write the merged document atomically from sorted entries."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.output_path.with_name(self.output_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('{\n')
+            f.write(f'  "total_games": {total},\n')
+            f.write(f'  "merged_at": {json.dumps(datetime.now().isoformat())},\n')
+            f.write('  "games": [')
+            first = True
+            for _, raw in entries:
+                f.write('\n    ' if first else ',\n    ')
+                f.write(raw)
+                first = False
+            f.write(']' if first else '\n  ]')
+            f.write('\n}')
+        os.replace(tmp_path, self.output_path)
+
+    def summary(self) -> str:
+        """One-line summary of the merge for end-of-run reporting."""
+        mode = 'full rebuild' if self.stats['full'] else 'incremental'
+        return (f"Merge ({mode}): {self.stats['games']} game(s) from {self.stats['sources']} file(s), "
+                f"{self.stats['read']} file read(s), {self.stats['added']} added, "
+                f"{self.stats['updated']} updated, {self.stats['dropped']} dropped, "
+                f"{self.stats['copied']} copied unchanged ({self.output_path})")
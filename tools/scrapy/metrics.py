@@ -0,0 +1,251 @@
+"""
+Per-stage crawl metrics for GamesScraper.
+
+Counters and latency histograms are collected for every stage of a crawl
+(listing fetch/parse, detail fetch/extract, embed fetch/verdict, thumbnail and
+sitemap fetches, save) and
+can be written as a JSON run report and as a Prometheus text-format file
+(e.g. for node_exporter's textfile collector). With memory tracing on, each
+stage also reports its peak traced memory (see memory.py).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from memory import MemoryTracker
+
+
+STAGES = (
+    'listing_fetch',
+    'listing_parse',
+    'detail_fetch',
+    'detail_extract',
+    'embed_fetch',
+    'embed_verdict',
+    'thumbnail_fetch',
+    'sitemap_fetch',
+    'save',
+)
+
+# Histogram bucket upper bounds in seconds (Prometheus 'le' labels)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTERS = (
+    'requests',
+    'retries',
+    'failed_requests',
+    'cache_hits',
+    'bytes_downloaded',
+    'games_listed',
+    'games_embeddable',
+    'games_not_embeddable',
+)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        for idx, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[idx] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty or beyond the last bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def to_dict(self) -> Dict:
+        cumulative = []
+        seen = 0
+        for count in self.counts:
+            seen += count
+            cumulative.append(seen)
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.sum, 6),
+            'mean_seconds': round(self.sum / self.count, 6) if self.count else None,
+            'max_seconds': round(self.max, 6),
+            'p50_le_seconds': self.quantile(0.5),
+            'p95_le_seconds': self.quantile(0.95),
+            'buckets': {str(bound): total for bound, total in zip(BUCKETS, cumulative)},
+        }
+
+
+class CrawlMetrics:
+    """
+    Thread-safe counters and per-stage histograms for one scraper run.
+    """
+
+    def __init__(self, report_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                 memory: Optional[MemoryTracker] = None):
+        """
+        Args:
+            report_path: JSON run report written by ``write``, or None
+            prometheus_path: Prometheus text file written by ``write``, or None
+            memory: Per-stage memory tracing, or None
+        """
+        self.report_path = Path(report_path) if report_path else None
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.started_at = datetime.now()
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self.stages: Dict[str, Histogram] = {stage: Histogram() for stage in STAGES}
+        self.memory = memory
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'CrawlMetrics':
+        """Build metrics with the output files described by config['metrics'] (and
+        memory tracing per config['memory_budget'])."""
+        metrics = config.get('metrics', {})
+        memory = MemoryTracker.from_config(config)
+        if not metrics.get('enabled', False):
+            return cls(memory=memory)
+        return cls(metrics.get('report_path', 'logs/run_report.json'),
+                   metrics.get('prometheus_path', 'logs/metrics.prom'), memory)
+
+    def inc(self, name: str, value: int = 1):
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float):
+        """Record one duration for a stage."""
+        with self._lock:
+            self.stages[stage].observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one observation of ``stage``."""
+        start = time.perf_counter()
+        try:
+            if self.memory is None:
+                yield
+            else:
+                with self.memory.stage(stage):
+                    yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def embeddable_ratio(self) -> Optional[float]:
+        checked = self.counters['games_embeddable'] + self.counters['games_not_embeddable']
+        if not checked:
+            return None
+        return self.counters['games_embeddable'] / checked
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable run report."""
+        with self._lock:
+            report = {
+                'started_at': self.started_at.isoformat(),
+                'finished_at': datetime.now().isoformat(),
+                'wall_seconds': round(time.monotonic() - self._start, 3),
+                'counters': dict(self.counters),
+                'embeddable_ratio': self.embeddable_ratio(),
+                'stages': {stage: histogram.to_dict() for stage, histogram in self.stages.items()},
+            }
+        if self.memory:
+            report['memory'] = self.memory.to_dict()
+        return report
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self.counters):
+                metric = f"scraper_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self.counters[name]}")
+
+            lines.append("# HELP scraper_stage_seconds Time spent in each crawl stage")
+            lines.append("# TYPE scraper_stage_seconds histogram")
+            for stage, histogram in self.stages.items():
+                seen = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    seen += count
+                    lines.append(f'scraper_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {seen}')
+                lines.append(f'scraper_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'scraper_stage_seconds_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'scraper_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            if self.memory:
+                lines.append("# HELP scraper_stage_memory_peak_bytes Peak traced memory while each stage ran")
+                lines.append("# TYPE scraper_stage_memory_peak_bytes gauge")
+                for stage, memory in list(self.memory.stages.items()):
+                    lines.append(f'scraper_stage_memory_peak_bytes{{stage="{stage}"}} {memory.peak}')
+
+            lines.append("# TYPE scraper_run_seconds gauge")
+            lines.append(f"scraper_run_seconds {time.monotonic() - self._start:.3f}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        """Multi-line summary for end-of-run printing."""
+        counters = self.counters
+        ratio = self.embeddable_ratio()
+        lines = [
+            f"Requests: {counters['requests']} ({counters['retries']} retries, "
+            f"{counters['failed_requests']} failed, {counters['cache_hits']} cache hits), "
+            f"{counters['bytes_downloaded'] / 1024 / 1024:.1f} MB downloaded",
+            f"Games: {counters['games_listed']} listed, {counters['games_embeddable']} embeddable, "
+            f"{counters['games_not_embeddable']} not embeddable"
+            + (f" ({ratio:.0%} embeddable)" if ratio is not None else ''),
+        ]
+        with self._lock:
+            total = sum(histogram.sum for histogram in self.stages.values()) or 1.0
+            for stage, histogram in self.stages.items():
+                if histogram.count:
+                    lines.append(f"  {stage:<15} {histogram.count:>6} x {histogram.sum / histogram.count * 1000:8.1f} ms "
+                                 f"= {histogram.sum:8.1f} s ({histogram.sum / total:.0%})")
+        if self.memory:
+            lines.append(self.memory.summary())
+        return '\n'.join(lines)
+
+    def write(self) -> List[Path]:
+        """
+        Write the configured report files atomically.
+
+        Returns:
+            Paths written
+        """
+        written = []
+        if self.report_path:
+            _write_atomic(self.report_path, json.dumps(self.to_dict(), indent=2))
+            written.append(self.report_path)
+        if self.prometheus_path:
+            _write_atomic(self.prometheus_path, self.to_prometheus())
+            written.append(self.prometheus_path)
+        return written
+
+
+def _write_atomic(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,196 @@
+"""
+Streaming JSONL output for scraped games.
+
+Each validated game is appended to ``<category>_games.jsonl.part`` as one
+JSON line as soon as it is produced, so memory stays flat and partial
+results can be read mid-run. Closing the sink appends a compact summary
+footer and atomically renames the file to ``<category>_games.jsonl``.
+``jsonl_to_json`` turns a finished file into the ``{category, total_games,
+scraped_at, games}`` document the site reads.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from records import json_default
+
+
+SUMMARY_KEY = '_summary'
+
+
+def summarize_games(games: Iterable[Dict]) -> Dict[str, int]:
+    """
+    Count games with description, features and reviews.
+
+    Args:
+        games: Game dictionaries
+
+    Returns:
+        Statistics dictionary (with_description, with_features, with_reviews, total_reviews)
+    """
+    stats = {'with_description': 0, 'with_features': 0, 'with_reviews': 0, 'total_reviews': 0}
+    for game in games:
+        _count(stats, game)
+    return stats
+
+
+def _count(stats: Dict[str, int], game: Dict):
+    stats['with_description'] += bool(game.get('description'))
+    stats['with_features'] += bool(game.get('features'))
+    stats['with_reviews'] += bool(game.get('reviews'))
+    stats['total_reviews'] += len(game.get('reviews', []))
+
+
+class JsonlGameSink:
+    """
+    Append-only JSONL writer for one category.
+
+    Lines are flushed as they are written. Until ``close`` the file keeps a
+    ``.part`` suffix; the finished file ends with a summary footer line:
+        {"_summary": {"category": ..., "total_games": ..., "scraped_at": ..., "statistics": {...}}}
+    """
+
+    def __init__(self, path: str, category: str):
+        """
+        Args:
+            path: Final output path (e.g. data/action_games.jsonl)
+            category: Category name recorded in the footer
+        """
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + '.part')
+        self.category = category
+        self.total_games = 0
+        self.statistics = summarize_games(())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.part_path, 'w', encoding='utf-8')
+
+    @classmethod
+    def for_category(cls, config: Dict, category: str) -> 'JsonlGameSink':
+        """Sink writing to <output_dir>/<category>_games.jsonl."""
+        output_dir = Path(config.get('output_dir', 'data'))
+        return cls(output_dir / f"{category}_games.jsonl", category)
+
+    def write(self, game: Dict):
+        """Append one game and flush it to disk."""
+        self._file.write(json.dumps(game, ensure_ascii=False, separators=(',', ':'), default=json_default) + '\n')
+        self._file.flush()
+        self.total_games += 1
+        _count(self.statistics, game)
+
+    def summary(self) -> Dict:
+        """Footer record describing the games written so far."""
+        return {
+            'category': self.category,
+            'total_games': self.total_games,
+            'scraped_at': datetime.now().isoformat(),
+            'statistics': dict(self.statistics),
+        }
+
+    def close(self) -> Path:
+        """
+        Write the summary footer and atomically move the file into place.
+
+        Returns:
+            Final output path
+        """
+        self._file.write(json.dumps({SUMMARY_KEY: self.summary()}, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Close the file without finalizing; the .part file is left for inspection."""
+        self._file.close()
+
+    def __enter__(self) -> 'JsonlGameSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_jsonl_games(path: str) -> Iterator[Dict]:
+    """
+    Yield games from a JSONL output file, finished or ``.part``.
+
+    A half-written last line (crash mid-write) is skipped.
+
+    Args:
+        path: JSONL file
+
+    Yields:
+        Game dictionaries in the order they were written
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if SUMMARY_KEY not in record:
+                yield record
+
+
+def read_jsonl_summary(path: str) -> Optional[Dict]:
+    """Return the summary footer of a finished JSONL file, or None if missing."""
+    summary = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('{"' + SUMMARY_KEY + '"'):
+                summary = json.loads(line)[SUMMARY_KEY]
+    return summary
+
+
+def jsonl_to_json(jsonl_path: str, json_path: Optional[str] = None,
+                  include_statistics: bool = False) -> Path:
+    """
+    Convert a JSONL output file into the ``{category, total_games,
+    scraped_at, games}`` document, streaming one game at a time. The
+    result is the same as ``json.dump(..., ensure_ascii=False, indent=2)``.
+
+    Args:
+        jsonl_path: Finished JSONL file (with summary footer)
+        json_path: Output path (default: same name with .json)
+        include_statistics: Also emit the ``statistics`` block
+
+    Returns:
+        Path of the written JSON document
+    """
+    jsonl_path = Path(jsonl_path)
+    if json_path is None:
+        json_path = jsonl_path.with_suffix('.json')
+    json_path = Path(json_path)
+
+    summary = read_jsonl_summary(jsonl_path)
+    if summary is None:
+        raise ValueError(f"{jsonl_path} has no summary footer (crawl not finished?)")
+
+    header = {key: summary[key] for key in ('category', 'total_games', 'scraped_at')}
+    if include_statistics:
+        header['statistics'] = summary['statistics']
+
+    tmp_path = json_path.with_name(json_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        for key, value in header.items():
+            f.write(f'  {json.dumps(key)}: ')
+            f.write(json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+            f.write(',\n')
+        f.write('  "games": [')
+        first = True
+        for game in iter_jsonl_games(jsonl_path):
+            f.write('\n    ' if first else ',\n    ')
+            f.write(json.dumps(game, ensure_ascii=False, indent=2).replace('\n', '\n    '))
+            first = False
+        f.write(']' if first else '\n  ]')
+        f.write('\n}')
+    os.replace(tmp_path, json_path)
+    return json_path
@@ -0,0 +1,233 @@
+"""
+HTML parsing that can run outside the fetching process.
+
+BeautifulSoup tree building is pure-Python CPU work that holds the GIL, so
+with concurrent fetching a single core caps throughput. The functions here
+take raw response bytes and return plain dicts, so they can run either in
+the calling thread or in a ProcessPoolExecutor (``ParsePool``) that spreads
+listing and detail parsing over all cores while the fetchers only do I/O.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from detail_extractor import extract_details
+from records import Game
+
+
+# Listing pages only need the game cards, so only those subtrees are built
+CARD_STRAINER = SoupStrainer('div', class_='card card_topic')
+
+BACKGROUND_IMAGE_RE = re.compile(r'background-image:\s*url\([\'"]?(.*?)[\'"]?\)')
+
+
+def extract_game_from_card(card, base_url: str) -> Optional[Game]:
+    """
+    Extract game information from a game card element.
+
+    Args:
+        card: BeautifulSoup element representing a game card
+        base_url: Site root used to absolutize relative links
+
+    Returns:
+        Game record or None if the card has no game link
+    """
+    # Extract game link and title
+    link = card.find('a', class_='card__inner')
+    if not link:
+        return None
+
+    game_url = link.get('href', '')
+    game_title = link.get('aria-label', '')
+
+    # Alternative title extraction
+    if not game_title:
+        title_elem = card.find('span', class_='card__title')
+        game_title = title_elem.text.strip() if title_elem else ''
+
+    # Extract game ID from URL
+    game_id = game_url.split('/')[-1] if game_url else ''
+
+    # Extract image (prefer data-src over src to get real URL instead of base64 placeholder)
+    img = card.find('img', loading='lazy')
+    image_url = ''
+    if img:
+        # Try data-src first (real URL for lazy loading)
+        image_url = img.get('data-src', '')
+        # Fallback to src if data-src not available
+        if not image_url or image_url.startswith('data:image'):
+            image_url = img.get('src', '')
+
+    # Also try to get background image from card__thumb div as backup
+    if not image_url or image_url.startswith('data:image'):
+        thumb_div = card.find('div', class_='card__thumb')
+        if thumb_div:
+            style = thumb_div.get('style', '')
+            # Extract URL from background-image:url('...')
+            bg_match = BACKGROUND_IMAGE_RE.search(style)
+            if bg_match:
+                image_url = bg_match.group(1)
+
+    # Extract rating
+    rating = None
+    rating_elem = card.find('div', class_='card__rating')
+    if rating_elem:
+        rating_spans = rating_elem.find_all('span')
+        if rating_spans:
+            try:
+                rating = float(rating_spans[-1].text.strip())
+            except (ValueError, AttributeError):
+                pass
+
+    # Extract status label (HOT, NEW, TRENDING, UPDATED)
+    status = ''
+    status_elem = card.find('div', class_='GameLabel_container')
+    if status_elem:
+        status = status_elem.text.strip()
+
+    return Game(
+        id=game_id,
+        name=game_title,
+        url=game_url if game_url.startswith('http') else urljoin(base_url, game_url),
+        thumbnail=image_url if image_url.startswith('http') else urljoin(base_url, image_url),
+        rating=rating,
+        status=status,
+    )
+
+
+def release_soup(soup: BeautifulSoup):
+    """
+    Tear a parsed tree down now instead of leaving it to the cyclic garbage
+    collector (tags link to their parents and siblings, so a dropped soup is
+    only freed by the next full collection).
+
+    ``decompose()`` on the BeautifulSoup object itself only clears the root,
+    so each top-level child is decomposed first.
+    """
+    for child in list(soup.contents):
+        child.decompose()
+    soup.decompose()
+
+
+def parse_listing(content: bytes, parser: str, base_url: str,
+                  release: bool = False) -> Tuple[List[Game], int, List[str]]:
+    """
+    Parse the game cards of a category listing page.
+
+    Args:
+        content: Raw response body
+        parser: BeautifulSoup parser backend
+        base_url: Site root used to absolutize relative links
+        release: Decompose the tree once the cards are extracted
+
+    Returns:
+        Tuple of (games, number of cards found, error messages for cards that failed)
+    """
+    soup = BeautifulSoup(content, parser, parse_only=CARD_STRAINER)
+    game_cards = soup.find_all('div', class_='card card_topic')
+
+    games = []
+    errors = []
+    for card in game_cards:
+        try:
+            game_data = extract_game_from_card(card, base_url)
+            if game_data:
+                games.append(game_data)
+        except Exception as e:
+            errors.append(str(e))
+    if release:
+        release_soup(soup)
+    return games, len(game_cards), errors
+
+
+def parse_detail(content: bytes, parser: str, release: bool = False) -> Dict:
+    """
+    Parse a game detail page.
+
+    Args:
+        content: Raw response body
+        parser: BeautifulSoup parser backend
+        release: Decompose the tree once the fields are extracted
+
+    Returns:
+        Fields found by extract_details (description, features, controls,
+        tags, category, play count, reviews)
+    """
+    fields = {}
+    soup = BeautifulSoup(content, parser)
+    extract_details(soup, fields)
+    if release:
+        release_soup(soup)
+    return fields
+
+
+class ParsePool:
+    """
+    Process pool running parse_listing/parse_detail off the fetching process.
+
+    If a worker process dies, the pool is dropped and parsing continues in
+    the calling thread.
+    """
+
+    def __init__(self, workers: int):
+        """
+        Args:
+            workers: Number of parser processes
+        """
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ParsePool']:
+        """
+        Build the pool described by config['parse_workers'], or None to parse
+        in the fetching thread. 0 disables the pool; "auto" or a negative
+        number uses one process per CPU core.
+        """
+        workers = config.get('parse_workers', 0)
+        if workers == 'auto' or (isinstance(workers, int) and workers < 0):
+            workers = os.cpu_count() or 1
+        if not workers:
+            return None
+        return cls(int(workers))
+
+    def _submit(self, func, *args):
+        with self._lock:
+            if self._executor is None and not self._broken:
+                # Started lazily so runs that never parse do not start workers
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+        if executor is None:
+            return func(*args)
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            with self._lock:
+                self._broken = True
+                self._executor = None
+            return func(*args)
+
+    def parse_listing(self, content: bytes, parser: str, base_url: str,
+                      release: bool = False) -> Tuple[List[Game], int, List[str]]:
+        """parse_listing in a worker process."""
+        return self._submit(parse_listing, content, parser, base_url, release)
+
+    def parse_detail(self, content: bytes, parser: str, release: bool = False) -> Dict:
+        """parse_detail in a worker process."""
+        return self._submit(parse_detail, content, parser, release)
+
+    def close(self):
+        """Shut the worker processes down."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,345 @@
+"""
+Request rate limiting for the 1games.io scraper.
+Token buckets enforce politeness per host without fixed sleeps, and the
+adaptive controller tunes the per-host request rate from server feedback.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+# Status codes meaning "slow down" rather than "this page is broken"
+THROTTLE_STATUS = frozenset((429, 503))
+
+# Latency jitter below this many seconds is never treated as a spike
+MIN_SPIKE_SECONDS = 0.25
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each unit of work takes one token; callers queue up behind each other
+    because a reservation may push the balance below zero.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def reserve(self) -> float:
+        """
+        Take one token, borrowing against future refills if none is left.
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is usable.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Take one token without blocking the event loop.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """
+    Keeps one token bucket per host so politeness is enforced per origin.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, host_rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            rate: Requests per second allowed for each host
+            capacity: Burst size for each host
+            host_rates: Per-host overrides of ``rate`` keyed by host (netloc)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.host_rates: Dict[str, float] = dict(host_rates or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'HostRateLimiter':
+        """Build a limiter matching ``rate_limit_seconds`` from the config."""
+        if config.get('adaptive_rate', {}).get('enabled', False):
+            # AdaptiveRateController paces every request instead
+            return cls(0.0)
+        interval = config.get('rate_limit_seconds', 1.5)
+        rate = 1.0 / interval if interval > 0 else 0.0
+        return cls(rate, config.get('burst', 1))
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        """Return (creating if needed) the bucket for a host."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.rate), self.capacity)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """
+        Wait for a request slot on the URL's host.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Seconds spent waiting
+        """
+        return self.bucket_for(self._host(url)).acquire()
+
+    async def acquire_async(self, url: str) -> float:
+        """
+        Wait for a request slot on the URL's host without blocking the loop.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Seconds spent waiting
+        """
+        return await self.bucket_for(self._host(url)).acquire_async()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostPace:
+    """Per-host state of the adaptive controller."""
+
+    __slots__ = ('rate', 'last_sent', 'blocked_until', 'last_decrease', 'latency', 'samples')
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.last_sent = float('-inf')
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.latency = 0.0
+        self.samples = 0
+
+
+class AdaptiveRateController:
+    """
+    AIMD request pacing per host.
+
+    Every successful, normally fast response adds ``increase`` requests per
+    second to the host's rate (up to ``max_rate``). A 429, any 5xx, a
+    network error or a latency spike multiplies the rate by ``decrease_factor``
+    (down to ``min_rate``); only responses to requests sent after the last
+    cut can cut again, so a burst of in-flight failures counts once.
+    Retry-After pauses the host for the requested time.
+    """
+
+    def __init__(self, initial_rate: float, min_rate: float, max_rate: float,
+                 increase: float = 0.05, decrease_factor: float = 0.5,
+                 latency_spike_factor: float = 2.0, max_retry_after: float = 120.0):
+        """
+        Args:
+            initial_rate: Starting requests per second for each host
+            min_rate: Lowest requests per second after backing off
+            max_rate: Highest requests per second reached by ramping up
+            increase: Requests per second added after each good response
+            decrease_factor: Rate multiplier applied on congestion
+            latency_spike_factor: Latency above this multiple of the host's
+                moving average counts as congestion
+            max_retry_after: Upper bound on an honored Retry-After, in seconds
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.initial_rate = min(max(initial_rate, min_rate), max_rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.max_retry_after = max_retry_after
+        self.stats = {'increases': 0, 'decreases': 0, 'throttled': 0, 'retry_after_waits': 0}
+        self._hosts: Dict[str, _HostPace] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['AdaptiveRateController']:
+        """Build the controller described by config['adaptive_rate'], or None if disabled."""
+        adaptive = config.get('adaptive_rate', {})
+        if not adaptive.get('enabled', False):
+            return None
+        interval = config.get('rate_limit_seconds', 1.5)
+        # An interval of 0 means no ceiling (min_interval) or no floor (max_interval)
+        min_interval = adaptive.get('min_interval_seconds', 0.2)
+        max_interval = adaptive.get('max_interval_seconds', 10.0)
+        max_rate = 1.0 / min_interval if min_interval > 0 else math.inf
+        min_rate = 1.0 / max_interval if max_interval > 0 else 0.0
+        if interval > 0:
+            initial_rate = 1.0 / interval
+        else:
+            # No fixed delay configured: start at the ceiling and back off from there
+            # (or at one request a second without a ceiling, so there is a rate to back off from)
+            initial_rate = max_rate if max_rate < math.inf else 1.0
+        return cls(
+            initial_rate=initial_rate,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            increase=adaptive.get('increase_per_success', 0.05),
+            decrease_factor=adaptive.get('decrease_factor', 0.5),
+            latency_spike_factor=adaptive.get('latency_spike_factor', 2.0),
+            max_retry_after=adaptive.get('max_retry_after_seconds', 120.0),
+        )
+
+    def _pace(self, url: str) -> _HostPace:
+        host = urlparse(url).netloc.lower()
+        pace = self._hosts.get(host)
+        if pace is None:
+            pace = self._hosts[host] = _HostPace(self.initial_rate)
+        return pace
+
+    def wait(self, url: str) -> float:
+        """
+        Block until the URL's host may be requested again.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Send time (time.monotonic()) to pass back to ``record``
+        """
+        # Slots are claimed only when due rather than reserved ahead, so a
+        # rate change applies to every waiting request straight away
+        while True:
+            with self._lock:
+                pace = self._pace(url)
+                now = time.monotonic()
+                slot = max(pace.last_sent + 1.0 / pace.rate, pace.blocked_until)
+                if slot <= now:
+                    pace.last_sent = now
+                    return now
+            time.sleep(slot - now)
+
+    def record(self, url: str, sent_at: float, latency: Optional[float],
+               status: Optional[int] = None, retry_after: Optional[float] = None):
+        """
+        Feed back the outcome of a request.
+
+        Args:
+            url: Requested URL
+            sent_at: Value returned by ``wait`` for this request
+            latency: Seconds until the response arrived (None on network error)
+            status: HTTP status code (None on network error)
+            retry_after: Parsed Retry-After header, if any
+        """
+        with self._lock:
+            pace = self._pace(url)
+
+            if retry_after is not None:
+                delay = min(retry_after, self.max_retry_after)
+                pace.blocked_until = max(pace.blocked_until, time.monotonic() + delay)
+                self.stats['retry_after_waits'] += 1
+
+            throttled = status in THROTTLE_STATUS
+            if throttled:
+                self.stats['throttled'] += 1
+
+            spike = False
+            if latency is not None and not throttled:
+                spike = (pace.samples >= 3
+                         and latency > pace.latency * self.latency_spike_factor
+                         and latency - pace.latency > MIN_SPIKE_SECONDS)
+                # Moving average of response latency
+                pace.latency = latency if pace.samples == 0 else 0.8 * pace.latency + 0.2 * latency
+                pace.samples += 1
+
+            # Server errors count as congestion too, so retries of a failing origin back off
+            if throttled or spike or latency is None or status >= 500:
+                if sent_at >= pace.last_decrease:
+                    pace.rate = max(self.min_rate, pace.rate * self.decrease_factor)
+                    pace.last_decrease = time.monotonic()
+                    self.stats['decreases'] += 1
+            elif pace.rate < self.max_rate:
+                pace.rate = min(self.max_rate, pace.rate + self.increase)
+                self.stats['increases'] += 1
+
+    def rate_for(self, url: str) -> float:
+        """Current requests per second for the URL's host."""
+        with self._lock:
+            return self._pace(url).rate
+
+    def summary(self) -> str:
+        """One-line summary of rate adaptation for end-of-run reporting."""
+        with self._lock:
+            rates = ', '.join(f"{host} {pace.rate:.2f}/s" for host, pace in self._hosts.items())
+        return (f"Adaptive rate: {rates or 'no requests'} "
+                f"({self.stats['increases']} increase(s), {self.stats['decreases']} backoff(s), "
+                f"{self.stats['throttled']} throttled response(s), "
+                f"{self.stats['retry_after_waits']} Retry-After wait(s))")
@@ -0,0 +1,212 @@
+"""
+Compact game and review records.
+
+A crawl holds every game of a category until it is written, and a full
+catalog is thousands of games. ``Game`` and ``Review`` keep their fields in
+``__slots__`` instead of per-instance dicts, intern strings that repeat
+across games (status, category, tags, review authors), and are only turned
+into JSON-ready dicts at the output boundary (``to_dict`` / ``json_default``).
+
+Games still support the dict-style access the rest of the scraper uses
+(``game['id']``, ``game.get(...)``, ``game.update(details)``), and
+``to_dict`` yields the same keys in the same order as the dicts they replace.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Fields of a listing card, in output order
+CARD_FIELDS = ('id', 'name', 'url', 'thumbnail', 'rating', 'status', 'iframe_src', 'iframe_html')
+
+# Fields added by the detail/embed check, in output order
+DETAIL_FIELDS = ('is_embeddable', 'description', 'features', 'controls', 'tags', 'category',
+                 'play_count', 'reviews', 'review_count', 'average_rating')
+
+# Local copies written by the thumbnail stage (thumbnails.py), in output order
+THUMBNAIL_FIELDS = ('thumbnail_path', 'thumbnail_variants', 'thumbnail_error')
+
+GAME_FIELDS = CARD_FIELDS + DETAIL_FIELDS + THUMBNAIL_FIELDS
+_GAME_FIELD_SET = frozenset(GAME_FIELDS)
+
+# Short strings shared by many games
+_INTERNED_FIELDS = frozenset(('status', 'category'))
+
+
+class _Missing:
+    """Marker for detail fields a game has not been given yet."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<missing>'
+
+    def __reduce__(self):
+        # Unpickles as the module-level singleton so ``is MISSING`` holds
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class Review:
+    """One player review from a game page."""
+
+    __slots__ = ('author', 'comment', 'rating')
+
+    def __init__(self, author: str, comment: str, rating: Optional[float] = None):
+        self.author = _intern(author)
+        self.comment = comment
+        self.rating = rating
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Review':
+        return cls(data.get('author', 'Anonymous'), data.get('comment', ''), data.get('rating'))
+
+    def to_dict(self) -> Dict:
+        """Review as written to the output (no 'rating' key if the review had none)."""
+        data = {'author': self.author, 'comment': self.comment}
+        if self.rating is not None:
+            data['rating'] = self.rating
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Review):
+            return NotImplemented
+        return (self.author, self.comment, self.rating) == (other.author, other.comment, other.rating)
+
+    def __repr__(self):
+        return f"Review(author={self.author!r}, rating={self.rating!r})"
+
+
+def _normalize(field: str, value):
+    """Intern repeated strings and convert review dicts to Review records."""
+    if field in _INTERNED_FIELDS:
+        return _intern(value)
+    if field == 'tags' and value:
+        return [_intern(tag) for tag in value]
+    if field == 'reviews' and value:
+        return [review if isinstance(review, Review) else Review.from_dict(review) for review in value]
+    return value
+
+
+class Game:
+    """
+    A game from a listing card, plus its detail/embed fields once validated.
+
+    Detail and thumbnail fields that have not been set are left out of ``to_dict`` and
+    behave like missing keys, so card-only games serialize as before.
+    Unknown keys passed to ``update`` are kept in ``extra``.
+    """
+
+    __slots__ = GAME_FIELDS + ('extra',)
+
+    def __init__(self, id: str, name: str, url: str, thumbnail: str, rating: Optional[float] = None,
+                 status: str = '', iframe_src: Optional[str] = None, iframe_html: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.url = url
+        self.thumbnail = thumbnail
+        self.rating = rating
+        self.status = _intern(status)
+        self.iframe_src = iframe_src
+        self.iframe_html = iframe_html
+        for field in DETAIL_FIELDS + THUMBNAIL_FIELDS:
+            setattr(self, field, MISSING)
+        self.extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Game':
+        """Build a game from a dictionary such as a journaled card or an output line."""
+        game = cls(data['id'], data.get('name', ''), data.get('url', ''), data.get('thumbnail', ''))
+        game.update((key, value) for key, value in data.items() if key != 'id')
+        return game
+
+    def update(self, fields):
+        """Set several fields from a dictionary (or iterable of pairs), like dict.update."""
+        items = fields.items() if isinstance(fields, dict) else fields
+        for key, value in items:
+            self[key] = value
+
+    def __setitem__(self, key: str, value):
+        if key in _GAME_FIELD_SET:
+            setattr(self, key, _normalize(key, value))
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __getitem__(self, key: str):
+        if key in _GAME_FIELD_SET:
+            value = getattr(self, key)
+            if value is not MISSING:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        for field in GAME_FIELDS:
+            if getattr(self, field) is not MISSING:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def to_dict(self) -> Dict:
+        """JSON-ready dictionary with the same keys, in the same order, as the scraper's dict output."""
+        data = {}
+        for field in GAME_FIELDS:
+            value = getattr(self, field)
+            if value is MISSING:
+                continue
+            if field == 'reviews':
+                value = [review.to_dict() for review in value]
+            data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        # Strings unpickled from parser processes are interned again here
+        for field, value in zip(self.__slots__, state):
+            setattr(self, field, _normalize(field, value) if value is not MISSING else value)
+
+    def __repr__(self):
+        return f"Game(id={self.id!r}, name={self.name!r})"
+
+
+def as_dict(record) -> Dict:
+    """Plain dictionary for a Game/Review (dictionaries pass through)."""
+    return record.to_dict() if isinstance(record, (Game, Review)) else record
+
+
+def json_default(obj):
+    """``default`` hook for json.dump/json.dumps that serializes Game and Review records."""
+    if isinstance(obj, (Game, Review)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def as_games(games: List[Dict]) -> List[Game]:
+    """Convert dictionaries (e.g. from the journal) to Game records."""
+    return [game if isinstance(game, Game) else Game.from_dict(game) for game in games]
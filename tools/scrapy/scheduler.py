@@ -0,0 +1,279 @@
+"""
+Global crawl scheduler for GamesScraper.
+
+Instead of crawling categories one after another, every requested category
+feeds one frontier. Listing pages are dispatched first, then game
+validations by listing rating (best first), and a shared pool of workers
+takes whichever task is most urgent among the hosts that still have
+budget. Each host (1games.io, images2.1games.io, ...) has its own limit on
+in-flight tasks and its own token bucket, so politeness stays per host
+while categories finish in parallel and total wall time follows the
+request count rather than the number of categories.
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ratelimit import HostRateLimiter
+from records import Game
+
+
+# Task priorities: lower runs first
+LISTING_PRIORITY = 0
+GAME_PRIORITY = 1
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class HostFrontier:
+    """
+    Priority queue of crawl tasks with a per-host in-flight budget.
+
+    ``pop`` hands out the most urgent task whose host is below its budget
+    and returns None once every pushed task has finished (or the frontier
+    was closed). Tasks may push follow-up work before they finish.
+    """
+
+    def __init__(self, default_budget: int, budgets: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            default_budget: Tasks in flight per host unless overridden
+            budgets: Per-host overrides keyed by host (netloc)
+        """
+        self.default_budget = max(1, default_budget)
+        self.budgets = {host.lower(): max(1, budget) for host, budget in (budgets or {}).items()}
+        self._queues: Dict[str, List[Tuple]] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._outstanding = 0
+        self._closed = False
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def budget_for(self, host: str) -> int:
+        return self.budgets.get(host, self.default_budget)
+
+    def push(self, host: str, priority: Tuple, task: Callable[[], None]):
+        """
+        Queue a task.
+
+        Args:
+            host: Host the task sends requests to
+            priority: Sort key, lower first
+            task: Callable run by a worker
+        """
+        with self._cond:
+            heapq.heappush(self._queues.setdefault(host, []), (priority, next(self._seq), task))
+            self._outstanding += 1
+            self._cond.notify()
+
+    def pop(self) -> Optional[Tuple[str, Callable[[], None]]]:
+        """
+        Wait for the most urgent runnable task.
+
+        Returns:
+            (host, task), or None when all work is done or the frontier is closed
+        """
+        with self._cond:
+            while True:
+                if self._closed or self._outstanding == 0:
+                    return None
+                best = None
+                for host, tasks in self._queues.items():
+                    if tasks and self._in_flight.get(host, 0) < self.budget_for(host):
+                        if best is None or tasks[0] < self._queues[best][0]:
+                            best = host
+                if best is not None:
+                    _, _, task = heapq.heappop(self._queues[best])
+                    self._in_flight[best] = self._in_flight.get(best, 0) + 1
+                    return best, task
+                self._cond.wait()
+
+    def done(self, host: str):
+        """Mark a task popped for ``host`` as finished."""
+        with self._cond:
+            self._in_flight[host] -= 1
+            self._outstanding -= 1
+            self._cond.notify_all()
+
+    def close(self):
+        """Stop handing out tasks (pending ones are dropped)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def host_rate_limiter(config: Dict) -> HostRateLimiter:
+    """
+    Token buckets per host: ``rate_limit_seconds`` by default, overridden by
+    config['scheduler']['hosts'][host]['rate_limit_seconds']. With adaptive
+    rate control the controller paces every request and no bucket is used;
+    replaying an archive sends no requests at all.
+    """
+    limiter = HostRateLimiter.from_config(config)
+    if config.get('adaptive_rate', {}).get('enabled', False) or config.get('archive', {}).get('replay'):
+        return limiter
+    for host, budget in config.get('scheduler', {}).get('hosts', {}).items():
+        interval = budget.get('rate_limit_seconds')
+        if interval is not None:
+            limiter.host_rates[host.lower()] = 1.0 / interval if interval > 0 else 0.0
+    return limiter
+
+
+class _CategoryRun:
+    """Progress of one category in an interleaved crawl."""
+
+    def __init__(self, category: str, max_pages: int, emit: Callable[[Game], None]):
+        self.category = category
+        self.pages: List[Optional[List[Game]]] = [None] * max_pages
+        self.pages_left = max_pages
+        # First page known to be short; later pages are not fetched
+        self.last_page: Optional[int] = None
+        self.games_left = 0
+        self.found = 0
+        self.emitted = 0
+        self.lock = threading.Lock()
+        self._emit = emit
+        self._pending: Dict[int, Optional[Game]] = {}
+        self._next = 0
+
+    def put(self, idx: int, game: Optional[Game]) -> bool:
+        """
+        Record the outcome for listing position ``idx``, emitting in listing
+        order. Returns True when this was the category's last game.
+        """
+        with self.lock:
+            self._pending[idx] = game
+            while self._next in self._pending:
+                ready = self._pending.pop(self._next)
+                self._next += 1
+                if ready is not None:
+                    self._emit(ready)
+                    self.emitted += 1
+            self.games_left -= 1
+            return self.games_left == 0
+
+
+def crawl_categories(scraper, categories: List[str], max_pages: int,
+                     emit_for: Callable[[str], Callable[[Game], None]],
+                     on_done: Optional[Callable[[str], None]] = None):
+    """
+    Crawl several categories through one frontier.
+
+    Args:
+        scraper: GamesScraper instance providing fetch/parse methods
+        categories: Categories to crawl
+        max_pages: Listing pages per category
+        emit_for: Returns the emit callback for a category; kept games are
+            passed to it in listing order
+        on_done: Called with a category name as soon as all of its games
+            have been emitted
+    """
+    config = scraper.config
+    logger = scraper.logger
+    scrape_iframes = config.get('scrape_iframes', True)
+    workers = max(1, config.get('concurrency', 8))
+    per_page = config.get('games_per_page', 50)
+    budgets = {host: budget['max_in_flight']
+               for host, budget in config.get('scheduler', {}).get('hosts', {}).items()
+               if 'max_in_flight' in budget}
+
+    frontier = HostFrontier(workers, budgets)
+    limiter = host_rate_limiter(config)
+    listing_host = host_of(scraper.base_url)
+    errors = []
+
+    runs = {category: _CategoryRun(category, max_pages, scraper._wrap_emit(category, emit_for(category)))
+            for category in categories}
+
+    def finish(run: _CategoryRun):
+        logger.info(f"Category '{run.category}' done: {run.emitted}/{run.found} game(s) kept")
+        if on_done:
+            on_done(run.category)
+
+    def validate_task(run: _CategoryRun, idx: int, game: Game):
+        def task():
+            details = scraper._reusable_details(game)
+            if details is None:
+                limiter.acquire(game['url'])
+                logger.info(f"Validating {run.category} game {idx + 1}/{run.found}: {game['name']}")
+                details, _ = scraper._validate_game(game)
+            game.update(details)
+            if run.put(idx, game if details.get('is_embeddable', False) else None):
+                finish(run)
+        return task
+
+    def listing_task(run: _CategoryRun, page: int):
+        def task():
+            with run.lock:
+                past_end = run.last_page is not None and page > run.last_page
+            if past_end:
+                games = []
+            else:
+                games = scraper._journaled_page(run.category, page)
+                if games is None:
+                    limiter.acquire(f"{scraper.base_url}/{run.category}.games?page={page}")
+                    games = scraper._listing_page(run.category, page)
+            with run.lock:
+                if games is not None and len(games) < per_page and not past_end:
+                    run.last_page = page if run.last_page is None else min(run.last_page, page)
+                run.pages[page - 1] = games
+                run.pages_left -= 1
+                if run.pages_left:
+                    return
+                all_games = []
+                seen_ids = set()
+                for games in run.pages:
+                    games, last = scraper._new_listing_games(games, seen_ids)
+                    all_games.extend(games)
+                    if last:
+                        break
+                run.pages = []
+                run.found = len(all_games)
+                run.games_left = len(all_games)
+            logger.info(f"Found {len(all_games)} total games in '{run.category}'")
+
+            if not (scrape_iframes and all_games):
+                for idx, game in enumerate(all_games):
+                    run.put(idx, game)
+                finish(run)
+                return
+            for idx, game in enumerate(all_games):
+                rating = game.get('rating') or 0.0
+                frontier.push(host_of(game['url']), (GAME_PRIORITY, -rating, idx),
+                              validate_task(run, idx, game))
+        return task
+
+    for run in runs.values():
+        for page in range(1, max_pages + 1):
+            frontier.push(listing_host, (LISTING_PRIORITY, page), listing_task(run, page))
+
+    def work():
+        while True:
+            item = frontier.pop()
+            if item is None:
+                return
+            host, task = item
+            try:
+                task()
+            except BaseException as e:
+                # Includes KeyboardInterrupt so the caller re-raises it
+                errors.append(e)
+                frontier.close()
+            finally:
+                frontier.done(host)
+
+    logger.info(f"Starting interleaved scrape of {', '.join(categories)}, {max_pages} page(s) each, "
+                f"{workers} worker(s)")
+    threads = [threading.Thread(target=work, name=f'crawl-{n}', daemon=True) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
@@ -5,9 +5,12 @@
 """
 
 from scraper import GamesScraper
+from output import summarize_games
+from records import json_default
 import json
 from datetime import datetime
 import os
+import sys
 
 # 类别列表 - 爬取所有类别
 categories = ['action', 'racing', 'shooting', 'adventure', 'puzzle']
@@ -16,9 +19,18 @@ categories = ['action', 'racing', 'shooting', 'adventure', 'puzzle']
 with open('config.json', 'r') as f:
     config = json.load(f)
 
-config['rate_limit_seconds'] = 1.0  # 加快速度
+# 未启用 adaptive_rate 时使用固定间隔 1 秒加快速度；启用后按响应延迟和 429/503 自动调整（不低于 min_interval_seconds）
+if not config.get('adaptive_rate', {}).get('enabled', False):
+    config['rate_limit_seconds'] = 1.0
+
+# 记录抓取日志，中断后使用 --resume 从断点继续（已完成的页面和游戏不会重新请求）
+config.setdefault('journal', {})['enabled'] = True
+config['journal']['resume'] = '--resume' in sys.argv
 scraper = GamesScraper(config)
 
+# 每个类别的统计结果，结束时直接打印，不再重新读取文件
+summaries = {}
+
 print("="*70)
 print("按顺序爬取每个类别 (包含详细信息和评价)")
 print("="*70)
@@ -28,69 +40,56 @@ for idx, category in enumerate(categories, 1):
     print(f"\n[{idx}/{len(categories)}] 类别: {category.upper()}")
     print("-"*70)
 
-    # 爬取4页
+    # 读取全部4页列表后按评分从高到低验证，凑够30个可嵌入游戏即停止（即4页中评分最高的30个，按评分排序）
     print(f"  爬取中...", end=" ", flush=True)
-    games = scraper.scrape_category(category, max_pages=4)
-
-    # 保留前30个评分最高的
-    if len(games) > 30:
-        games = sorted(games, key=lambda x: x['rating'] if x['rating'] else 0, reverse=True)[:30]
+    games = list(scraper.iter_games(category, max_pages=4, target=30))
 
     print(f"完成！")
     print(f"  可嵌入游戏: {len(games)} 个")
 
     # 统计详情信息
-    with_desc = sum(1 for g in games if g.get('description'))
-    with_features = sum(1 for g in games if g.get('features'))
-    with_reviews = sum(1 for g in games if g.get('reviews'))
-    total_reviews = sum(len(g.get('reviews', [])) for g in games)
+    stats = summarize_games(games)
 
     print(f"  详情统计:")
-    print(f"    - 有描述: {with_desc}/{len(games)}")
-    print(f"    - 有特性列表: {with_features}/{len(games)}")
-    print(f"    - 有评价: {with_reviews}/{len(games)} (共 {total_reviews} 条评价)")
+    print(f"    - 有描述: {stats['with_description']}/{len(games)}")
+    print(f"    - 有特性列表: {stats['with_features']}/{len(games)}")
+    print(f"    - 有评价: {stats['with_reviews']}/{len(games)} (共 {stats['total_reviews']} 条评价)")
 
     # 保存到文件
     output = {
         'category': category,
         'total_games': len(games),
         'scraped_at': datetime.now().isoformat(),
-        'statistics': {
-            'with_description': with_desc,
-            'with_features': with_features,
-            'with_reviews': with_reviews,
-            'total_reviews': total_reviews
-        },
+        'statistics': stats,
         'games': games
     }
 
     filename = f'data/{category}_games.json'
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with scraper.metrics.time('save'):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2, default=json_default)
 
     print(f"  ✓ 已保存到: {filename}")
+    summaries[category] = (filename, len(games), stats)
 
 print(f"\n{'='*70}")
 print("✓ 所有类别爬取完成！")
+if scraper.rate_control:
+    print(scraper.rate_control.summary())
+# 各阶段耗时、请求/重试次数、下载量和可嵌入比例（启用 metrics 时同时写出报告文件）
+print(scraper.report_metrics())
 print("="*70)
 
 # 列出所有文件并显示详细统计
 print("\n文件统计:")
 for cat in categories:
-    filename = f'data/{cat}_games.json'
-    if os.path.exists(filename):
+    if cat in summaries:
+        filename, game_count, stats = summaries[cat]
         size = os.path.getsize(filename) / 1024
 
-        # 读取并统计
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            game_count = data.get('total_games', 0)
-            stats = data.get('statistics', {})
-
-            print(f"\n  ✓ {cat.upper()}: {game_count} 个游戏 ({size:.1f} KB)")
-            if stats:
-                print(f"      描述: {stats.get('with_description', 0)}/{game_count}")
-                print(f"      特性: {stats.get('with_features', 0)}/{game_count}")
-                print(f"      评价: {stats.get('with_reviews', 0)}/{game_count} ({stats.get('total_reviews', 0)} 条)")
+        print(f"\n  ✓ {cat.upper()}: {game_count} 个游戏 ({size:.1f} KB)")
+        print(f"      描述: {stats['with_description']}/{game_count}")
+        print(f"      特性: {stats['with_features']}/{game_count}")
+        print(f"      评价: {stats['with_reviews']}/{game_count} ({stats['total_reviews']} 条)")
     else:
         print(f"  ✗ {cat.upper()}: 文件不存在")
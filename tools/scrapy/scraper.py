@@ -3,15 +3,76 @@
 Scrapes game information including names, images, URLs, and iframe embed codes.
 """
 
+import http.client
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
 import json
 import time
 import logging
+import threading
+import queue
+import heapq
+import itertools
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
-from urllib.parse import urljoin
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, Union
+
+from archive import ArchiveReplay, PageArchive
+from embed_check import EmbedScanner
+from http_cache import ResponseCache
+from journal import CrawlJournal
+from metrics import CrawlMetrics
+from game_db import GameDatabase
+from game_store import RunGameStore
+from output import JsonlGameSink
+from parse_pool import ParsePool, extract_game_from_card, parse_detail, parse_listing
+from ratelimit import THROTTLE_STATUS, AdaptiveRateController, HostRateLimiter, retry_after_seconds
+from records import Game, as_games, json_default
+from scheduler import crawl_categories, host_rate_limiter
+from sitemap import SITEMAP_CHUNK_SIZE, SitemapDiscovery, since_from_config
+from state_store import CrawlState
+from thumbnails import ThumbnailStore
+
+
+# Parser backends BeautifulSoup can build trees with (config['html_parser'])
+HTML_PARSERS = ('html.parser', 'lxml')
+
+# Embed pages are read in chunks of this size so the check can stop early
+EMBED_CHUNK_SIZE = 16 * 1024
+
+
+class OrderedEmitter:
+    """
+    Re-sequences games that finish out of order so they are emitted in
+    listing order. Only the out-of-order window is held in memory.
+    """
+
+    def __init__(self, emit: Callable[[Dict], None]):
+        """
+        Args:
+            emit: Called with each kept game, in order
+        """
+        self._emit = emit
+        self._pending: Dict[int, Optional[Dict]] = {}
+        self._next = 0
+        self.emitted = 0
+
+    def put(self, idx: int, game: Optional[Dict]):
+        """
+        Hand over the outcome for listing position ``idx``.
+
+        Args:
+            idx: Zero-based position of the game in the category listing
+            game: Game to keep, or None if it was filtered out
+        """
+        self._pending[idx] = game
+        while self._next in self._pending:
+            ready = self._pending.pop(self._next)
+            self._next += 1
+            if ready is not None:
+                self._emit(ready)
+                self.emitted += 1
 
 
 class GamesScraper:
@@ -26,18 +87,111 @@ class GamesScraper:
         Args:
             config: Configuration dictionary with scraper settings
         """
-        self.base_url = "https://1games.io"
+        # Replaying an archive sends no requests: nothing is paced, cached or journaled
+        if config.get('archive', {}).get('replay'):
+            config = dict(config, rate_limit_seconds=0, adaptive_rate={'enabled': False},
+                          cache={'enabled': False}, incremental={'enabled': False},
+                          journal={'enabled': False})
+
+        self.base_url = config.get('base_url', 'https://1games.io').rstrip('/')
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': config.get('user_agent', 'Mozilla/5.0'),
-            'Accept': 'text/html,application/xhtml+xml,application/xml',
-            'Accept-Language': 'en-US,en;q=0.9',
-        })
+
+        # requests.Session is not thread-safe, so each worker thread gets its own
+        self._local = threading.local()
+        self.session = self._get_session()
+
+        # Optional raw page archive, or an archive to replay instead of the network (config['archive'])
+        self.archive = PageArchive.from_config(config)
+        self.replay = ArchiveReplay.from_config(config)
+
+        # Optional on-disk response cache (config['cache'])
+        self.cache = ResponseCache.from_config(config)
+
+        # Optional per-game state for incremental crawls (config['incremental'])
+        self.state = CrawlState.from_config(config)
+
+        # Optional append-only journal for checkpoint/resume (config['journal'])
+        self.journal = CrawlJournal.from_config(config)
+
+        # Optional AIMD pacing of every request (config['adaptive_rate'])
+        self.rate_control = AdaptiveRateController.from_config(config)
+
+        # Bounded-memory crawling: page-at-a-time validation, small queues,
+        # soups torn down after extraction (config['memory_budget'])
+        self.memory_budget = config.get('memory_budget', {}).get('enabled', False)
+
+        # Run-scoped detail/embed results shared across categories (config['dedupe_games'];
+        # kept in a SQLite file in memory budget mode)
+        self.games = RunGameStore.from_config(config)
+
+        # Optional SQLite upsert of every validated game (config['database'])
+        self.database = GameDatabase.from_config(config)
+
+        # Optional thumbnail download/verification stage (config['thumbnails'])
+        self.thumbnails = ThumbnailStore.from_config(config, self._fetch_thumbnail)
+        self._thumbnail_limiter = host_rate_limiter(config)
+
+        # Game discovery from the sitemap index (config['sitemap'], used by scrape_sitemap)
+        self.sitemap = SitemapDiscovery.from_config(config, self._fetch_sitemap)
+
+        # Per-stage counters and timings; report files per config['metrics']
+        self.metrics = CrawlMetrics.from_config(config)
 
         # Setup logging
         self._setup_logging()
 
+        self.html_parser = self._select_parser(config.get('html_parser', 'html.parser'))
+
+        # Optional process pool for listing/detail parsing (config['parse_workers'])
+        self.parse_pool = ParsePool.from_config(config)
+
+    def _get_session(self) -> requests.Session:
+        """Return the HTTP session owned by the calling thread."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': self.config.get('user_agent', 'Mozilla/5.0'),
+                'Accept': 'text/html,application/xhtml+xml,application/xml',
+                'Accept-Language': 'en-US,en;q=0.9',
+            })
+            self._local.session = session
+        return session
+
+    def _select_parser(self, name: str) -> str:
+        """
+        Validate the configured parser backend, falling back to html.parser
+        if it is unknown or its library is not installed.
+
+        Args:
+            name: Parser name from config
+
+        Returns:
+            Parser name to pass to BeautifulSoup
+        """
+        if name not in HTML_PARSERS:
+            self.logger.warning(f"Unknown html_parser '{name}', using html.parser")
+            return 'html.parser'
+        try:
+            BeautifulSoup('', name)
+        except FeatureNotFound:
+            self.logger.warning(f"Parser '{name}' is not installed, using html.parser")
+            return 'html.parser'
+        return name
+
+    def _make_soup(self, content: bytes, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        Parse HTML with the configured backend.
+
+        Args:
+            content: Raw response body
+            parse_only: Optional strainer limiting which subtrees are built
+
+        Returns:
+            Parsed document
+        """
+        return BeautifulSoup(content, self.html_parser, parse_only=parse_only)
+
     def _setup_logging(self):
         """Setup logging configuration."""
         log_dir = Path(self.config.get('log_dir', 'logs'))
@@ -55,33 +209,179 @@ class GamesScraper:
         )
         self.logger = logging.getLogger(__name__)
 
-    def _make_request(self, url: str) -> Optional[requests.Response]:
+    def _make_request(self, url: str, stream: bool = False,
+                      headers: Optional[Dict[str, str]] = None,
+                      use_cache: bool = True) -> Optional[requests.Response]:
         """
         Make HTTP request with retry logic.
 
         Args:
             url: URL to request
+            stream: Leave the body unread so the caller can consume it in
+                chunks; the caller is then responsible for caching the body
+            headers: Extra request headers (e.g. the caller's own conditional
+                headers; a 304 answer is then returned as is)
+            use_cache: Look up and store the response in the HTTP page
+                cache (off for responses that are not pages)
 
         Returns:
             Response object or None if failed
         """
+        if self.replay:
+            response = self.replay.response(url)
+            if response is None or response.status_code != 200:
+                self.logger.error(f"Not in archive: {url}")
+                return None
+            return response
+
         retry_attempts = self.config.get('retry_attempts', 3)
         timeout = self.config.get('timeout_seconds', 30)
 
+        session = self._get_session()
+        cache = self.cache if use_cache else None
+
+        # Serve fresh cache entries locally, revalidate stale ones
+        entry = cache.lookup(url) if cache else None
+        if entry and cache.is_fresh(entry):
+            cache.record('hits')
+            self.metrics.inc('cache_hits')
+            return self._archived(url, entry.to_response(), stream)
+        if entry:
+            headers = dict(headers or {}, **entry.conditional_headers())
+
         for attempt in range(retry_attempts):
+            if attempt:
+                self.metrics.inc('retries')
+            self.metrics.inc('requests')
+            sent_at = self.rate_control.wait(url) if self.rate_control else None
+            started = time.monotonic()
+            response = None
             try:
-                response = self.session.get(url, timeout=timeout)
+                response = session.get(url, headers=headers, timeout=timeout, stream=stream)
+                if self.rate_control:
+                    self.rate_control.record(url, sent_at, time.monotonic() - started,
+                                             response.status_code,
+                                             retry_after_seconds(response.headers.get('Retry-After')))
+                if entry and response.status_code == 304:
+                    cache.refresh(entry, response)
+                    cache.record('revalidated')
+                    self.metrics.inc('cache_hits')
+                    return self._archived(url, entry.to_response(), stream)
                 response.raise_for_status()
-                return response
+                if not stream:
+                    # Streamed bodies are counted by the caller as they are read
+                    self.metrics.inc('bytes_downloaded', len(response.content))
+                if cache:
+                    cache.record('misses')
+                    if not stream and response.status_code == 200:
+                        cache.store(url, response)
+                return self._archived(url, response, stream)
             except requests.exceptions.RequestException as e:
+                if response is None and self.rate_control:
+                    self.rate_control.record(url, sent_at, None)
                 self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
                 if attempt < retry_attempts - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    if self.rate_control:
+                        # The controller already backed off and holds any Retry-After
+                        continue
+                    retry_after = None
+                    if response is not None and response.status_code in THROTTLE_STATUS:
+                        retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                    time.sleep(retry_after if retry_after is not None else 2 ** attempt)  # Exponential backoff
                 else:
                     self.logger.error(f"Failed to fetch {url} after {retry_attempts} attempts")
+                    self.metrics.inc('failed_requests')
                     return None
 
-    def scrape_category_page(self, category: str, page: int = 1) -> List[Dict]:
+    def _archived(self, url: str, response: requests.Response, stream: bool) -> requests.Response:
+        """Add a read 200 response to the page archive (streamed bodies are archived by their reader)."""
+        if self.archive and not stream and response.status_code == 200:
+            self.archive.record(url, response, response.content)
+        return response
+
+    def _fetch_thumbnail(self, url: str, headers: Optional[Dict[str, str]]) -> Optional[requests.Response]:
+        """
+        Thumbnail request for ThumbnailStore, paced per host like the crawl.
+        Images bypass the page cache; the store keeps its own validators.
+        """
+        self._thumbnail_limiter.acquire(url)
+        with self.metrics.time('thumbnail_fetch'):
+            return self._make_request(url, headers=headers, use_cache=False)
+
+    def _fetch_sitemap(self, url: str) -> Optional[Iterator[bytes]]:
+        """Sitemap request for SitemapDiscovery; the body is handed over in chunks as it arrives."""
+        with self.metrics.time('sitemap_fetch'):
+            response = self._make_request(url, stream=True)
+        if not response:
+            return None
+        return self._iter_body(url, response)
+
+    def _iter_body(self, url: str, response: requests.Response) -> Iterator[bytes]:
+        """
+        Read a streamed response in SITEMAP_CHUNK_SIZE chunks, counting the
+        downloaded bytes and archiving the complete body at the end.
+
+        A read error is logged and ends the body early; the caller's parser
+        then sees a truncated document and fails on it.
+
+        Args:
+            url: Requested URL (for logging and the archive)
+            response: Response from _make_request(url, stream=True)
+
+        Yields:
+            Raw body chunks as they arrive
+        """
+        counted = not getattr(response, 'from_cache', False)
+        chunks = []
+        try:
+            with response:
+                for chunk in response.iter_content(chunk_size=SITEMAP_CHUNK_SIZE):
+                    if counted:
+                        self.metrics.inc('bytes_downloaded', len(chunk))
+                    if self.archive:
+                        chunks.append(chunk)
+                    yield chunk
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Failed to read {url}: {e}")
+            return
+        if self.archive:
+            self.archive.record(url, response, b''.join(chunks))
+
+    def _pause(self):
+        """
+        Fixed politeness delay between sequential requests. With adaptive
+        rate control every request is already paced, so this is a no-op.
+        """
+        if not self.rate_control:
+            time.sleep(self.config.get('rate_limit_seconds', 1.5))
+
+    def report_cache_stats(self) -> Optional[str]:
+        """
+        Log and return the HTTP cache summary for this run.
+
+        Returns:
+            Summary line, or None if the cache is disabled
+        """
+        if not self.cache:
+            return None
+        summary = self.cache.summary()
+        self.logger.info(summary)
+        return summary
+
+    def report_metrics(self) -> str:
+        """
+        Log the per-stage metrics summary and write the configured report files.
+
+        Returns:
+            Multi-line summary
+        """
+        summary = self.metrics.summary()
+        self.logger.info(summary)
+        for path in self.metrics.write():
+            self.logger.info(f"Metrics written to {path}")
+        return summary
+
+    def scrape_category_page(self, category: str, page: int = 1) -> List[Game]:
         """
         Scrape a single category page for game listings.
 
@@ -90,36 +390,39 @@ class GamesScraper:
             page: Page number (default: 1)
 
         Returns:
-            List of game dictionaries with basic information
+            List of Game records with basic (listing card) information
+            (empty if the page could not be fetched)
         """
+        return self._fetch_listing_page(category, page) or []
+
+    def _fetch_listing_page(self, category: str, page: int) -> Optional[List[Game]]:
+        """scrape_category_page, but None when the fetch failed after all retries."""
         games_per_page = self.config.get('games_per_page', 50)
         url = f"{self.base_url}/{category}.games?page={page}&limit={games_per_page}"
 
         self.logger.info(f"Scraping category page: {url}")
-        response = self._make_request(url)
+        with self.metrics.time('listing_fetch'):
+            response = self._make_request(url)
 
         if not response:
-            return []
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        games = []
+            return None
 
-        # Find all game cards
-        game_cards = soup.find_all('div', class_='card card_topic')
-        self.logger.info(f"Found {len(game_cards)} games on page {page}")
+        with self.metrics.time('listing_parse'):
+            if self.parse_pool:
+                games, card_count, errors = self.parse_pool.parse_listing(
+                    response.content, self.html_parser, self.base_url, self.memory_budget)
+            else:
+                games, card_count, errors = parse_listing(
+                    response.content, self.html_parser, self.base_url, self.memory_budget)
+        self.metrics.inc('games_listed', len(games))
 
-        for card in game_cards:
-            try:
-                game_data = self._extract_game_from_card(card)
-                if game_data:
-                    games.append(game_data)
-            except Exception as e:
-                self.logger.error(f"Error extracting game data: {e}")
-                continue
+        self.logger.info(f"Found {card_count} games on page {page}")
+        for error in errors:
+            self.logger.error(f"Error extracting game data: {error}")
 
         return games
 
-    def _extract_game_from_card(self, card) -> Optional[Dict]:
+    def _extract_game_from_card(self, card) -> Optional[Game]:
         """
         Extract game information from a game card element.
 
@@ -127,91 +430,40 @@ class GamesScraper:
             card: BeautifulSoup element representing a game card
 
         Returns:
-            Dictionary with game information or None if extraction fails
+            Game record or None if extraction fails
         """
         try:
-            # Extract game link and title
-            link = card.find('a', class_='card__inner')
-            if not link:
-                return None
-
-            game_url = link.get('href', '')
-            game_title = link.get('aria-label', '')
-
-            # Alternative title extraction
-            if not game_title:
-                title_elem = card.find('span', class_='card__title')
-                game_title = title_elem.text.strip() if title_elem else ''
-
-            # Extract game ID from URL
-            game_id = game_url.split('/')[-1] if game_url else ''
-
-            # Extract image (prefer data-src over src to get real URL instead of base64 placeholder)
-            img = card.find('img', loading='lazy')
-            image_url = ''
-            if img:
-                # Try data-src first (real URL for lazy loading)
-                image_url = img.get('data-src', '')
-                # Fallback to src if data-src not available
-                if not image_url or image_url.startswith('data:image'):
-                    image_url = img.get('src', '')
-
-            # Also try to get background image from card__thumb div as backup
-            if not image_url or image_url.startswith('data:image'):
-                thumb_div = card.find('div', class_='card__thumb')
-                if thumb_div:
-                    style = thumb_div.get('style', '')
-                    # Extract URL from background-image:url('...')
-                    import re
-                    bg_match = re.search(r'background-image:\s*url\([\'"]?(.*?)[\'"]?\)', style)
-                    if bg_match:
-                        image_url = bg_match.group(1)
-
-            # Extract rating
-            rating = None
-            rating_elem = card.find('div', class_='card__rating')
-            if rating_elem:
-                rating_spans = rating_elem.find_all('span')
-                if rating_spans:
-                    try:
-                        rating = float(rating_spans[-1].text.strip())
-                    except (ValueError, AttributeError):
-                        pass
-
-            # Extract status label (HOT, NEW, TRENDING, UPDATED)
-            status = ''
-            status_elem = card.find('div', class_='GameLabel_container')
-            if status_elem:
-                status = status_elem.text.strip()
-
-            return {
-                'id': game_id,
-                'name': game_title,
-                'url': game_url if game_url.startswith('http') else urljoin(self.base_url, game_url),
-                'thumbnail': image_url if image_url.startswith('http') else urljoin(self.base_url, image_url),
-                'rating': rating,
-                'status': status,
-                'iframe_src': None,
-                'iframe_html': None
-            }
+            return extract_game_from_card(card, self.base_url)
         except Exception as e:
             self.logger.error(f"Error in _extract_game_from_card: {e}")
             return None
 
-    def scrape_game_details(self, game_url: str) -> Dict:
+    def scrape_game_details(self, game_url: str, embed_executor: Optional[Executor] = None) -> Dict:
         """
         Scrape comprehensive game details including description, features, controls, and reviews.
 
         Args:
             game_url: URL of the game page
+            embed_executor: Optional executor to run the embed check while the
+                detail page is being parsed
 
         Returns:
             Dictionary with all game details including embed info
         """
+        return self._scrape_game_details(game_url, embed_executor)[0]
+
+    def _scrape_game_details(self, game_url: str,
+                             embed_executor: Optional[Executor] = None) -> Tuple[Dict, bool]:
+        """
+        Scrape game details, also reporting whether both pages were fetched.
+
+        Returns:
+            Tuple of (details dictionary, True if detail and embed pages were fetched)
+        """
         self.logger.info(f"Scraping game details: {game_url}")
 
         game_slug = game_url.rstrip('/').split('/')[-1]
-        embed_url = f"https://1games.io/game/{game_slug}/"
+        embed_url = f"{self.base_url}/game/{game_slug}/"
 
         result = {
             'iframe_src': None,
@@ -229,284 +481,736 @@ class GamesScraper:
         }
 
         # Fetch main game page for details
-        response = self._make_request(game_url)
+        with self.metrics.time('detail_fetch'):
+            response = self._make_request(game_url)
         if not response:
-            return result
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Extract description - try multiple selectors
-        description = ''
-        desc_selectors = [
-            {'name': 'div', 'class_': 'game-description'},
-            {'name': 'div', 'class_': 'description'},
-            {'name': 'section', 'class_': 'game-info'},
-            {'name': 'div', 'class_': 'game__description'},
-            {'name': 'div', 'attrs': {'itemprop': 'description'}},
-            {'name': 'meta', 'attrs': {'name': 'description'}}
-        ]
-
-        for selector in desc_selectors:
-            elem = None
-            if 'attrs' in selector:
-                elem = soup.find(selector['name'], attrs=selector['attrs'])
-            else:
-                elem = soup.find(selector['name'], class_=selector.get('class_'))
+            return result, False
 
-            if elem:
-                if elem.name == 'meta':
-                    description = elem.get('content', '')
-                else:
-                    # Get text from paragraphs or direct text
-                    paragraphs = elem.find_all('p')
-                    if paragraphs:
-                        description = ' '.join([p.get_text(strip=True) for p in paragraphs[:2]])
-                    else:
-                        description = elem.get_text(strip=True)
-
-                if description:
-                    result['description'] = description[:400]  # Limit to 400 chars
-                    break
-
-        # Extract features/highlights
-        features = []
-        # Look for feature sections
-        feature_keywords = ['feature', 'highlight', 'gameplay', 'key point']
-        for keyword in feature_keywords:
-            feature_section = soup.find(['div', 'section'], class_=lambda x: x and keyword in x.lower() if x else False)
-            if feature_section:
-                feature_lists = feature_section.find_all(['ul', 'ol'])
-                for ul in feature_lists:
-                    items = ul.find_all('li')
-                    features.extend([item.get_text(strip=True) for item in items[:6]])
-                break
+        embed_future = None
+        if embed_executor is not None:
+            embed_future = embed_executor.submit(self._check_embed, embed_url)
 
-        # If no dedicated feature section, look for any lists in game info
-        if not features:
-            info_section = soup.find(['div', 'section'], class_=lambda x: x and 'info' in x.lower() if x else False)
-            if info_section:
-                for ul in info_section.find_all(['ul', 'ol'], limit=2):
-                    items = ul.find_all('li')
-                    if 2 <= len(items) <= 12:  # Reasonable feature list
-                        features.extend([item.get_text(strip=True) for item in items[:6]])
-
-        result['features'] = features[:6]  # Keep top 6
-
-        # Extract controls/how to play
-        controls = ''
-        control_keywords = ['control', 'how to play', 'instruction', 'keyboard', 'mouse']
-        for keyword in control_keywords:
-            controls_elem = soup.find(string=lambda text: text and keyword in text.lower())
-            if controls_elem:
-                parent = controls_elem.find_parent(['div', 'section', 'article', 'p', 'h2', 'h3'])
-                if parent:
-                    # Get the next sibling or content
-                    next_content = parent.find_next(['p', 'div', 'ul'])
-                    if next_content:
-                        if next_content.name == 'ul':
-                            items = next_content.find_all('li')
-                            controls = ' | '.join([item.get_text(strip=True) for item in items])
-                        else:
-                            controls = next_content.get_text(strip=True)
-                    else:
-                        controls = parent.get_text(strip=True)
-
-                    if controls and len(controls) > 20:
-                        result['controls'] = controls[:300]
-                        break
-
-        # Extract tags/categories
-        tags = []
-        tag_selectors = [
-            soup.find_all('a', class_=lambda x: x and 'tag' in x.lower() if x else False),
-            soup.find_all('span', class_=lambda x: x and 'tag' in x.lower() if x else False),
-            soup.find_all(['a', 'span'], attrs={'rel': 'tag'})
-        ]
-        for tag_list in tag_selectors:
-            if tag_list:
-                tags.extend([tag.get_text(strip=True) for tag in tag_list[:8]])
-                break
-        result['tags'] = list(set(tags))[:8]  # Unique tags, max 8
-
-        # Extract category
-        category_elem = soup.find('span', class_=lambda x: x and 'category' in x.lower() if x else False)
-        if not category_elem:
-            category_elem = soup.find('a', class_=lambda x: x and 'category' in x.lower() if x else False)
-        if category_elem:
-            result['category'] = category_elem.get_text(strip=True)
-
-        # Extract play count
-        play_count_elem = soup.find(string=lambda text: text and 'play' in text.lower() and any(c.isdigit() for c in text))
-        if play_count_elem:
-            import re
-            numbers = re.findall(r'[\d,]+', play_count_elem)
-            if numbers:
-                try:
-                    result['play_count'] = int(numbers[0].replace(',', ''))
-                except (ValueError, IndexError):
-                    pass
-
-        # Extract reviews and ratings
-        reviews = []
-        review_count = 0
-        average_rating = None
-
-        # Look for review sections
-        review_section = soup.find(['div', 'section'], class_=lambda x: x and 'review' in x.lower() if x else False)
-        if review_section:
-            # Extract average rating
-            rating_elem = review_section.find(['span', 'div'], class_=lambda x: x and 'rating' in x.lower() if x else False)
-            if rating_elem:
-                rating_text = rating_elem.get_text(strip=True)
-                import re
-                rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                if rating_match:
-                    try:
-                        average_rating = float(rating_match.group(1))
-                    except ValueError:
-                        pass
-
-            # Extract individual reviews
-            review_elements = review_section.find_all(['div', 'article', 'li'], class_=lambda x: x and ('comment' in x.lower() or 'review-item' in x.lower()) if x else False, limit=5)
-
-            for review_elem in review_elements:
-                author_elem = review_elem.find(['span', 'div', 'a'], class_=lambda x: x and ('author' in x.lower() or 'user' in x.lower()) if x else False)
-                comment_elem = review_elem.find(['p', 'div', 'span'], class_=lambda x: x and ('text' in x.lower() or 'comment' in x.lower() or 'content' in x.lower()) if x else False)
-                rating_elem = review_elem.find(['span', 'div'], class_=lambda x: x and 'rating' in x.lower() if x else False)
-
-                # If no specific comment element, try to get the main text
-                if not comment_elem:
-                    paragraphs = review_elem.find_all('p')
-                    comment_elem = paragraphs[0] if paragraphs else review_elem
-
-                if comment_elem:
-                    comment_text = comment_elem.get_text(strip=True)
-                    if len(comment_text) > 15:  # Filter out too short texts
-                        review_data = {
-                            'author': author_elem.get_text(strip=True) if author_elem else 'Anonymous',
-                            'comment': comment_text[:250]  # Limit comment length
-                        }
-
-                        # Add rating if available
-                        if rating_elem:
-                            rating_text = rating_elem.get_text(strip=True)
-                            import re
-                            rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                            if rating_match:
-                                try:
-                                    review_data['rating'] = float(rating_match.group(1))
-                                except ValueError:
-                                    pass
-
-                        reviews.append(review_data)
-
-            review_count = len(review_elements)
-
-        result['reviews'] = reviews[:5]  # Keep top 5 reviews
-        result['review_count'] = review_count
-        result['average_rating'] = average_rating
+        with self.metrics.time('detail_extract'):
+            if self.parse_pool:
+                result.update(self.parse_pool.parse_detail(response.content, self.html_parser, self.memory_budget))
+            else:
+                result.update(parse_detail(response.content, self.html_parser, self.memory_budget))
 
         # Now check if embeddable
-        embed_response = self._make_request(embed_url)
-        if embed_response:
-            embed_soup = BeautifulSoup(embed_response.content, 'html.parser')
-            page_text = str(embed_soup).lower()
-
-            # Check for local game indicators
-            has_canvas = embed_soup.find('canvas') is not None
-            has_unity = 'unity' in page_text or 'unityloader' in page_text
-            has_webgl = 'webgl' in page_text
-            has_phaser = 'phaser' in page_text
-
-            # Check for third-party iframes
-            import re
-            third_party_iframe = embed_soup.find('iframe', src=re.compile(r'https?://(?!1games\.io)'))
-            has_third_party = third_party_iframe is not None
-
-            # Determine if embeddable
-            is_local_game = (has_canvas or has_unity or has_webgl or has_phaser)
-            is_embeddable = is_local_game and not has_third_party
-
-            if is_embeddable:
-                result['iframe_src'] = embed_url
-                result['iframe_html'] = f'<iframe src="{embed_url}" width="1280" height="720" scrolling="none" frameborder="0"></iframe>'
-                result['is_embeddable'] = True
+        embed_data = embed_future.result() if embed_future else self._check_embed(embed_url)
+        if embed_data is not None:
+            result.update(embed_data)
+            if result['is_embeddable']:
                 self.logger.info(f"✓ Embeddable with details: {game_slug} (desc: {len(result['description'])} chars, features: {len(result['features'])}, reviews: {len(result['reviews'])})")
             else:
                 self.logger.warning(f"✗ Not embeddable: {game_slug}")
 
-        return result
+        return result, embed_data is not None
+
+    def _check_embed(self, embed_url: str) -> Optional[Dict]:
+        """
+        Fetch a game's embed page and decide whether it can be embedded.
+
+        A body that breaks off while being read (chunked encoding error,
+        incomplete read) is requested and scanned again, up to
+        ``retry_attempts`` times, like a failed request.
+
+        Args:
+            embed_url: URL of the /game/<slug>/ embed page
+
+        Returns:
+            Dictionary with iframe fields, or None if the page could not be
+            fetched or read (embeddability unknown)
+        """
+        retry_attempts = self.config.get('retry_attempts', 3)
+        for attempt in range(retry_attempts):
+            if attempt:
+                self.metrics.inc('retries')
+            started = time.perf_counter()
+            embed_response = self._make_request(embed_url, stream=True)
+            if not embed_response:
+                self.metrics.observe('embed_fetch', time.perf_counter() - started)
+                return None
+
+            # Scan the raw body as it arrives; stop once a third-party iframe shows up.
+            # Time spent in the scanner is the verdict stage, the rest is fetching.
+            chunks = []
+            keep_chunks = self.cache or self.archive
+            scan_seconds = 0.0
+            scanner = EmbedScanner()
+            try:
+                with embed_response:
+                    for chunk in embed_response.iter_content(chunk_size=EMBED_CHUNK_SIZE):
+                        scan_started = time.perf_counter()
+                        scanner.feed(chunk)
+                        scan_seconds += time.perf_counter() - scan_started
+                        if keep_chunks:
+                            chunks.append(chunk)
+                        if scanner.settled:
+                            break
+                break
+            except (requests.exceptions.RequestException, http.client.HTTPException) as e:
+                self.logger.warning(f"Attempt {attempt + 1} failed reading {embed_url}: {e}")
+                if attempt < retry_attempts - 1:
+                    time.sleep(2 ** attempt)  # Exponential backoff
+            finally:
+                self.metrics.observe('embed_fetch', time.perf_counter() - started - scan_seconds)
+                if not getattr(embed_response, 'from_cache', False):
+                    self.metrics.inc('bytes_downloaded', scanner.bytes_read)
+        else:
+            self.logger.error(f"Failed to read {embed_url} after {retry_attempts} attempts; "
+                              f"embeddability unknown")
+            self.metrics.inc('failed_requests')
+            return None
+
+        if self.cache and not scanner.settled and not getattr(embed_response, 'from_cache', False):
+            self.cache.store(embed_url, embed_response, b''.join(chunks))
+        if self.archive:
+            # Only the part read before the verdict is kept; replay reaches the same verdict on it
+            self.archive.record(embed_url, embed_response, b''.join(chunks), truncated=scanner.settled)
+
+        self.logger.debug(f"Embed check read {scanner.bytes_read} bytes of {embed_url}")
+        self.metrics.observe('embed_verdict', scan_seconds)
+        is_embeddable = scanner.is_embeddable
+        self.metrics.inc('games_embeddable' if is_embeddable else 'games_not_embeddable')
+
+        if is_embeddable:
+            return {
+                'iframe_src': embed_url,
+                'iframe_html': f'<iframe src="{embed_url}" width="1280" height="720" scrolling="none" frameborder="0"></iframe>',
+                'is_embeddable': True
+            }
+        return {'is_embeddable': False}
 
     def scrape_game_iframe(self, game_url: str) -> Dict[str, Optional[str]]:
         """Backward compatibility wrapper - calls scrape_game_details"""
         return self.scrape_game_details(game_url)
 
-    def scrape_category(self, category: str, max_pages: Optional[int] = None) -> List[Dict]:
+    def _journaled_page(self, category: str, page: int, prefetch: bool = True) -> Optional[List[Game]]:
+        """
+        Games of a listing page already completed in a resumed crawl, else
+        None. Thumbnails are prefetched as in _listing_page.
+        """
+        if not self.journal:
+            return None
+        games = self.journal.lookup_page(category, page, self.config.get('games_per_page', 50))
+        if games is None:
+            return None
+        games = as_games(games)
+        if prefetch and not self.config.get('scrape_iframes', True):
+            self._prefetch_thumbnails(games)
+        return games
+
+    def _listing_page(self, category: str, page: int, prefetch: bool = True) -> Optional[List[Game]]:
+        """
+        Fetch a listing page and checkpoint its games in the journal (None
+        if the fetch failed).
+
+        Every card's thumbnail is prefetched only when every card is kept
+        (scrape_iframes off, ``prefetch`` on); otherwise a thumbnail starts
+        once its game is found embeddable (_prefetch_kept), so games that
+        are dropped cost no image request.
+        """
+        games = self._fetch_listing_page(category, page)
+        if games is None:
+            return None
+        if prefetch and not self.config.get('scrape_iframes', True):
+            self._prefetch_thumbnails(games)
+        if self.journal and games:
+            self.journal.record_page(category, page, self.config.get('games_per_page', 50), games)
+        return games
+
+    def _prefetch_thumbnails(self, games: List[Game]):
+        """Start downloading the thumbnails of games that will be output."""
+        if self.thumbnails:
+            for game in games:
+                self.thumbnails.prefetch(game['thumbnail'])
+
+    def _prefetch_kept(self, game: Dict, details: Dict):
+        """Start downloading a validated game's thumbnail if the game is kept (embeddable)."""
+        if self.thumbnails and details.get('is_embeddable', False):
+            self.thumbnails.prefetch(game['thumbnail'])
+
+    def _new_listing_games(self, games: Optional[List[Game]], seen_ids: set) -> Tuple[List[Game], bool]:
+        """
+        Drop games already listed on earlier pages of a category and tell
+        whether the page ends the listing.
+
+        A short page (fewer than games_per_page cards) or one with nothing
+        new means the site has run out of games: later pages would come back
+        empty or repeat the last one, so pagination stops there instead of
+        running to max_pages. A page that could not be fetched says nothing
+        about the end of the listing, so pagination goes on past it.
+
+        Args:
+            games: Games of one listing page, or None if the fetch failed
+            seen_ids: Ids from the category's earlier pages (updated in place)
+
+        Returns:
+            Tuple of (games not seen before, True if this is the last page)
+        """
+        if games is None:
+            return [], False
+        new = []
+        for game in games:
+            if game['id'] not in seen_ids:
+                seen_ids.add(game['id'])
+                new.append(game)
+        return new, len(games) < self.config.get('games_per_page', 50) or not new
+
+    def _reusable_details(self, game: Dict) -> Optional[Dict]:
+        """
+        Details that need no requests: already fetched for another category
+        in this run, journaled by an interrupted run, or stored for an
+        unchanged game in incremental mode. None otherwise.
+        """
+        details = self.games.lookup(game['id']) if self.games else None
+        if details is None:
+            details = self._reusable_details_stored(game)
+        if details is not None:
+            self._prefetch_kept(game, details)
+        return details
+
+    def _reusable_details_stored(self, game: Dict) -> Optional[Dict]:
+        """Details journaled by an interrupted run or kept by incremental mode."""
+        if self.journal:
+            details = self.journal.lookup_game(game['id'])
+            if details is not None:
+                return details
+        if not self.state:
+            return None
+        return self.state.lookup(game)
+
+    def _validate_game(self, game: Dict, embed_executor: Optional[Executor] = None,
+                       prefetch: bool = True) -> Tuple[Dict, bool]:
+        """
+        Get detail/embed data for a listing card, reusing results already
+        fetched in this run and stored results for unchanged games.
+
+        Args:
+            game: Game dictionary from a listing card
+            embed_executor: Optional executor for the embed check
+            prefetch: Start the thumbnail download if the game is kept
+
+        Returns:
+            Tuple of (details dictionary, True if pages were requested)
+        """
+        if self.games:
+            details, requested = self.games.resolve(game['id'], lambda: self._fetch_details(game, embed_executor))
+        else:
+            details, requested, _ = self._fetch_details(game, embed_executor)
+        if prefetch:
+            self._prefetch_kept(game, details)
+        return details, requested
+
+    def _fetch_details(self, game: Dict, embed_executor: Optional[Executor] = None) -> Tuple[Dict, bool, bool]:
+        """
+        Journal/state lookup, then the detail and embed requests for a game.
+
+        Returns:
+            Tuple of (details, True if pages were requested, False if a page
+            could not be fetched and the details are incomplete)
+        """
+        details = self._reusable_details_stored(game)
+        if details is not None:
+            return details, False, True
+
+        details, complete = self._scrape_game_details(game['url'], embed_executor)
+        if complete:
+            if self.state:
+                self.state.record(game, details)
+            if self.journal:
+                self.journal.record_game(game['id'], details)
+        return details, True, complete
+
+    def scrape_category(self, category: str, max_pages: Optional[int] = None,
+                        mode: Optional[str] = None) -> List[Game]:
         """
         Scrape all games from a category across multiple pages.
 
         Args:
             category: Game category to scrape
             max_pages: Maximum number of pages to scrape (None for config default)
+            mode: 'sync', 'pipeline' or 'async' (None for config default)
 
         Returns:
-            List of all scraped games
+            List of all scraped games as Game records (dict-style access;
+            ``to_dict()`` or ``json.dumps(..., default=json_default)`` for JSON)
+        """
+        games = []
+        self._crawl_category(category, max_pages, mode, games.append)
+        return games
+
+    def stream_category(self, category: str, sink, max_pages: Optional[int] = None,
+                        mode: Optional[str] = None) -> int:
+        """
+        Scrape a category, writing each game to ``sink`` as soon as it is
+        validated instead of collecting the whole category in memory.
+
+        Args:
+            category: Game category to scrape
+            sink: Object with a ``write(game)`` method (e.g. JsonlGameSink)
+            max_pages: Maximum number of pages to scrape (None for config default)
+            mode: 'sync', 'pipeline' or 'async' (None for config default)
+
+        Returns:
+            Number of games written
+        """
+        written = [0]
+
+        def emit(game: Dict):
+            with self.metrics.time('save'):
+                sink.write(game)
+            written[0] += 1
+
+        self._crawl_category(category, max_pages, mode, emit)
+        return written[0]
+
+    def _crawl_category(self, category: str, max_pages: Optional[int], mode: Optional[str],
+                        emit: Callable[[Dict], None]):
+        """
+        Run the selected crawl mode, passing kept games to ``emit`` in listing order.
+
+        Args:
+            category: Game category to scrape
+            max_pages: Maximum number of pages to scrape (None for config default)
+            mode: 'sync', 'pipeline' or 'async' (None for config default)
+            emit: Called once per kept game
         """
         if max_pages is None:
             max_pages = self.config.get('max_pages', 2)
 
-        rate_limit = self.config.get('rate_limit_seconds', 1.5)
+        if mode is None:
+            mode = self.config.get('crawl_mode', 'sync')
+
+        emit = self._wrap_emit(category, emit)
+
+        if mode == 'async':
+            from async_scraper import run_category_async
+            run_category_async(self, category, max_pages, emit)
+        elif mode == 'pipeline':
+            self._scrape_category_pipelined(category, max_pages, emit)
+        elif mode == 'sync' and self.memory_budget:
+            # Validate each listing page before fetching the next, so only one
+            # page of games is held at a time
+            for game in self._iter_kept(category, max_pages, None):
+                emit(game)
+        elif mode == 'sync':
+            self._scrape_category_sync(category, max_pages, emit)
+        else:
+            raise ValueError(f"Unknown crawl mode: {mode}")
+
+        self._finish_crawl()
+
+    def _wrap_emit(self, category: str, emit: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """Add run-store membership, database upserts and local thumbnails to a category's emit callback."""
+        if self.games:
+            store, emit_game = self.games, emit
+
+            def emit(game: Dict):
+                store.add_member(game['id'], category)
+                emit_game(game)
+
+        # Card-only games (scrape_iframes off) would blank stored details
+        if self.database and self.config.get('scrape_iframes', True):
+            database, emit_row = self.database, emit
+            source_file = f"{category}_games.json"
+
+            def emit(game: Dict):
+                with self.metrics.time('save'):
+                    database.upsert(game, source_file)
+                emit_row(game)
+
+        if self.thumbnails:
+            thumbnails, emit_game_with_thumbnail = self.thumbnails, emit
+
+            def emit(game: Dict):
+                thumbnails.attach(game)
+                emit_game_with_thumbnail(game)
+
+        return emit
+
+    def _finish_crawl(self):
+        """Persist the database, thumbnail index and incremental state after a crawl."""
+        if self.thumbnails:
+            self.thumbnails.close()
+        if self.database:
+            self.database.flush()
+        if self.state:
+            self.state.save()
+            self.logger.info(self.state.summary())
+
+    def _scrape_category_sync(self, category: str, max_pages: int, emit: Callable[[Dict], None]):
+        """
+        Scrape a category one request at a time, sleeping between requests
+        unless adaptive rate control paces them.
+
+        Args:
+            category: Game category to scrape
+            max_pages: Maximum number of pages to scrape
+            emit: Called with each kept game, in listing order
+        """
         scrape_iframes = self.config.get('scrape_iframes', True)
 
         all_games = []
+        seen_ids = set()
 
         self.logger.info(f"Starting scrape of '{category}' category, {max_pages} page(s)")
 
         # Scrape category pages
         for page in range(1, max_pages + 1):
             self.logger.info(f"Processing page {page}/{max_pages}")
-            games = self.scrape_category_page(category, page)
+            games = self._journaled_page(category, page)
+            fetched = games is None
+            if fetched:
+                games = self._listing_page(category, page)
+            games, last = self._new_listing_games(games, seen_ids)
             all_games.extend(games)
+            if last:
+                self.logger.info(f"Listing ends at page {page}")
+                break
 
             # Rate limiting between page requests
-            if page < max_pages:
-                time.sleep(rate_limit)
+            if fetched and page < max_pages:
+                self._pause()
 
         self.logger.info(f"Found {len(all_games)} total games")
 
         # Scrape iframes if enabled
         if scrape_iframes and all_games:
             self.logger.info("Validating games and filtering embeddable ones...")
-            embeddable_games = []
+            kept = 0
 
             for idx, game in enumerate(all_games, 1):
                 self.logger.info(f"Validating game {idx}/{len(all_games)}: {game['name']}")
 
-                iframe_data = self.scrape_game_iframe(game['url'])
+                iframe_data, fetched = self._validate_game(game)
                 game.update(iframe_data)
 
                 # Only keep embeddable games
                 if iframe_data.get('is_embeddable', False):
-                    embeddable_games.append(game)
+                    emit(game)
+                    kept += 1
                     self.logger.info(f"  ✓ Added to results")
                 else:
                     self.logger.info(f"  ✗ Skipped (not embeddable)")
 
                 # Rate limiting between iframe requests
-                if idx < len(all_games):
-                    time.sleep(rate_limit)
+                if fetched and idx < len(all_games):
+                    self._pause()
+
+            self.logger.info(f"Filtered: {kept}/{len(all_games)} embeddable games")
+            return
+
+        for game in all_games:
+            emit(game)
+
+    def iter_games(self, category: str, max_pages: Optional[int] = None,
+                   target: Optional[int] = None) -> Iterator[Game]:
+        """
+        Lazily yield a category's kept games, fetching listing pages and
+        validating games only as the caller consumes them.
+
+        Without ``target`` games are yielded in listing order. With it, all
+        listing pages are read first and their cards are validated best
+        listing rating first across the whole listing, so the games come out
+        sorted by rating; no further games are validated once ``target``
+        games have been kept, so a caller that needs the top N games pays
+        for about N / embeddable-ratio validations instead of the whole
+        listing.
+        Closing the generator early (``break``) also stops the crawl; the
+        database, thumbnail index and incremental state are saved either way.
+
+        Args:
+            category: Game category to scrape
+            max_pages: Maximum number of pages to scrape (None for config default)
+            target: Stop after this many kept games (None for all)
+
+        Yields:
+            Kept games (embeddable ones when scrape_iframes is on)
+        """
+        if max_pages is None:
+            max_pages = self.config.get('max_pages', 2)
+
+        ready: List[Game] = []
+        emit = self._wrap_emit(category, ready.append)
+        try:
+            for game in self._iter_kept(category, max_pages, target):
+                emit(game)
+                yield from ready
+                ready.clear()
+        finally:
+            self._finish_crawl()
+
+    def _iter_kept(self, category: str, max_pages: int, target: Optional[int]) -> Iterator[Game]:
+        """Sync crawl behind iter_games."""
+        scrape_iframes = self.config.get('scrape_iframes', True)
+        kept = 0
+        validated = 0
+
+        self.logger.info(f"Starting lazy scrape of '{category}' category, up to {max_pages} page(s)"
+                         + (f", target {target} game(s)" if target else ''))
+
+        if target:
+            # Best listing rating across all pages first; ties keep listing order like sorted()
+            listed = itertools.chain.from_iterable(self._iter_listing_pages(category, max_pages, prefetch=False))
+            candidates = [(-(game.get('rating') or 0), idx, game) for idx, game in enumerate(listed)]
+            self.logger.info(f"Found {len(candidates)} total games")
+            heapq.heapify(candidates)
+            pages = [[heapq.heappop(candidates)[2] for _ in range(len(candidates))]]
+        else:
+            pages = self._iter_listing_pages(category, max_pages)
+
+        for games in pages:
+            for game in games:
+                keep, requested = True, False
+                if scrape_iframes:
+                    validated += 1
+                    self.logger.info(f"Validating game {validated}: {game['name']}")
+                    details, requested = self._validate_game(game)
+                    game.update(details)
+                    keep = details.get('is_embeddable', False)
+                if keep:
+                    kept += 1
+                    yield game
+                    if target and kept >= target:
+                        self.logger.info(f"Reached target of {target} game(s) after {validated} validation(s)")
+                        return
+                # Rate limiting between iframe requests
+                if requested:
+                    self._pause()
+
+        self.logger.info(f"Kept {kept} game(s) after {validated} validation(s)")
+
+    def _iter_listing_pages(self, category: str, max_pages: int, prefetch: bool = True) -> Iterator[List[Game]]:
+        """
+        Yield the new games of each listing page in turn, fetching the next
+        page only when the caller asks for it.
+
+        Args:
+            category: Game category
+            max_pages: Maximum number of pages
+            prefetch: Start thumbnail downloads for every card (see _listing_page)
+
+        Yields:
+            Games not listed on an earlier page, one list per page
+        """
+        seen_ids = set()
+        for page in range(1, max_pages + 1):
+            self.logger.info(f"Processing page {page}/{max_pages}")
+            games = self._journaled_page(category, page, prefetch)
+            fetched = games is None
+            if fetched:
+                games = self._listing_page(category, page, prefetch)
+            games, last = self._new_listing_games(games, seen_ids)
+            yield games
+
+            if last:
+                self.logger.info(f"Listing ends at page {page}")
+                break
+            if fetched and page < max_pages:
+                self._pause()
+
+    def scrape_sitemap(self, categories: Optional[List[str]] = None,
+                       since: Optional[datetime] = None) -> List[Game]:
+        """
+        Discover games from the sitemap index and validate them.
+
+        Game URLs come from the sitemap, limited to games modified since
+        ``since``, instead of listing pagination. Listing pages are only
+        read to add the card fields a sitemap lacks (name, thumbnail,
+        rating, status), until each listing ends or every discovered game
+        has its card; games missing from the listings get a name derived
+        from their slug.
+
+        Args:
+            categories: Listings used for card fields (None for config['categories'], [] for none)
+            since: Oldest ``lastmod`` to crawl (None for config['sitemap']['since'] /
+                ``changed_within_hours``, or every game if neither is set)
+
+        Returns:
+            Kept games in sitemap order
+        """
+        if categories is None:
+            categories = self.config.get('categories', [])
+        if since is None:
+            since = since_from_config(self.config)
+        scrape_iframes = self.config.get('scrape_iframes', True)
+
+        self.logger.info(f"Discovering games from {self.sitemap.index_url}"
+                         + (f" modified since {since.isoformat()}" if since else ''))
+        discovered = list(self.sitemap.discover(since))
+        self.logger.info(self.sitemap.summary())
 
-            self.logger.info(f"Filtered: {len(embeddable_games)}/{len(all_games)} embeddable games")
-            return embeddable_games
+        cards = self._listing_cards(categories, {slug for slug, _ in discovered})
 
-        return all_games
+        games = []
+        emit = self._wrap_emit('sitemap', games.append)
+        for idx, (slug, entry) in enumerate(discovered, 1):
+            game = cards.get(slug) or Game(slug, slug.replace('-', ' ').title(), entry.loc, '')
+            if not scrape_iframes:
+                emit(game)
+                continue
+
+            # A page changed after its stored check must be scraped again
+            if self.state and entry.lastmod:
+                self.state.invalidate(slug, entry.lastmod.timestamp())
+            self.logger.info(f"Validating game {idx}/{len(discovered)}: {game['name']}")
+            details, requested = self._validate_game(game)
+            game.update(details)
+            if details.get('is_embeddable', False):
+                emit(game)
+
+            if requested and idx < len(discovered):
+                self._pause()
+
+        self._finish_crawl()
+        self.logger.info(f"Sitemap crawl kept {len(games)}/{len(discovered)} games")
+        return games
 
-    def save_to_json(self, games: List[Dict], category: str, output_path: Optional[str] = None):
+    def _listing_cards(self, categories: List[str], wanted: set) -> Dict[str, Game]:
+        """
+        Listing cards of the wanted games, read page by page until each
+        listing ends or every wanted game has been seen.
+        """
+        max_pages = self.config.get('sitemap', {}).get('listing_max_pages', 50)
+        cards: Dict[str, Game] = {}
+        for number, category in enumerate(categories):
+            if wanted <= cards.keys():
+                break
+            if number:
+                self._pause()
+            seen_ids = set()
+            for page in range(1, max_pages + 1):
+                games, last = self._new_listing_games(self._fetch_listing_page(category, page), seen_ids)
+                for game in games:
+                    if game['id'] in wanted and game['id'] not in cards:
+                        cards[game['id']] = game
+                if last or wanted <= cards.keys():
+                    break
+                self._pause()
+        self.logger.info(f"Listing cards found for {len(cards)}/{len(wanted)} discovered games")
+        return cards
+
+    def _scrape_category_pipelined(self, category: str, max_pages: int, emit: Callable[[Dict], None]):
+        """
+        Scrape a category as a listing -> detail -> embed-check pipeline.
+
+        A producer thread fetches listing pages and feeds each parsed card into
+        a bounded queue while the next page downloads. A pool of detail workers
+        validates games; each worker hands the embed check to a separate pool so
+        it runs alongside the detail-page parse. Every thread uses its own
+        requests.Session (see _get_session) and politeness is enforced by a
+        shared per-host token bucket.
+
+        Args:
+            category: Game category to scrape
+            max_pages: Maximum number of pages to scrape
+            emit: Called with each kept game, in the same order as the sync path
+        """
+        workers = max(1, self.config.get('concurrency', 8))
+        queue_size = self.config.get('pipeline_queue_size', workers * 2)
+        if self.memory_budget:
+            queue_size = self.config['memory_budget'].get('queue_size', queue_size)
+        scrape_iframes = self.config.get('scrape_iframes', True)
+        limiter = HostRateLimiter.from_config(self.config)
+
+        cards: queue.Queue = queue.Queue(maxsize=queue_size)
+        results: queue.Queue = queue.Queue(maxsize=queue_size)
+        done = object()
+        errors = []
+
+        self.logger.info(f"Starting pipelined scrape of '{category}' category, "
+                         f"{max_pages} page(s), {workers} worker(s)")
+
+        def produce():
+            idx = 0
+            seen_ids = set()
+            try:
+                for page in range(1, max_pages + 1):
+                    if errors:
+                        break
+                    self.logger.info(f"Processing page {page}/{max_pages}")
+                    games = self._journaled_page(category, page)
+                    if games is None:
+                        limiter.acquire(f"{self.base_url}/{category}.games?page={page}")
+                        games = self._listing_page(category, page)
+                    games, last = self._new_listing_games(games, seen_ids)
+                    for game in games:
+                        cards.put((idx, game))
+                        idx += 1
+                    if last:
+                        self.logger.info(f"Listing ends at page {page}")
+                        break
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                for _ in range(workers):
+                    cards.put(done)
+
+        def validate(embed_pool: Executor):
+            while True:
+                item = cards.get()
+                if item is done:
+                    break
+                if errors:
+                    # Keep draining so the producer never blocks on a full queue
+                    continue
+                idx, game = item
+                try:
+                    if scrape_iframes:
+                        details = self._reusable_details(game)
+                        if details is None:
+                            limiter.acquire(game['url'])
+                            self.logger.info(f"Validating game {idx + 1}: {game['name']}")
+                            details, _ = self._validate_game(game, embed_pool)
+                        game.update(details)
+                    results.put((idx, game))
+                except BaseException as e:
+                    # Includes KeyboardInterrupt so the collector re-raises it
+                    errors.append(e)
+            results.put(done)
+
+        ordered = OrderedEmitter(emit)
+        found = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='embed') as embed_pool:
+            threads = [threading.Thread(target=produce, name='listing', daemon=True)]
+            threads += [
+                threading.Thread(target=validate, args=(embed_pool,), name=f'detail-{n}', daemon=True)
+                for n in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+
+            finished = 0
+            while finished < workers:
+                item = results.get()
+                if item is done:
+                    finished += 1
+                    continue
+                idx, game = item
+                found += 1
+                if errors:
+                    continue
+                keep = not scrape_iframes or game.get('is_embeddable', False)
+                ordered.put(idx, game if keep else None)
+
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        self.logger.info(f"Found {found} total games")
+        if scrape_iframes:
+            self.logger.info(f"Filtered: {ordered.emitted}/{found} embeddable games")
+
+    def save_to_json(self, games: List[Union[Game, Dict]], category: str, output_path: Optional[str] = None):
         """
         Save scraped games to JSON file.
 
         Args:
-            games: List of game dictionaries
+            games: List of Game records or plain game dictionaries
             category: Category name
             output_path: Custom output path (optional)
         """
@@ -522,13 +1226,42 @@ class GamesScraper:
             'games': games
         }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with self.metrics.time('save'):
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
 
         self.logger.info(f"Saved {len(games)} games to {output_path}")
         return output_path
 
-    def scrape_multiple_categories(self, categories: List[str]) -> Dict[str, List[Dict]]:
+    def stream_to_jsonl(self, category: str, output_path: Optional[str] = None,
+                        max_pages: Optional[int] = None) -> JsonlGameSink:
+        """
+        Scrape a category straight into a JSONL file, one line per game.
+
+        Games are written as they are validated; the file is finalized with
+        a summary footer and renamed into place once the category is done.
+        On error the partial ``.part`` file is left behind.
+
+        Args:
+            category: Category name
+            output_path: Custom output path (optional)
+            max_pages: Maximum number of pages to scrape (None for config default)
+
+        Returns:
+            The closed sink (``path``, ``total_games`` and ``statistics``)
+        """
+        if output_path is None:
+            sink = JsonlGameSink.for_category(self.config, category)
+        else:
+            sink = JsonlGameSink(output_path, category)
+
+        with sink:
+            self.stream_category(category, sink, max_pages)
+
+        self.logger.info(f"Saved {sink.total_games} games to {sink.path}")
+        return sink
+
+    def scrape_multiple_categories(self, categories: List[str]) -> Dict[str, List[Game]]:
         """
         Scrape multiple categories.
 
@@ -536,8 +1269,11 @@ class GamesScraper:
             categories: List of category names
 
         Returns:
-            Dictionary mapping category names to game lists
+            Dictionary mapping category names to lists of Game records
         """
+        if self.config.get('scheduler', {}).get('enabled', False):
+            return self._scrape_interleaved(categories)
+
         results = {}
 
         for category in categories:
@@ -550,6 +1286,75 @@ class GamesScraper:
 
             # Rate limiting between categories
             if category != categories[-1]:
-                time.sleep(self.config.get('rate_limit_seconds', 1.5))
+                self._pause()
 
         return results
+
+    def stream_multiple_categories(self, categories: List[str]) -> Dict[str, JsonlGameSink]:
+        """
+        Scrape multiple categories, streaming each into its own JSONL file.
+
+        Args:
+            categories: List of category names
+
+        Returns:
+            Dictionary mapping category names to their closed sinks
+        """
+        if self.config.get('scheduler', {}).get('enabled', False):
+            return self._stream_interleaved(categories)
+
+        results = {}
+
+        for category in categories:
+            self.logger.info(f"Starting scrape for category: {category}")
+            results[category] = self.stream_to_jsonl(category)
+
+            # Rate limiting between categories
+            if category != categories[-1]:
+                self._pause()
+
+        return results
+
+    def _scrape_interleaved(self, categories: List[str]) -> Dict[str, List[Game]]:
+        """
+        Scrape all categories through the global scheduler, saving each
+        category's JSON file as soon as that category is complete.
+        """
+        results = {category: [] for category in categories}
+
+        def save(category: str):
+            self.save_to_json(results[category], category)
+
+        crawl_categories(self, list(results), self.config.get('max_pages', 2),
+                         lambda category: results[category].append, save)
+        self._finish_crawl()
+        return results
+
+    def _stream_interleaved(self, categories: List[str]) -> Dict[str, JsonlGameSink]:
+        """
+        Stream all categories through the global scheduler, finalizing each
+        JSONL file as soon as its category is complete.
+        """
+        sinks = {category: JsonlGameSink.for_category(self.config, category) for category in categories}
+
+        def writer(category: str) -> Callable[[Game], None]:
+            sink = sinks[category]
+
+            def write(game: Game):
+                with self.metrics.time('save'):
+                    sink.write(game)
+            return write
+
+        def close(category: str):
+            sink = sinks[category]
+            sink.close()
+            self.logger.info(f"Saved {sink.total_games} games to {sink.path}")
+
+        try:
+            crawl_categories(self, list(sinks), self.config.get('max_pages', 2), writer, close)
+        except BaseException:
+            for sink in sinks.values():
+                sink.abort()
+            raise
+        self._finish_crawl()
+        return sinks
@@ -0,0 +1,219 @@
+"""
+Sitemap-driven game discovery.
+
+Paging through ``/{category}.games`` costs one request per 50 games and
+cannot tell where the listing ends. The site's sitemap index lists every
+game URL with its ``lastmod`` date, so discovery walks the index and its
+child sitemaps instead, parsing each (optionally gzipped) document
+incrementally as it downloads and discarding elements once read, so memory
+stays flat however large the sitemaps are. Child sitemaps and URLs whose
+``lastmod`` is older than ``since`` are skipped, which turns a daily crawl
+into a crawl of the games that changed.
+"""
+
+import re
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+# Sitemaps are read and parsed in chunks of this size
+SITEMAP_CHUNK_SIZE = 64 * 1024
+
+# Child sitemap (<sitemap>) and page (<url>) entries
+SITEMAP_ENTRY = 'sitemap'
+URL_ENTRY = 'url'
+
+# Game pages are a single path segment (https://1games.io/<slug>)
+DEFAULT_GAME_URL_PATTERN = r'^https?://(?:www\.)?1games\.io/([a-z0-9][a-z0-9-]*)/?$'
+
+# Single-segment pages that are not games
+DEFAULT_EXCLUDE_SLUGS = ('about', 'about-us', 'contact', 'contact-us', 'privacy', 'privacy-policy',
+                         'terms', 'terms-of-use', 'dmca', 'blog', 'faq', 'sitemap')
+
+
+class SitemapEntry(NamedTuple):
+    loc: str
+    lastmod: Optional[datetime]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a W3C datetime (``2025-11-03`` or ``2025-11-03T10:00:00+00:00``).
+
+    Returns:
+        Timezone-aware datetime (UTC if none was given), or None if unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def iter_sitemap_entries(chunks: Iterable[bytes]) -> Iterator[Tuple[str, SitemapEntry]]:
+    """
+    Stream the entries of a sitemap or sitemap index.
+
+    Args:
+        chunks: Raw document body in chunks; a gzip body is detected and
+            decompressed on the fly
+
+    Yields:
+        (SITEMAP_ENTRY or URL_ENTRY, SitemapEntry) in document order
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed
+    """
+    parser = XMLPullParser(events=('start', 'end'))
+    decompressor = None
+    first = True
+    root = None
+
+    def entries():
+        nonlocal root
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+            tag = elem.tag[len(SITEMAP_NS):] if elem.tag.startswith(SITEMAP_NS) else elem.tag
+            if tag in (SITEMAP_ENTRY, URL_ENTRY):
+                loc = elem.findtext(f'{SITEMAP_NS}loc') or elem.findtext('loc')
+                lastmod = elem.findtext(f'{SITEMAP_NS}lastmod') or elem.findtext('lastmod')
+                if loc:
+                    yield tag, SitemapEntry(loc.strip(), parse_lastmod(lastmod))
+                # Entries are done with once read; drop them from the tree
+                root.clear()
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk[:2] == b'\x1f\x8b':
+                decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+        yield from entries()
+    if decompressor:
+        parser.feed(decompressor.flush())
+    parser.close()
+    yield from entries()
+
+
+class SitemapDiscovery:
+    """
+    Enumerates game URLs from a sitemap index.
+    """
+
+    def __init__(self, index_url: str, fetch: Callable[[str], Optional[Iterable[bytes]]],
+                 game_url_pattern: str = DEFAULT_GAME_URL_PATTERN,
+                 exclude_slugs: Iterable[str] = DEFAULT_EXCLUDE_SLUGS, max_sitemaps: int = 1000):
+        """
+        Args:
+            index_url: Sitemap index (or single sitemap) URL
+            fetch: ``fetch(url)`` returning the body as an iterable of byte
+                chunks, or None if the request failed
+            game_url_pattern: Regex matching game page URLs; group 1 is the slug
+            exclude_slugs: Slugs matching the pattern that are not games
+            max_sitemaps: Upper bound on sitemap documents fetched per walk
+        """
+        self.index_url = index_url
+        self.fetch = fetch
+        self.game_url_re = re.compile(game_url_pattern)
+        self.exclude_slugs = frozenset(exclude_slugs)
+        self.max_sitemaps = max_sitemaps
+        self.stats = {'sitemaps': 0, 'failed_sitemaps': 0, 'urls': 0, 'games': 0, 'unchanged': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict, fetch: Callable) -> 'SitemapDiscovery':
+        """Build discovery from config['sitemap'] (defaults to <base_url>/sitemap.xml)."""
+        sitemap = config.get('sitemap', {})
+        base_url = config.get('base_url', 'https://1games.io').rstrip('/')
+        return cls(
+            sitemap.get('index_url') or f"{base_url}/sitemap.xml",
+            fetch,
+            game_url_pattern=sitemap.get('game_url_pattern', DEFAULT_GAME_URL_PATTERN),
+            exclude_slugs=sitemap.get('exclude_slugs', DEFAULT_EXCLUDE_SLUGS),
+            max_sitemaps=sitemap.get('max_sitemaps', 1000),
+        )
+
+    def game_slug(self, url: str) -> Optional[str]:
+        """Slug (game id) of a game page URL, or None for other pages."""
+        match = self.game_url_re.match(url)
+        if not match or match.group(1) in self.exclude_slugs:
+            return None
+        return match.group(1)
+
+    def discover(self, since: Optional[datetime] = None) -> Iterator[Tuple[str, SitemapEntry]]:
+        """
+        Walk the sitemap index and yield game pages.
+
+        Args:
+            since: Skip child sitemaps and URLs last modified before this time
+                (entries without ``lastmod`` are always kept)
+
+        Yields:
+            (slug, SitemapEntry) for each game, once per slug
+        """
+        pending: List[str] = [self.index_url]
+        visited = set()
+        seen_slugs = set()
+        while pending and len(visited) < self.max_sitemaps:
+            url = pending.pop(0)
+            if url in visited:
+                continue
+            visited.add(url)
+
+            chunks = self.fetch(url)
+            if chunks is None:
+                self.stats['failed_sitemaps'] += 1
+                continue
+            self.stats['sitemaps'] += 1
+            try:
+                for kind, entry in iter_sitemap_entries(chunks):
+                    changed = since is None or entry.lastmod is None or entry.lastmod >= since
+                    if kind == SITEMAP_ENTRY:
+                        if changed:
+                            pending.append(entry.loc)
+                        continue
+                    self.stats['urls'] += 1
+                    slug = self.game_slug(entry.loc)
+                    if slug is None or slug in seen_slugs:
+                        continue
+                    seen_slugs.add(slug)
+                    if not changed:
+                        self.stats['unchanged'] += 1
+                        continue
+                    self.stats['games'] += 1
+                    yield slug, entry
+            except (ParseError, zlib.error):
+                # Malformed XML or a corrupt gzip body
+                self.stats['failed_sitemaps'] += 1
+
+    def summary(self) -> str:
+        """One-line summary of sitemap discovery for end-of-run reporting."""
+        return (f"Sitemap: {self.stats['games']} game(s) to check from {self.stats['urls']} URL(s) in "
+                f"{self.stats['sitemaps']} sitemap(s), {self.stats['unchanged']} unchanged, "
+                f"{self.stats['failed_sitemaps']} sitemap(s) failed")
+
+
+def since_from_config(config: Dict) -> Optional[datetime]:
+    """
+    Earliest ``lastmod`` to crawl: config['sitemap']['since'] (ISO date) or
+    ``changed_within_hours`` before now; None crawls every game.
+    """
+    sitemap = config.get('sitemap', {})
+    if sitemap.get('since'):
+        return parse_lastmod(sitemap['since'])
+    if sitemap.get('changed_within_hours'):
+        return datetime.now(timezone.utc) - timedelta(hours=sitemap['changed_within_hours'])
+    return None
@@ -0,0 +1,131 @@
+"""
+Persistent crawl state for incremental scraping.
+Remembers, per game id, a fingerprint of the listing card and the last
+detail/embed result so unchanged games can skip their detail requests.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Card fields that signal a game page may have changed
+FINGERPRINT_FIELDS = ('rating', 'status', 'thumbnail')
+
+
+def card_fingerprint(game: Dict) -> str:
+    """
+    Fingerprint the listing-card fields of a game.
+
+    Args:
+        game: Game dictionary produced by _extract_game_from_card
+
+    Returns:
+        Hex digest of the fingerprinted fields
+    """
+    payload = json.dumps([game.get(field) for field in FINGERPRINT_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class CrawlState:
+    """
+    JSON-backed store of per-game crawl state keyed by game ``id``.
+
+    A game needs re-scraping when it is new, its card fingerprint changed,
+    or its last detail/embed check is older than ``max_age_seconds``.
+    """
+
+    def __init__(self, path: str, max_age_seconds: float):
+        """
+        Args:
+            path: JSON file holding the state
+            max_age_seconds: Age after which stored details are refreshed
+        """
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.stats = {'reused': 0, 'refreshed': 0}
+        self._lock = threading.Lock()
+        self._games: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._games = json.load(f).get('games', {})
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['CrawlState']:
+        """Build the state store described by config['incremental'], or None if disabled."""
+        incremental = config.get('incremental', {})
+        if not incremental.get('enabled', False):
+            return None
+        return cls(
+            incremental.get('state_path', 'state/crawl_state.json'),
+            incremental.get('max_age_hours', 168) * 3600,
+        )
+
+    def lookup(self, game: Dict) -> Optional[Dict]:
+        """
+        Return stored details if the game is unchanged and still fresh.
+
+        Args:
+            game: Game dictionary from a listing card
+
+        Returns:
+            Copy of the stored detail/embed result, or None if it must be re-scraped
+        """
+        with self._lock:
+            entry = self._games.get(game.get('id'))
+            if (entry is None
+                    or entry['fingerprint'] != card_fingerprint(game)
+                    or time.time() - entry['checked_at'] > self.max_age_seconds):
+                return None
+            self.stats['reused'] += 1
+            return copy.deepcopy(entry['details'])
+
+    def record(self, game: Dict, details: Dict):
+        """
+        Remember the detail/embed result for a game.
+
+        Args:
+            game: Game dictionary from a listing card
+            details: Result of scrape_game_details
+        """
+        with self._lock:
+            self._games[game['id']] = {
+                'fingerprint': card_fingerprint(game),
+                'checked_at': time.time(),
+                'details': copy.deepcopy(details),
+            }
+            self.stats['refreshed'] += 1
+
+    def invalidate(self, game_id: str, modified_at: float):
+        """
+        Forget stored details checked before the game page last changed
+        (e.g. its sitemap ``lastmod``), so the next lookup re-scrapes it.
+
+        Args:
+            game_id: Game id (slug)
+            modified_at: Unix time the game page was last modified
+        """
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is not None and entry['checked_at'] < modified_at:
+                del self._games[game_id]
+
+    def save(self):
+        """Write the state file atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'games': self._games}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        """One-line summary of incremental activity for end-of-run reporting."""
+        return (f"Incremental: {self.stats['reused']} game(s) unchanged, "
+                f"{self.stats['refreshed']} re-scraped")
@@ -0,0 +1,329 @@
+"""
+Thumbnail download, verification and content-addressed storage.
+
+Listing cards only carry a hot-linked ``thumbnail`` URL. This stage
+downloads every thumbnail in a background pool as soon as its listing page
+is parsed, checks the content type, byte size and pixel dimensions, and
+stores the image under its SHA-256 so the same picture listed in several
+categories is kept once. With Pillow installed, resized WebP variants are
+written next to it. An index remembers each URL's validators so later runs
+send conditional requests and unchanged images cost a 304.
+
+Layout under the thumbnail directory:
+    objects/<sha[:2]>/<sha>.<ext>          original image
+    variants/<sha[:2]>/<sha>-<width>.webp  resized copies
+    index.json                             URL -> hash, validators, size
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Variants are skipped without Pillow
+    Image = None
+
+
+# Content type -> file extension for accepted images
+IMAGE_TYPES = {
+    'image/webp': 'webp',
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+}
+
+
+def sniff_image(body: bytes) -> Optional[Tuple[str, int, int]]:
+    """
+    Read the format and pixel size from an image header.
+
+    Args:
+        body: Image bytes
+
+    Returns:
+        (content type, width, height), or None if the format is not
+        recognized or the header is truncated
+    """
+    try:
+        if body.startswith(b'\x89PNG\r\n\x1a\n') and body[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', body[16:24])
+            return 'image/png', width, height
+        if body[:6] in (b'GIF87a', b'GIF89a'):
+            width, height = struct.unpack('<HH', body[6:10])
+            return 'image/gif', width, height
+        if body[:4] == b'RIFF' and body[8:12] == b'WEBP':
+            chunk = body[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', body[26:30])
+                return 'image/webp', width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L':
+                bits = int.from_bytes(body[21:25], 'little')
+                return 'image/webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                width = int.from_bytes(body[24:27], 'little') + 1
+                height = int.from_bytes(body[27:30], 'little') + 1
+                return 'image/webp', width, height
+            return None
+        if body[:2] == b'\xff\xd8':
+            # Walk the JPEG segments up to the first start-of-frame marker
+            pos = 2
+            while pos + 9 < len(body):
+                if body[pos] != 0xFF:
+                    return None
+                marker = body[pos + 1]
+                if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                    pos += 2
+                    continue
+                length = struct.unpack('>H', body[pos + 2:pos + 4])[0]
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack('>HH', body[pos + 5:pos + 9])
+                    return 'image/jpeg', width, height
+                pos += 2 + length
+    except struct.error:
+        return None
+    return None
+
+
+class ThumbnailError(Exception):
+    """A thumbnail could not be fetched or failed verification."""
+
+
+class ThumbnailStore:
+    """
+    Background thumbnail fetcher and content-addressed image store.
+
+    ``prefetch`` starts a download as soon as a URL is known and ``attach``
+    waits for it and records the local paths on the game. Each URL is
+    processed once per run, however many games share it.
+    """
+
+    def __init__(self, directory: str, fetch: Callable, workers: int = 4,
+                 max_bytes: int = 2 * 1024 * 1024, min_size: Tuple[int, int] = (32, 32),
+                 max_size: Tuple[int, int] = (4096, 4096), variant_widths: Tuple[int, ...] = (),
+                 webp_quality: int = 80):
+        """
+        Args:
+            directory: Root of the image store
+            fetch: ``fetch(url, headers)`` returning a requests.Response or None
+            workers: Downloads in flight
+            max_bytes: Largest accepted image
+            min_size: Smallest accepted (width, height)
+            max_size: Largest accepted (width, height)
+            variant_widths: Widths of the resized WebP copies (needs Pillow)
+            webp_quality: WebP quality of the variants
+        """
+        self.directory = Path(directory)
+        self.fetch = fetch
+        self.workers = max(1, workers)
+        self.max_bytes = max_bytes
+        self.min_size = tuple(min_size)
+        self.max_size = tuple(max_size)
+        self.variant_widths = tuple(variant_widths) if Image is not None else ()
+        self.webp_quality = webp_quality
+        self.stats = {'downloaded': 0, 'not_modified': 0, 'deduplicated': 0,
+                      'rejected': 0, 'failed': 0, 'variants': 0}
+
+        self.index_path = self.directory / 'index.json'
+        self._index: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f).get('thumbnails', {})
+
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, config: Dict, fetch: Callable) -> Optional['ThumbnailStore']:
+        """Build the store described by config['thumbnails'], or None if disabled."""
+        thumbnails = config.get('thumbnails', {})
+        if not thumbnails.get('enabled', False):
+            return None
+        return cls(
+            thumbnails.get('path', 'data/thumbnails'),
+            fetch,
+            workers=thumbnails.get('workers', 4),
+            max_bytes=int(thumbnails.get('max_size_kb', 2048) * 1024),
+            min_size=thumbnails.get('min_dimensions', (32, 32)),
+            max_size=thumbnails.get('max_dimensions', (4096, 4096)),
+            variant_widths=thumbnails.get('variant_widths', (200, 400)),
+            webp_quality=thumbnails.get('webp_quality', 80),
+        )
+
+    def prefetch(self, url: str) -> Optional[Future]:
+        """Start processing a thumbnail URL in the background (once per URL)."""
+        if not url:
+            return None
+        with self._lock:
+            future = self._futures.get(url)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='thumb')
+                future = self._futures[url] = self._executor.submit(self._process, url)
+            return future
+
+    def attach(self, game):
+        """
+        Wait for the game's thumbnail and set ``thumbnail_path``,
+        ``thumbnail_variants`` and ``thumbnail_error`` on it.
+        """
+        future = self.prefetch(game.get('thumbnail'))
+        if future is None:
+            game.update({'thumbnail_path': None, 'thumbnail_variants': {}, 'thumbnail_error': 'no thumbnail'})
+            return
+        try:
+            entry = future.result()
+        except ThumbnailError as e:
+            game.update({'thumbnail_path': None, 'thumbnail_variants': {}, 'thumbnail_error': str(e)})
+            return
+        game.update({
+            'thumbnail_path': self._object_path(entry['sha256'], entry['ext']).as_posix(),
+            'thumbnail_variants': {str(width): self._variant_path(entry['sha256'], width).as_posix()
+                                   for width in entry.get('variants', [])},
+            'thumbnail_error': None,
+        })
+
+    def _process(self, url: str) -> Dict:
+        """
+        Fetch (conditionally), verify and store one thumbnail; returns its
+        index entry. Any failure, including undecodable image data and disk
+        errors, is raised as ThumbnailError so it only costs this thumbnail.
+        """
+        try:
+            return self._fetch_and_store(url)
+        except ThumbnailError:
+            raise
+        except Exception as e:
+            self._count('failed')
+            raise ThumbnailError(f"{type(e).__name__}: {e}") from e
+
+    def _fetch_and_store(self, url: str) -> Dict:
+        with self._lock:
+            known = self._index.get(url)
+        headers = {}
+        if known and self._object_path(known['sha256'], known['ext']).exists():
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+        else:
+            known = None
+
+        response = self.fetch(url, headers or None)
+        if response is None:
+            self._count('failed')
+            raise ThumbnailError('download failed')
+        if response.status_code == 304 and known:
+            self._count('not_modified')
+            return self._ensure_variants(url, known)
+
+        body = response.content
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        entry = self._verify(url, body, content_type)
+        entry['etag'] = response.headers.get('ETag')
+        entry['last_modified'] = response.headers.get('Last-Modified')
+
+        path = self._object_path(entry['sha256'], entry['ext'])
+        if path.exists():
+            self._count('deduplicated')
+        else:
+            _write_atomic(path, body)
+            self._count('downloaded')
+        return self._ensure_variants(url, entry, body)
+
+    def _verify(self, url: str, body: bytes, content_type: str) -> Dict:
+        """Check type, size and dimensions; returns a new index entry."""
+        if content_type not in IMAGE_TYPES:
+            self._count('rejected')
+            raise ThumbnailError(f"unexpected content type {content_type or 'none'}")
+        if len(body) > self.max_bytes:
+            self._count('rejected')
+            raise ThumbnailError(f"too large ({len(body) // 1024} KB)")
+        sniffed = sniff_image(body)
+        if sniffed is None:
+            self._count('rejected')
+            raise ThumbnailError('not a readable image')
+        actual_type, width, height = sniffed
+        if not (self.min_size[0] <= width <= self.max_size[0] and self.min_size[1] <= height <= self.max_size[1]):
+            self._count('rejected')
+            raise ThumbnailError(f"unexpected dimensions {width}x{height}")
+        return {
+            'sha256': hashlib.sha256(body).hexdigest(),
+            'ext': IMAGE_TYPES[actual_type],
+            'content_type': actual_type,
+            'width': width,
+            'height': height,
+            'bytes': len(body),
+            'variants': [],
+        }
+
+    def _ensure_variants(self, url: str, entry: Dict, body: Optional[bytes] = None) -> Dict:
+        """Write any missing WebP variants and record the entry in the index."""
+        missing = [width for width in self.variant_widths
+                   if not self._variant_path(entry['sha256'], width).exists()]
+        if missing:
+            if body is None:
+                body = self._object_path(entry['sha256'], entry['ext']).read_bytes()
+            for width in missing:
+                self._write_variant(entry['sha256'], body, width)
+        entry = dict(entry, variants=[width for width in self.variant_widths
+                                      if self._variant_path(entry['sha256'], width).exists()])
+        with self._lock:
+            self._index[url] = entry
+        return entry
+
+    def _write_variant(self, sha: str, body: bytes, width: int):
+        with Image.open(BytesIO(body)) as image:
+            image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            out = BytesIO()
+            image.save(out, 'WEBP', quality=self.webp_quality)
+        _write_atomic(self._variant_path(sha, width), out.getvalue())
+        self._count('variants')
+
+    def _object_path(self, sha: str, ext: str) -> Path:
+        return self.directory / 'objects' / sha[:2] / f"{sha}.{ext}"
+
+    def _variant_path(self, sha: str, width: int) -> Path:
+        return self.directory / 'variants' / sha[:2] / f"{sha}-{width}.webp"
+
+    def _count(self, event: str):
+        with self._lock:
+            self.stats[event] += 1
+
+    def save(self):
+        """Write the index atomically."""
+        with self._lock:
+            payload = json.dumps({'thumbnails': self._index}, ensure_ascii=False)
+        _write_atomic(self.index_path, payload.encode('utf-8'))
+
+    def close(self):
+        """Finish in-flight downloads and save the index."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        self.save()
+
+    def summary(self) -> str:
+        """One-line summary of thumbnail processing for end-of-run reporting."""
+        variants = f"{self.stats['variants']} variant(s) written" if Image is not None else 'no variants (Pillow not installed)'
+        return (f"Thumbnails: {self.stats['downloaded']} downloaded, {self.stats['not_modified']} unchanged (304), "
+                f"{self.stats['deduplicated']} duplicate(s), {self.stats['rejected']} rejected, "
+                f"{self.stats['failed']} failed, {variants}")
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,424 @@
+"""
+Shared work queue for multi-process crawls.
+
+Several ``main.py --worker`` processes, on one machine or on several that
+share a filesystem, split one crawl through a SQLite queue of listing-page
+and game-validation tasks. A worker leases a task for ``lease_seconds``;
+if it dies, the lease expires and another worker picks the task up again,
+up to ``max_attempts`` times. Listing results (every card of every page)
+and validation results are stored in the queue, and once no task is left
+one worker merges them in listing order, so the output files match those
+of a single-process crawl. A game listed in several categories is
+validated once.
+
+The database uses SQLite's rollback journal rather than WAL, since WAL
+needs shared memory and so does not work across machines.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from records import Game, as_dict, json_default
+
+
+LISTING_TASK = 'listing'
+GAME_TASK = 'game'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+  id INTEGER PRIMARY KEY,
+  kind TEXT NOT NULL,
+  key TEXT NOT NULL,
+  category TEXT,
+  page INTEGER,
+  payload TEXT,
+  status TEXT NOT NULL DEFAULT 'pending',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  owner TEXT,
+  lease_expires REAL,
+  result TEXT,
+  error TEXT,
+  UNIQUE (kind, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, kind, id);
+
+CREATE TABLE IF NOT EXISTS cards (
+  category TEXT NOT NULL,
+  page INTEGER NOT NULL,
+  position INTEGER NOT NULL,
+  game_id TEXT NOT NULL,
+  card TEXT NOT NULL,
+  PRIMARY KEY (category, page, position)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT
+);
+"""
+
+
+class Task(NamedTuple):
+    id: int
+    kind: str
+    key: str
+    category: Optional[str]
+    page: Optional[int]
+    payload: Optional[Dict]
+    attempts: int
+    owner: str
+
+
+class WorkQueue:
+    """
+    SQLite-backed task queue with leases, visibility timeouts and retry counts.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3):
+        """
+        Args:
+            path: SQLite file shared by all workers
+            lease_seconds: How long a leased task stays invisible to other
+                workers before it is handed out again
+            max_attempts: Leases per task before it is marked failed
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        # Autocommit; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'WorkQueue':
+        """Open the queue described by config['work_queue']."""
+        work_queue = config.get('work_queue', {})
+        return cls(
+            work_queue.get('path', 'state/work_queue.sqlite'),
+            work_queue.get('lease_seconds', 300),
+            work_queue.get('max_attempts', 3),
+        )
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front, so two workers never lease the same task."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def seed(self, categories: List[str], max_pages: int) -> Tuple[List[str], int]:
+        """
+        Queue the listing pages of a crawl unless another worker already did.
+
+        Args:
+            categories: Categories to crawl
+            max_pages: Listing pages per category
+
+        Returns:
+            (categories, max_pages) of the crawl in the queue, which win over
+            the arguments if the queue was seeded before
+        """
+        with self._write() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'crawl'").fetchone()
+            if row:
+                crawl = json.loads(row[0])
+                return crawl['categories'], crawl['max_pages']
+            conn.execute("INSERT INTO meta (key, value) VALUES ('crawl', ?)",
+                         (json.dumps({'categories': categories, 'max_pages': max_pages}),))
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (kind, key, category, page) VALUES (?, ?, ?, ?)",
+                [(LISTING_TASK, f"{category}:{page}", category, page)
+                 for category in categories for page in range(1, max_pages + 1)])
+        return categories, max_pages
+
+    def lease(self, owner: str) -> Optional[Task]:
+        """
+        Lease the next task: listing pages first, then games, oldest first.
+        Tasks whose lease expired are handed out again; ones that have used
+        up their attempts are marked failed instead.
+
+        Args:
+            owner: Worker identity recorded on the lease
+
+        Returns:
+            The leased task, or None if nothing is available right now
+        """
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts))
+            row = conn.execute(
+                "SELECT id, kind, key, category, page, payload, attempts FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY kind = ?, id LIMIT 1",
+                (now, GAME_TASK)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (owner, now + self.lease_seconds, row[0]))
+        task_id, kind, key, category, page, payload, attempts = row
+        return Task(task_id, kind, key, category, page, json.loads(payload) if payload else None, attempts + 1,
+                    owner)
+
+    def complete_listing(self, task: Task, games: List, queue_games: bool, last_page: bool) -> bool:
+        """
+        Store a listing page's cards and queue a validation task per new game.
+
+        Args:
+            task: The leased listing task
+            games: Games parsed from the page, in listing order
+            queue_games: Queue validation tasks (scrape_iframes on)
+            last_page: The page ends the listing; later pages of the
+                category are not fetched
+
+        Returns:
+            False if the lease was lost (expired and taken by another
+            worker) and nothing was stored
+        """
+        cards = [json.dumps(as_dict(game), ensure_ascii=False, default=json_default) for game in games]
+        with self._write() as conn:
+            if not self._finish(conn, task, 'done', json.dumps({'games': len(games)})):
+                return False
+            conn.execute("DELETE FROM cards WHERE category = ? AND page = ?", (task.category, task.page))
+            conn.executemany(
+                "INSERT INTO cards (category, page, position, game_id, card) VALUES (?, ?, ?, ?, ?)",
+                [(task.category, task.page, position, game['id'], card)
+                 for position, (game, card) in enumerate(zip(games, cards))])
+            if queue_games:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (kind, key, category, payload) VALUES (?, ?, ?, ?)",
+                    [(GAME_TASK, game['id'], task.category, card) for game, card in zip(games, cards)])
+            if last_page:
+                conn.execute(
+                    "UPDATE tasks SET status = 'done', result = ? WHERE kind = ? AND category = ? "
+                    "AND page > ? AND status = 'pending'",
+                    (json.dumps({'skipped': True}), LISTING_TASK, task.category, task.page))
+        return True
+
+    def complete_game(self, task: Task, details: Dict, requested: bool) -> bool:
+        """
+        Store a game's detail/embed result.
+
+        Args:
+            task: The leased game task
+            details: Result of the detail and embed checks
+            requested: Pages were fetched (the result is new)
+
+        Returns:
+            False if the lease was lost and the result was not stored
+        """
+        result = json.dumps({'details': details, 'requested': requested}, ensure_ascii=False, default=json_default)
+        with self._write() as conn:
+            return self._finish(conn, task, 'done', result)
+
+    def fail(self, task: Task, error: str) -> bool:
+        """
+        Give a task back for another attempt, or mark it failed once its
+        attempts are used up. False if the lease was lost.
+        """
+        status = 'failed' if task.attempts >= self.max_attempts else 'pending'
+        with self._write() as conn:
+            return conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND owner = ? AND status = 'leased'",
+                (status, error, task.id, task.owner)).rowcount == 1
+
+    def release(self, task: Task):
+        """Give a task back without using up an attempt (e.g. on Ctrl-C)."""
+        with self._write() as conn:
+            conn.execute("UPDATE tasks SET status = 'pending', attempts = attempts - 1, owner = NULL, "
+                         "lease_expires = NULL WHERE id = ? AND owner = ? AND status = 'leased'",
+                         (task.id, task.owner))
+
+    @staticmethod
+    def _finish(conn: sqlite3.Connection, task: Task, status: str, result: str) -> bool:
+        """Close a task this worker still holds the lease on; False if another worker took it over."""
+        return conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL WHERE id = ? AND owner = ? AND status = 'leased'",
+            (status, result, task.id, task.owner)).rowcount == 1
+
+    def progress(self) -> Dict[str, int]:
+        """Task counts by status."""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for status, count in self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def claim_merge(self) -> bool:
+        """True for exactly one caller once every task is finished."""
+        with self._write() as conn:
+            left = conn.execute("SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')").fetchone()[0]
+            if left:
+                return False
+            return conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('merged', ?)",
+                                (str(time.time()),)).rowcount == 1
+
+    def page_cards(self, category: str, page: int) -> Optional[List[Dict]]:
+        """Cards stored for a listing page, in listing order; None if its task did not complete."""
+        row = self._conn.execute("SELECT status FROM tasks WHERE kind = ? AND key = ?",
+                                 (LISTING_TASK, f"{category}:{page}")).fetchone()
+        if row is None or row[0] != 'done':
+            return None
+        return [json.loads(card) for (card,) in self._conn.execute(
+            "SELECT card FROM cards WHERE category = ? AND page = ? ORDER BY position", (category, page))]
+
+    def game_results(self) -> Dict[str, Dict]:
+        """Game id -> {'details', 'requested'} for every validated game."""
+        return {key: json.loads(result) for key, result in self._conn.execute(
+            "SELECT key, result FROM tasks WHERE kind = ? AND status = 'done'", (GAME_TASK,))}
+
+    def failed_tasks(self) -> List[Tuple[str, str, Optional[str]]]:
+        """(kind, key, error) of tasks that used up their attempts."""
+        return self._conn.execute("SELECT kind, key, error FROM tasks WHERE status = 'failed'").fetchall()
+
+    def summary(self) -> str:
+        """One-line queue status for end-of-run reporting."""
+        progress = self.progress()
+        return (f"Work queue: {progress['done']} done, {progress['leased']} leased, "
+                f"{progress['pending']} pending, {progress['failed']} failed ({self.path})")
+
+    def close(self):
+        self._conn.close()
+
+
+def worker_id() -> str:
+    """Identity of this worker process on leases: host and process id."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(scraper, queue: WorkQueue, categories: List[str], max_pages: int,
+               poll_seconds: float = 5.0) -> Optional[Dict[str, List[Game]]]:
+    """
+    Work through the queue until every task is finished.
+
+    Args:
+        scraper: GamesScraper performing the requests
+        queue: Shared work queue
+        categories: Categories to crawl if the queue is not seeded yet
+        max_pages: Listing pages per category if the queue is not seeded yet
+        poll_seconds: Wait between checks while other workers hold the
+            remaining tasks
+
+    Returns:
+        The merged games per category if this worker merged the crawl,
+        else None (another worker did, or will)
+    """
+    logger = scraper.logger
+    scrape_iframes = scraper.config.get('scrape_iframes', True)
+    per_page = scraper.config.get('games_per_page', 50)
+    owner = worker_id()
+    categories, max_pages = queue.seed(categories, max_pages)
+    logger.info(f"Worker {owner} joined crawl of {', '.join(categories)} ({max_pages} page(s) each)")
+
+    done = 0
+    while True:
+        task = queue.lease(owner)
+        if task is None:
+            progress = queue.progress()
+            if not progress['pending'] and not progress['leased']:
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        try:
+            if task.kind == LISTING_TASK:
+                logger.info(f"Listing {task.category} page {task.page} (attempt {task.attempts})")
+                games = scraper._fetch_listing_page(task.category, task.page)
+                if games is None:
+                    # Not the end of the listing: the page is tried again
+                    queue.fail(task, 'listing fetch failed')
+                    continue
+                stored = queue.complete_listing(task, games, scrape_iframes, len(games) < per_page)
+                requested = True
+            else:
+                game = Game.from_dict(task.payload)
+                logger.info(f"Validating {game['name']} (attempt {task.attempts})")
+                # Thumbnails are fetched by the worker that merges and writes the output
+                details, requested = scraper._validate_game(game, prefetch=False)
+                stored = queue.complete_game(task, details, requested)
+        except KeyboardInterrupt:
+            queue.release(task)
+            raise
+        except Exception as e:
+            logger.error(f"Task {task.kind} {task.key} failed: {e}")
+            queue.fail(task, str(e))
+            continue
+
+        if stored:
+            done += 1
+        else:
+            logger.warning(f"Lease on {task.kind} {task.key} was lost to another worker; result discarded")
+        if requested:
+            scraper._pause()
+
+    logger.info(f"Worker {owner} finished {done} task(s); {queue.summary()}")
+    if not queue.claim_merge():
+        return None
+    return merge_results(scraper, queue, categories, max_pages)
+
+
+def merge_results(scraper, queue: WorkQueue, categories: List[str], max_pages: int) -> Dict[str, List[Game]]:
+    """
+    Assemble each category from the stored pages and results, in the
+    order a single-process crawl emits them.
+    """
+    logger = scraper.logger
+    scrape_iframes = scraper.config.get('scrape_iframes', True)
+    results = queue.game_results()
+    for kind, key, error in queue.failed_tasks():
+        logger.warning(f"Task {kind} {key} failed permanently: {error}")
+
+    merged = {}
+    for category in categories:
+        all_games = []
+        seen_ids = set()
+        for page in range(1, max_pages + 1):
+            cards = queue.page_cards(category, page)
+            games, last = scraper._new_listing_games(
+                None if cards is None else [Game.from_dict(card) for card in cards], seen_ids)
+            all_games.extend(games)
+            if last:
+                break
+
+        keep = []
+        for game in all_games:
+            if scrape_iframes:
+                result = results.get(game['id'])
+                if result is None:
+                    continue
+                game.update(result['details'])
+                # Workers do not save the incremental state; new results are recorded once, here
+                if result['requested'] and scraper.state:
+                    scraper.state.record(game, result['details'])
+                if not result['details'].get('is_embeddable', False):
+                    continue
+            keep.append(game)
+
+        kept = []
+        emit = scraper._wrap_emit(category, kept.append)
+        # Only kept games need thumbnails; they download while earlier games are emitted
+        scraper._prefetch_thumbnails(keep)
+        for game in keep:
+            emit(game)
+        merged[category] = kept
+        logger.info(f"Merged '{category}': {len(kept)}/{len(all_games)} games kept")
+
+    scraper._finish_crawl()
+    return merged